@@ -0,0 +1,148 @@
+# Ball Collisions
+# ===============
+# Optional elastic collisions between part5's balls (--ball-collisions).
+# Without them balls pass straight through each other.
+#
+# Broadphase: sweep and prune. The playfield is cut into horizontal bands
+# one ball high, and the balls of every band are sorted by x. Sweeping a
+# band from left to right, each ball is only compared with the balls after
+# it that start less than one ball width further right, and with the balls
+# of the band below it in the same x window - nothing else can touch it.
+# Only those candidate pairs (the "pair tests") get a distance check. The
+# sorts are O(n log n) and the sweeps O(n + pairs), where checking every
+# pair would be n(n-1)/2 tests: half a million for 1,000 balls. Sweeping
+# along x alone would still test every ball against the ones in its whole
+# column.
+#
+# Balls are equal-mass circles of one size, so an elastic collision just
+# swaps the parts of their velocities along the line between their centers.
+# Two game rules are kept:
+# - a ball never ends up moving (almost) sideways only, which would keep it
+#   bouncing between the side walls forever
+# - no ball ends up faster than MAX_SPEED, so it can't tunnel through a
+#   block or the paddle in one step
+# Overlapping balls are pushed apart, so they don't stick together.
+
+import math
+from operator import attrgetter
+
+MIN_DY = 2  # Slowest vertical speed a collision leaves a ball with
+MAX_SPEED = 12  # Fastest a collision can make a ball (pixels per step)
+
+_x = attrgetter('x')
+
+
+class BallCollider:
+    def __init__(self, ball_size):
+        self.size = ball_size
+        # Last step, and totals for the summary
+        self.balls = 0
+        self.pair_tests = 0
+        self.contacts = 0
+        self.steps = 0
+        self.total_pair_tests = 0
+        self.total_brute_force = 0
+        self.total_contacts = 0
+
+    def step(self, balls):
+        """Find and bounce every pair of touching balls"""
+        size = self.size
+        bands = {}
+        for ball in balls:
+            bands.setdefault(int(ball.y // size), []).append(ball)
+        for band in bands.values():
+            band.sort(key=_x)
+        sorted_bands = {key: (band, [ball.x for ball in band], [ball.y for ball in band])
+                        for key, band in bands.items()}
+        reach = size * size  # Closer than this squared distance is touching
+        tests = 0
+        contacts = 0
+        for key, (band, xs, ys) in sorted_bands.items():
+            count = len(band)
+            # Within the band
+            for i in range(count - 1):
+                limit = xs[i] + size
+                j = i + 1
+                while j < count and xs[j] < limit:
+                    tests += 1
+                    dx = xs[j] - xs[i]
+                    dy = ys[j] - ys[i]
+                    if dx * dx + dy * dy < reach and self.bounce(band[i], band[j]):
+                        contacts += 1
+                    j += 1
+            # Against the band below, both sorted by x, so the window of
+            # candidates only ever moves right
+            below = sorted_bands.get(key + 1)
+            if below is None:
+                continue
+            below_band, below_xs, below_ys = below
+            below_count = len(below_band)
+            start = 0
+            for i in range(count):
+                x = xs[i]
+                while start < below_count and below_xs[start] <= x - size:
+                    start += 1
+                j = start
+                limit = x + size
+                while j < below_count and below_xs[j] < limit:
+                    tests += 1
+                    dx = below_xs[j] - x
+                    dy = below_ys[j] - ys[i]
+                    if dx * dx + dy * dy < reach and self.bounce(band[i], below_band[j]):
+                        contacts += 1
+                    j += 1
+        count = len(balls)
+        self.balls = count
+        self.pair_tests = tests
+        self.contacts = contacts
+        self.steps += 1
+        self.total_pair_tests += tests
+        self.total_brute_force += count * (count - 1) // 2
+        self.total_contacts += contacts
+
+    def bounce(self, a, b):
+        """Collide two overlapping balls. Returns False if they were already
+        moving apart (then only their overlap is undone)."""
+        nx = b.x - a.x
+        ny = b.y - a.y
+        distance = math.hypot(nx, ny)
+        if distance == 0:
+            nx, ny, distance = 0.0, 1.0, 1.0  # Exactly on top of each other: split vertically
+        nx /= distance
+        ny /= distance
+        # Push them apart, half each
+        push = (self.size - distance) / 2
+        a.x -= nx * push
+        a.y -= ny * push
+        b.x += nx * push
+        b.y += ny * push
+        # Closing speed along the line between the centers
+        closing = (a.dx - b.dx) * nx + (a.dy - b.dy) * ny
+        if closing <= 0:
+            return False
+        a.dx -= closing * nx
+        a.dy -= closing * ny
+        b.dx += closing * nx
+        b.dy += closing * ny
+        for ball in (a, b):
+            if abs(ball.dy) < MIN_DY:
+                ball.dy = math.copysign(MIN_DY, ball.dy)
+            speed = math.hypot(ball.dx, ball.dy)
+            if speed > MAX_SPEED:
+                ball.dx *= MAX_SPEED / speed
+                ball.dy *= MAX_SPEED / speed
+        return True
+
+    def readout(self):
+        """One line for the HUD, about the last step"""
+        brute_force = self.balls * (self.balls - 1) // 2
+        return (f"ball collisions: {self.pair_tests:,} pair tests "
+                f"(all pairs: {brute_force:,}), {self.contacts} contacts")
+
+    def summary(self):
+        """Lines describing the whole session"""
+        if not self.steps:
+            return ["Ball collisions: no steps simulated"]
+        share = self.total_pair_tests / self.total_brute_force if self.total_brute_force else 0.0
+        return [f"Ball collisions: {self.total_pair_tests / self.steps:,.0f} pair tests per step "
+                f"({share:.2%} of all pairs), {self.total_contacts:,} contacts"]
@@ -0,0 +1,369 @@
+# Benchmarks
+# ==========
+# Standalone performance measurements for the optional engines used by part5.
+#
+#   python benchmark.py fireworks [--particles N] [--frames N] [--max-workers N]
+#   python benchmark.py particles [--explosions N] [--frames N] [--render-scale S]
+#   python benchmark.py leaderboard [--scores N] [--players N]
+#   python benchmark.py snapshot [--balls N] [--block-rows N] [--block-cols N] [--steps N]
+#   python benchmark.py blocks [--render-scale S] [--frames N]
+#   python benchmark.py collisions [--balls N ...] [--steps N]
+#   python benchmark.py motion [--balls N] [--blasts N] [--steps N]
+#
+# fireworks: steps a fully loaded FireworksShow (fireworks.py) with 0 worker
+# processes (everything in the main process) and then 1..N workers, and
+# prints particle updates per second and the speedup over one worker.
+#
+# particles: draws the same explosions with particle layer scales 1, 0.5 and
+# 0.25 (particle_layer.py) and prints the time per frame, and how much of it
+# was the fixed cost of scaling the layer up and adding it to the scene.
+#
+# leaderboard: fills a Leaderboard (leaderboard.py) with random scores spread
+# over eight years and prints the slowest of several runs of each query.
+#
+# snapshot: plays a part5 game on autopilot for a while, then times packing
+# it into a snapshot (snapshot.py) and restoring it, with and without the
+# explosion particles, and checks the restored game plays out the same.
+#
+# blocks: builds part5 boards of 40 to 4,000 blocks and prints how long it
+# takes to bake the block atlas and layer for a new board, to rebuild the
+# layer from the atlas (what a restored or rewound board costs), and to draw
+# the blocks every frame.
+#
+# collisions: moves N balls around the part5 playfield and prints the time
+# per step of ball-to-ball collisions (ball_collisions.py), with the sweep
+# and prune pair tests against checking all n(n-1)/2 pairs.
+#
+# motion: moves boards of 40 to 1,800 blocks with every block motion
+# (block_motion.py) and prints the time per step to move them and how many
+# crossed a grid cell, then times ball and blast queries with the grid
+# (block_grid.py) against checking every live block. A block is killed
+# every step, and both ways must find exactly the same blocks.
+
+import argparse
+import os
+import random
+import time
+
+from ball_collisions import BallCollider
+from block_motion import BlockMotion, PATTERNS as BLOCK_MOTIONS
+from blockstore import BlockStore
+import fireworks
+from leaderboard import Leaderboard
+import particle_sim
+from particle_layer import ParticleLayer
+
+LAYER_SCALES = (1.0, 0.5, 0.25)
+
+
+def bench_fireworks(args):
+    if not fireworks.available():
+        raise SystemExit("fireworks benchmark needs NumPy (pip install numpy)")
+    max_workers = args.max_workers or os.cpu_count() or 1
+    print(f"Fireworks: {args.particles:,} particles, {args.frames} frames, {os.cpu_count()} cores")
+    print(f"  {'workers':>7}  {'ms/frame':>9}  {'M particles/s':>13}  {'speedup':>7}")
+    baseline = None
+    for workers in range(0, max_workers + 1):
+        show = fireworks.FireworksShow(800, 600, workers=workers, capacity=args.particles)
+        try:
+            # Fill every slot so all workers have the same amount of work
+            while show.live_count() < args.particles:
+                show.launch(400, 300, fireworks.BURST_SIZE)
+            show.advance()  # Warm up (first touch of the shared pages)
+            started = time.perf_counter()
+            for _ in range(args.frames):
+                show.advance()
+            elapsed = time.perf_counter() - started
+        finally:
+            show.close()
+        rate = args.particles * args.frames / elapsed
+        if workers == 1:
+            baseline = rate
+        speedup = f"{rate / baseline:6.2f}x" if baseline else "      -"
+        print(f"  {workers:>7}  {elapsed * 1000 / args.frames:9.2f}  {rate / 1e6:13.1f}  {speedup:>7}")
+
+
+def bench_particles(args):
+    if not particle_sim.available():
+        raise SystemExit("particles benchmark needs NumPy (pip install numpy)")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from part5 import FIRE_COLORS
+    pygame.display.init()
+    size = (round(800 * args.render_scale), round(600 * args.render_scale))
+    target = pygame.display.set_mode(size)
+    print(f"Particles: {args.explosions} explosions at {size[0]}x{size[1]}, {args.frames} frames")
+    print(f"  {'layer':>5}  {'layer size':>10}  {'particles':>9}  {'ms/frame':>8}  {'composite':>9}")
+    for scale in LAYER_SCALES:
+        layer = ParticleLayer(size, scale)
+        worker = particle_sim.ParticleWorker(FIRE_COLORS)
+        worker.scale = args.render_scale * scale
+        try:
+            for i in range(args.explosions):
+                worker.spawn_explosion(100 + i * 600 / max(1, args.explosions - 1), 300)
+            for _ in range(5):  # Let the explosions spread out
+                worker.step()
+            composite = 0.0
+            started = time.perf_counter()
+            for _ in range(args.frames):
+                target.fill((0, 0, 0))
+                if layer.enabled:
+                    worker.draw(layer.begin())
+                    composite_started = time.perf_counter()
+                    layer.composite(target)
+                    composite += time.perf_counter() - composite_started
+                else:
+                    worker.draw(target)
+            elapsed = time.perf_counter() - started
+            count = worker.count
+        finally:
+            worker.close()
+        layer_size = "x".join(str(round(n * scale)) for n in size)
+        print(f"  {scale:>5}  {layer_size:>10}  {count:>9}  {elapsed * 1000 / args.frames:8.2f}"
+              f"  {composite * 1000 / args.frames:9.2f}")
+    pygame.quit()
+
+
+def bench_leaderboard(args):
+    rng = random.Random(42)
+    names = [f"PLAYER{i}" for i in range(args.players)]
+    rows = [{
+        'name': rng.choice(names),
+        'time': rng.randint(20, 3600),
+        'date': f"{rng.randint(2018, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+    } for _ in range(args.scores)]
+    started = time.perf_counter()
+    board = Leaderboard(rows)
+    print(f"Leaderboard: {args.scores:,} scores, {args.players:,} players, "
+          f"indexed in {time.perf_counter() - started:.2f} s")
+    queries = [
+        ("top 10", lambda page: board.top(10, page * 10)),
+        ("player bests", lambda page: board.top_players(10, page * 10)),
+        ("personal best", lambda page: board.personal_best(names[page])),
+        ("player rank", lambda page: board.player_rank(names[page])),
+        ("one year", lambda page: board.top(10, page * 10, since="2021", until="2022")),
+        ("one month", lambda page: board.top(10, page * 10, since="2021-06", until="2021-07")),
+        ("one day", lambda page: board.top(10, page * 10, since="2021-06-15", until="2021-06-16")),
+        ("count one month", lambda page: board.count(since="2021-06", until="2021-07")),
+    ]
+    print(f"  {'query':<16}  {'page 1 ms':>9}  {'pages 2-20 max ms':>17}")
+    for label, query in queries:
+        times = []
+        for page in range(20):
+            started = time.perf_counter()
+            query(page)
+            times.append((time.perf_counter() - started) * 1000)
+        print(f"  {label:<16}  {times[0]:9.3f}  {max(times[1:]):17.3f}")
+    started = time.perf_counter()
+    board.add("NEWPLAYER", 100, "2025-12-31 23:59")
+    print(f"  {'add one score':<16}  {(time.perf_counter() - started) * 1000:9.3f}")
+
+
+def bench_snapshot(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import part5
+    from paddle_control import Autopilot
+    pygame.display.init()
+    part5.set_board_size(args.block_rows, args.block_cols)
+    part5.start_balls = args.balls
+    part5.paddle_control = Autopilot(part5.WIDTH, part5.paddle_y, part5.paddle_width,
+                                     part5.paddle_speed, part5.ball_size)
+    part5.game_rng.seed(42)
+    part5.reset_game()
+    for _ in range(args.steps):
+        part5.step_simulation(0, 0)
+        part5.explosion_particles = [p for p in part5.explosion_particles if p.update()]
+    print(f"Snapshot: {len(part5.balls)} balls, {len(part5.blocks)}/{part5.blocks.capacity} blocks, "
+          f"{len(part5.shockwaves.waves)} shockwaves, {len(part5.explosion_particles)} particles")
+    print(f"  {'':<16}  {'bytes':>9}  {'dump ms':>8}  {'restore ms':>10}")
+    # Particles first: restoring a snapshot without them clears them
+    for label, particles in (("with particles", True), ("game", False)):
+        dump_times, restore_times = [], []
+        for _ in range(20):
+            started = time.perf_counter()
+            blob = part5.snapshot_game(particles)
+            dump_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            part5.restore_game(blob)
+            restore_times.append(time.perf_counter() - started)
+        print(f"  {label:<16}  {len(blob):9,}  {min(dump_times) * 1000:8.3f}  {min(restore_times) * 1000:10.3f}")
+
+    def play():
+        trace = []
+        for _ in range(300):
+            part5.step_simulation(0, 0)
+            trace.append((part5.paddle_x, [(ball.x, ball.y) for ball in part5.balls], bytes(part5.blocks.alive)))
+        return trace
+    blob = part5.snapshot_game()
+    first = play()
+    part5.restore_game(blob)
+    print(f"  restored game replays identically: {'yes' if play() == first else 'NO'}")
+    pygame.quit()
+
+
+def bench_blocks(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import part5
+    from viewport import Viewport
+    pygame.display.init()
+    part5.view = Viewport((part5.WIDTH, part5.HEIGHT), render_scale=args.render_scale)
+    part5.bake_render_assets()
+    print(f"Blocks: render scale {args.render_scale}, {args.frames} frames")
+    print(f"  {'blocks':>6}  {'new board ms':>12}  {'rebuild ms':>10}  {'ms/frame':>8}")
+    for rows, cols in ((4, 10), (10, 40), (40, 100)):
+        part5.set_board_size(rows, cols)
+        part5.reset_game()
+        started = time.perf_counter()
+        part5.draw_blocks([])
+        new_board = time.perf_counter() - started
+        part5.block_layer = None
+        started = time.perf_counter()
+        part5.draw_blocks([])
+        rebuild = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(args.frames):
+            part5.draw_blocks([])
+        elapsed = time.perf_counter() - started
+        print(f"  {rows * cols:>6}  {new_board * 1000:12.2f}  {rebuild * 1000:10.2f}  {elapsed * 1000 / args.frames:8.3f}")
+    pygame.quit()
+
+
+class MovingBall:
+    def __init__(self, rng):
+        self.x = rng.uniform(0, 785)
+        self.y = rng.uniform(0, 585)
+        self.dx = rng.choice([-4, 4])
+        self.dy = rng.choice([-4, 4])
+
+
+def bench_collisions(args):
+    rng = random.Random(42)
+    print(f"Ball collisions: {args.steps} steps in an 800x600 playfield, 15 px balls")
+    print(f"  {'balls':>6}  {'ms/step':>8}  {'pair tests':>10}  {'all pairs':>10}  {'contacts':>8}")
+    for count in args.balls:
+        balls = [MovingBall(rng) for _ in range(count)]
+        collider = BallCollider(15)
+        elapsed = 0.0
+        for _ in range(args.steps):
+            for ball in balls:
+                ball.x += ball.dx
+                ball.y += ball.dy
+                if not 0 < ball.x < 785:
+                    ball.dx = -ball.dx
+                if not 0 < ball.y < 585:
+                    ball.dy = -ball.dy
+            started = time.perf_counter()
+            collider.step(balls)
+            elapsed += time.perf_counter() - started
+        print(f"  {count:>6}  {elapsed * 1000 / args.steps:8.3f}  {collider.total_pair_tests // args.steps:>10,}"
+              f"  {count * (count - 1) // 2:>10,}  {collider.total_contacts // args.steps:>8,}")
+
+
+def bench_motion(args):
+    import pygame
+    rng = random.Random(42)
+    palette = [(255, 0, 0)]
+    print(f"Block motion: {args.steps} steps, {args.balls} ball and {args.blasts} blast queries per step")
+    print(f"  {'blocks':>6}  {'motion':<8}  {'move ms':>7}  {'re-bucketed':>11}  {'balls grid/scan ms':>18}  "
+          f"{'blasts grid/scan ms':>19}  {'same':>4}")
+    for rows, cols in ((4, 10), (15, 40), (30, 60)):
+        # Laid out like part5's set_board_size() and create_blocks()
+        w = max(1, min(75, 800 // cols - 5))
+        h = max(1, min(20, 250 // rows - 5))
+        for pattern in BLOCK_MOTIONS:
+            stores = BlockStore(palette, (w + 5, h + 5)), BlockStore(palette)
+            motions = BlockMotion(pattern), BlockMotion(pattern)
+            for store, motion in zip(stores, motions):
+                for row in range(rows):
+                    for col in range(cols):
+                        store.add(col * (w + 5) + 5, row * (h + 5) + 50, w, h, 0)
+                motion.set_board(cols, (w + 5) // 2, 200)
+                motion.start(store)
+            indexed, plain = stores
+            move = rebucketed = 0.0
+            query = [[0.0, 0.0], [0.0, 0.0]]  # Balls, blasts - grid, scan
+            same = True
+            for _ in range(args.steps):
+                started = time.perf_counter()
+                motions[0].advance(indexed)
+                move += time.perf_counter() - started
+                rebucketed += motions[0].rebucketed
+                motions[1].advance(plain)
+                live = list(indexed)
+                if live:
+                    victim = rng.choice(live)
+                    indexed.kill(victim)
+                    plain.kill(victim)
+                rects = [pygame.Rect(rng.uniform(0, 785), rng.uniform(0, 500), 15, 15) for _ in range(args.balls)]
+                blasts = [(rng.randint(0, 800), rng.randint(0, 500)) for _ in range(args.blasts)]
+                results = []
+                for i, store in enumerate(stores):
+                    started = time.perf_counter()
+                    hits = [store.collide(rect) for rect in rects]
+                    query[0][i] += time.perf_counter() - started
+                    started = time.perf_counter()
+                    victims = [sorted(store.in_radius(x, y, 100)) for x, y in blasts]
+                    query[1][i] += time.perf_counter() - started
+                    results.append((hits, victims))
+                same = same and results[0] == results[1]
+            steps = args.steps
+            print(f"  {rows * cols:>6}  {pattern:<8}  {move * 1000 / steps:7.3f}  {rebucketed / steps:11.1f}  "
+                  f"{query[0][0] * 1000 / steps:8.3f} / {query[0][1] * 1000 / steps:7.3f}  "
+                  f"{query[1][0] * 1000 / steps:8.3f} / {query[1][1] * 1000 / steps:8.3f}  {'yes' if same else 'NO':>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Breakout performance benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fw = commands.add_parser("fireworks", help="multiprocess particle scaling")
+    fw.add_argument("--particles", type=int, default=1_000_000)
+    fw.add_argument("--frames", type=int, default=200)
+    fw.add_argument("--max-workers", type=int, metavar="N",
+                    help="highest worker count to try (default: number of cores)")
+    pa = commands.add_parser("particles", help="particle layer resolution")
+    pa.add_argument("--explosions", type=int, default=20)
+    pa.add_argument("--frames", type=int, default=100)
+    pa.add_argument("--render-scale", type=float, default=1.0,
+                    help="render resolution relative to 800x600")
+    lb = commands.add_parser("leaderboard", help="high score query latency")
+    lb.add_argument("--scores", type=int, default=1_000_000)
+    lb.add_argument("--players", type=int, default=5_000)
+    sn = commands.add_parser("snapshot", help="game snapshot size and speed")
+    sn.add_argument("--balls", type=int, default=20)
+    sn.add_argument("--block-rows", type=int, default=4)
+    sn.add_argument("--block-cols", type=int, default=10)
+    sn.add_argument("--steps", type=int, default=60,
+                    help="simulation steps played before measuring")
+    bl = commands.add_parser("blocks", help="block atlas and layer drawing")
+    bl.add_argument("--render-scale", type=float, default=1.0,
+                    help="render resolution relative to 800x600")
+    bl.add_argument("--frames", type=int, default=100)
+    co = commands.add_parser("collisions", help="ball-to-ball collision broadphase")
+    co.add_argument("--balls", type=int, nargs="+", default=[10, 100, 1000, 3000])
+    co.add_argument("--steps", type=int, default=100)
+    mo = commands.add_parser("motion", help="moving blocks and their grid index")
+    mo.add_argument("--balls", type=int, default=200)
+    mo.add_argument("--blasts", type=int, default=5)
+    mo.add_argument("--steps", type=int, default=120)
+    args = parser.parse_args()
+    if args.command == "fireworks":
+        bench_fireworks(args)
+    elif args.command == "particles":
+        bench_particles(args)
+    elif args.command == "leaderboard":
+        bench_leaderboard(args)
+    elif args.command == "snapshot":
+        bench_snapshot(args)
+    elif args.command == "blocks":
+        bench_blocks(args)
+    elif args.command == "collisions":
+        bench_collisions(args)
+    elif args.command == "motion":
+        bench_motion(args)
+
+
+if __name__ == "__main__":
+    main()
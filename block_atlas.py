@@ -0,0 +1,50 @@
+# Block Atlas
+# ===========
+# Every look a part5 block can have, drawn once into one surface.
+#
+# A look is whatever changes how a block is drawn - in part5 its color and
+# kind (normal or explosive); damage states would just be another part of
+# the look. Blocks of one board all have the same logical size, but at a
+# render scale below 1 their pixel sizes can differ by a pixel depending on
+# where they sit, so every look is baked once for each pixel size that
+# occurs. Tiles are packed in shelves, one per size.
+#
+# Blocks are then drawn by copying their tile: sprite() gives the
+# (surface, position, area) triple Surface.blits() takes, so a whole board
+# is one blits() call with no drawing or color math per block.
+
+import pygame
+
+PADDING = 1  # Empty pixels between tiles
+
+
+class BlockAtlas:
+    def __init__(self, draw_look):
+        self.draw_look = draw_look  # draw_look(tile, look) draws a look filling the tile surface
+        self.surface = None
+        self.areas = {}  # (look, (w, h)) -> area of the atlas surface
+
+    def build(self, tiles):
+        """Bake every (look, (w, h)) in tiles, replacing the old atlas"""
+        shelves = {}
+        for look, size in set(tiles):
+            shelves.setdefault(size, []).append(look)
+        width = max((len(looks) * (w + PADDING) for (w, h), looks in shelves.items()), default=1)
+        height = max(1, sum(h + PADDING for w, h in shelves))
+        self.surface = pygame.Surface((width, height))
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert()
+        self.surface.fill((0, 0, 0))
+        self.areas = {}
+        y = 0
+        for (w, h), looks in sorted(shelves.items()):
+            for i, look in enumerate(sorted(looks)):
+                area = pygame.Rect(i * (w + PADDING), y, w, h)
+                # Drawing into a subsurface clips the look to its tile
+                self.draw_look(self.surface.subsurface(area), look)
+                self.areas[(look, (w, h))] = area
+            y += h + PADDING
+
+    def sprite(self, look, rect):
+        """(atlas, position, area) that draws look at rect with Surface.blits()"""
+        return self.surface, rect.topleft, self.areas[(look, rect.size)]
@@ -0,0 +1,99 @@
+# Block Grid
+# ==========
+# Spatial index for part5's blocks once they move (block_motion.py).
+#
+# The playfield is cut into cells one block pitch (block plus padding) in
+# size, and every live block is filed under each cell its rect touches -
+# one to four cells, as blocks are never bigger than a cell. A ball only
+# has to look at the blocks filed under the cells its own rect touches,
+# and a blast only at the cells its circle's bounding box covers, instead
+# of at every block on the board.
+#
+# The grid is kept up to date incrementally. Every block remembers the span
+# of cells it is filed under; when it moves, the new span is worked out
+# with four integer divisions, and only if that differs - the block crossed
+# a cell boundary - is it taken out of its old cells and put into the new
+# ones. A block drifting inside its cells costs nothing more, so the board
+# is never rebuilt, and moves and re-buckets are counted for the readout.
+#
+# Cells are sets, so iteration order isn't defined: callers pick the lowest
+# id or sort, like BlockStore does.
+
+
+class BlockGrid:
+    def __init__(self, cell_width, cell_height):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cells = {}  # (column, row) -> set of block ids
+        self.spans = {}  # Block id -> (first column, first row, last column, last row)
+        # Counters since the grid was made
+        self.moves = 0
+        self.rebuckets = 0
+
+    def span(self, x, y, w, h):
+        """Cells a rect touches, as (first column, first row, last column, last row)"""
+        return (int(x // self.cell_width), int(y // self.cell_height),
+                int((x + w - 1) // self.cell_width), int((y + h - 1) // self.cell_height))
+
+    def _file(self, block_id, span):
+        cells = self.cells
+        first_col, first_row, last_col, last_row = span
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                cell = cells.get((col, row))
+                if cell is None:
+                    cells[(col, row)] = {block_id}
+                else:
+                    cell.add(block_id)
+
+    def _unfile(self, block_id, span):
+        cells = self.cells
+        first_col, first_row, last_col, last_row = span
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                cell = cells[(col, row)]
+                cell.discard(block_id)
+                if not cell:
+                    del cells[(col, row)]
+
+    def insert(self, block_id, x, y, w, h):
+        span = self.span(x, y, w, h)
+        self.spans[block_id] = span
+        self._file(block_id, span)
+
+    def remove(self, block_id):
+        span = self.spans.pop(block_id, None)
+        if span is not None:
+            self._unfile(block_id, span)
+
+    def move(self, block_id, x, y, w, h):
+        """A block's rect changed: re-bucket it if it crossed into other cells"""
+        self.moves += 1
+        span = self.span(x, y, w, h)
+        old = self.spans[block_id]
+        if span != old:
+            self._unfile(block_id, old)
+            self._file(block_id, span)
+            self.spans[block_id] = span
+            self.rebuckets += 1
+
+    def near(self, x, y, w, h):
+        """Ids filed under any cell the rect touches - a superset of the
+        blocks overlapping it. Don't change the grid while using the result."""
+        first_col, first_row, last_col, last_row = self.span(x, y, w, h)
+        cells = self.cells
+        if first_col == last_col and first_row == last_row:
+            return cells.get((first_col, first_row), ())
+        found = set()
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                cell = cells.get((col, row))
+                if cell:
+                    found |= cell
+        return found
+
+    def copy(self):
+        grid = BlockGrid(self.cell_width, self.cell_height)
+        grid.cells = {key: set(cell) for key, cell in self.cells.items()}
+        grid.spans = dict(self.spans)
+        return grid
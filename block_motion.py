@@ -0,0 +1,129 @@
+# Block Motion
+# ============
+# Moves part5's blocks around their homes (--block-motion):
+# - slide:   rows sway from side to side, every other row the other way
+# - orbit:   every block circles its home, a little behind the block to its
+#            left, so the board ripples round without blocks overlapping
+# - descend: the board creeps down towards the paddle, up to max_drop,
+#            while a wave runs along it from left to right
+#
+# Where a block is only depends on its home and the step number, so the
+# step number is all a snapshot needs to put every block back, and
+# re-simulated steps (rewind) move them exactly the same way. Positions are
+# rounded to whole pixels: most steps most blocks don't change pixel at
+# all, and BlockStore.move() skips those.
+#
+# Blocks in a row of a sliding board all move together, so the offset is
+# worked out once per row; orbit and descend work out one per column. A
+# step where none of those offsets changed doesn't touch the blocks.
+
+import math
+
+PATTERNS = ("slide", "orbit", "descend")
+
+SLIDE_PERIOD = 240  # Steps for one sway back and forth (4 s)
+ORBIT_PERIOD = 180
+ORBIT_RADIUS = 10
+ORBIT_LAG = math.pi / 6  # How far behind its left neighbour a block is
+DESCEND_STEPS_PER_PIXEL = 6  # 10 pixels a second
+WAVE_PERIOD = 120
+WAVE_HEIGHT = 6
+WAVE_LENGTH = 8  # Columns
+
+
+class BlockMotion:
+    def __init__(self, pattern):
+        if pattern not in PATTERNS:
+            raise ValueError(f"unknown block motion {pattern!r}")
+        self.pattern = pattern
+        # Board layout, see set_board()
+        self.cols = 1
+        self.slide_distance = 0  # How far rows slide each way
+        self.max_drop = 0  # How far a descending board can come down
+        self.step = 0
+        self.placed = None  # Offsets the blocks were last moved to
+        # Last step, and totals for the summary
+        self.blocks = 0
+        self.moved = 0  # Blocks that changed pixel
+        self.rebucketed = 0  # ...and of those, the ones that changed grid cells
+        self.steps = 0
+        self.total_moved = 0
+        self.total_rebucketed = 0
+
+    def set_board(self, cols, slide_distance, max_drop):
+        """Fit the motion to a board of cols columns (ids row by row)"""
+        self.cols = cols
+        self.slide_distance = slide_distance
+        self.max_drop = max_drop
+
+    def offsets(self, step):
+        """(dx, dy) by row for slide, by column for orbit and descend"""
+        if self.pattern == "slide":
+            sway = self.slide_distance * math.sin(2 * math.pi * step / SLIDE_PERIOD)
+            return [(round(sway), 0), (round(-sway), 0)]  # Even rows, odd rows
+        if self.pattern == "orbit":
+            offsets = []
+            for col in range(self.cols):
+                angle = 2 * math.pi * step / ORBIT_PERIOD - col * ORBIT_LAG
+                offsets.append((round(ORBIT_RADIUS * math.cos(angle)), round(ORBIT_RADIUS * math.sin(angle))))
+            return offsets
+        drop = min(self.max_drop, step // DESCEND_STEPS_PER_PIXEL)
+        return [(0, drop + round(WAVE_HEIGHT * math.sin(2 * math.pi * (step / WAVE_PERIOD - col / WAVE_LENGTH))))
+                for col in range(self.cols)]
+
+    def apply(self, blocks):
+        """Move every live block to where it is at the current step"""
+        offsets = self.offsets(self.step)
+        self.blocks = len(blocks)
+        if offsets == self.placed:
+            # Nothing moved by a whole pixel
+            self.moved = self.rebucketed = 0
+            return
+        self.placed = offsets
+        cols = self.cols
+        by_row = self.pattern == "slide"
+        home_x = blocks.home_x
+        home_y = blocks.home_y
+        x = blocks.x
+        y = blocks.y
+        move = blocks.move
+        grid = blocks.grid
+        rebuckets = grid.rebuckets if grid else 0
+        moved = 0
+        for block_id in blocks:
+            row, col = divmod(block_id, cols)
+            dx, dy = offsets[row % 2] if by_row else offsets[col]
+            new_x = home_x[block_id] + dx
+            new_y = home_y[block_id] + dy
+            if new_x != x[block_id] or new_y != y[block_id]:
+                move(block_id, new_x, new_y)
+                moved += 1
+        self.moved = moved
+        self.rebucketed = grid.rebuckets - rebuckets if grid else 0
+
+    def start(self, blocks, step=0):
+        """Put every live block where it is at step (a new or restored game)"""
+        self.step = step
+        self.placed = None  # The blocks could be anywhere
+        self.apply(blocks)
+
+    def advance(self, blocks):
+        """One simulation step"""
+        self.step += 1
+        self.apply(blocks)
+        self.steps += 1
+        self.total_moved += self.moved
+        self.total_rebucketed += self.rebucketed
+
+    def readout(self):
+        """One line for the HUD, about the last step"""
+        return (f"block motion ({self.pattern}): {self.moved} of {self.blocks} blocks moved, "
+                f"{self.rebucketed} re-bucketed")
+
+    def summary(self):
+        """Lines describing the whole session"""
+        if not self.steps:
+            return [f"Block motion ({self.pattern}): no steps simulated"]
+        share = self.total_rebucketed / self.total_moved if self.total_moved else 0.0
+        return [f"Block motion ({self.pattern}): {self.total_moved / self.steps:,.0f} blocks moved per step, "
+                f"{share:.1%} of them re-bucketed"]
@@ -0,0 +1,231 @@
+# Block Store
+# ===========
+# Compact container for the breakout blocks used by part5.
+#
+# Instead of a list of {"rect": Rect, "color": tuple} dicts, every block gets
+# a fixed id when it is added and its data lives in parallel arrays indexed
+# by that id:
+# - alive flags (bytearray), so a killed block is just a tombstone
+# - x / y / w / h and center arrays
+# - a color id into a small palette
+# - a kind (normal or explosive)
+#
+# A dense list of the live ids is kept next to the arrays. Killing a block
+# swaps the last live id into its slot, so removal and len() are O(1) and
+# iteration only ever touches blocks that are still alive.
+#
+# Every kill is also appended to a kill log, so code that mirrors the board
+# (like the spectator stream) can pick up just the changes each frame.
+#
+# Nothing the game sees depends on the order of the live list: a ball
+# overlapping two blocks hits the lower id. So a board restored from its
+# alive flags alone (snapshot.py) plays out exactly like the original.
+#
+# Blocks can move (block_motion.py). Each block remembers its home, where
+# it was added, and move() puts it somewhere else. A store made with a cell
+# size also files its live blocks in a BlockGrid (block_grid.py), and ball
+# and blast queries then only look at the blocks in nearby cells. Without
+# one they check every live block; for balls pygame does that in C, which
+# beats the grid on a board of a few dozen blocks but not of hundreds.
+
+from array import array
+from itertools import compress
+
+import pygame
+
+from block_grid import BlockGrid
+
+KIND_NORMAL = 0
+KIND_EXPLOSIVE = 1
+
+
+class BlockStore:
+    def __init__(self, palette, cell_size=None):
+        self.palette = list(palette)
+        # Per-id arrays (ids are never reused)
+        self.alive = bytearray()
+        self.x = array('i')
+        self.y = array('i')
+        self.home_x = array('i')
+        self.home_y = array('i')
+        self.w = array('i')
+        self.h = array('i')
+        self.cx = array('i')
+        self.cy = array('i')
+        self.color_ids = bytearray()
+        self.kinds = bytearray()
+        self.rects = []
+        # Dense list of live ids, plus where each id sits inside it
+        self._live = []
+        self._live_rects = []
+        self._slot = array('i')
+        self.kill_log = []
+        # Spatial index of the live blocks, (cell width, cell height) given
+        self.grid = BlockGrid(*cell_size) if cell_size else None
+
+    def add(self, x, y, w, h, color_id, kind=KIND_NORMAL):
+        """Add a block and return its id"""
+        block_id = len(self.alive)
+        self.alive.append(1)
+        self.x.append(x)
+        self.y.append(y)
+        self.home_x.append(x)
+        self.home_y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.cx.append(x + w // 2)
+        self.cy.append(y + h // 2)
+        self.color_ids.append(color_id)
+        self.kinds.append(kind)
+        rect = pygame.Rect(x, y, w, h)
+        self.rects.append(rect)
+        self._slot.append(len(self._live))
+        self._live.append(block_id)
+        self._live_rects.append(rect)
+        if self.grid:
+            self.grid.insert(block_id, x, y, w, h)
+        return block_id
+
+    @property
+    def capacity(self):
+        """Number of blocks ever added (alive or not)"""
+        return len(self.alive)
+
+    def __len__(self):
+        return len(self._live)
+
+    def __iter__(self):
+        # Don't kill blocks while iterating - collect ids and use kill_many()
+        return iter(self._live)
+
+    def is_alive(self, block_id):
+        return self.alive[block_id] == 1
+
+    def rect(self, block_id):
+        return self.rects[block_id]
+
+    def color(self, block_id):
+        return self.palette[self.color_ids[block_id]]
+
+    def center(self, block_id):
+        return self.cx[block_id], self.cy[block_id]
+
+    def kill(self, block_id):
+        """Remove a block in O(1). Returns False if it was already dead."""
+        if not self.alive[block_id]:
+            return False
+        self.alive[block_id] = 0
+        # Swap-remove: move the last live block into the freed slot
+        slot = self._slot[block_id]
+        last_id = self._live.pop()
+        last_rect = self._live_rects.pop()
+        if last_id != block_id:
+            self._live[slot] = last_id
+            self._live_rects[slot] = last_rect
+            self._slot[last_id] = slot
+        self._slot[block_id] = -1
+        if self.grid:
+            self.grid.remove(block_id)
+        self.kill_log.append(block_id)
+        return True
+
+    def kill_many(self, block_ids):
+        """Remove several blocks, returns the ids that were actually alive"""
+        return [block_id for block_id in block_ids if self.kill(block_id)]
+
+    def take_kill_log(self):
+        """Return the ids killed since the last call and start a new log"""
+        killed, self.kill_log = self.kill_log, []
+        return killed
+
+    def move(self, block_id, x, y):
+        """Put a block's top left corner at (x, y)"""
+        if x == self.x[block_id] and y == self.y[block_id]:
+            return
+        w = self.w[block_id]
+        h = self.h[block_id]
+        self.x[block_id] = x
+        self.y[block_id] = y
+        self.cx[block_id] = x + w // 2
+        self.cy[block_id] = y + h // 2
+        # A new rect rather than changing the old one, which copies share
+        rect = pygame.Rect(x, y, w, h)
+        self.rects[block_id] = rect
+        slot = self._slot[block_id]
+        if slot >= 0:
+            self._live_rects[slot] = rect
+            if self.grid:
+                self.grid.move(block_id, x, y, w, h)
+
+    def collide(self, rect):
+        """Return the lowest id of a live block overlapping rect, or -1"""
+        if self.grid:
+            rects = self.rects
+            found = -1
+            for block_id in self.grid.near(rect.x, rect.y, rect.w, rect.h):
+                if (found < 0 or block_id < found) and rects[block_id].colliderect(rect):
+                    found = block_id
+            return found
+        hits = rect.collidelistall(self._live_rects)
+        if not hits:
+            return -1
+        if len(hits) == 1:
+            return self._live[hits[0]]
+        return min(self._live[index] for index in hits)
+
+    def copy(self):
+        """A new store with the same blocks (the kill log starts empty)"""
+        store = BlockStore(self.palette)
+        store.alive = bytearray(self.alive)
+        store.x, store.y, store.w, store.h = array('i', self.x), array('i', self.y), array('i', self.w), array('i', self.h)
+        store.home_x, store.home_y = array('i', self.home_x), array('i', self.home_y)
+        store.cx, store.cy = array('i', self.cx), array('i', self.cy)
+        store.color_ids = bytearray(self.color_ids)
+        store.kinds = bytearray(self.kinds)
+        store.rects = list(self.rects)  # Never changed in place, so they can be shared
+        store._live = list(self._live)
+        store._live_rects = list(self._live_rects)
+        store._slot = array('i', self._slot)
+        store.grid = self.grid.copy() if self.grid else None
+        return store
+
+    def set_alive(self, alive):
+        """Make exactly the blocks flagged in alive (0/1 per id) live, in id
+        order. The kill log is cleared."""
+        if len(alive) != len(self.alive):
+            raise ValueError(f"{len(alive)} alive flags for {len(self.alive)} blocks")
+        if self.grid:
+            # Only the blocks that came back or went are filed or taken out
+            grid = self.grid
+            for block_id, (was, now) in enumerate(zip(self.alive, alive)):
+                if was != now:
+                    if now:
+                        grid.insert(block_id, self.x[block_id], self.y[block_id], self.w[block_id], self.h[block_id])
+                    else:
+                        grid.remove(block_id)
+        self.alive[:] = alive
+        self._live = list(compress(range(len(alive)), alive))
+        self._live_rects = list(map(self.rects.__getitem__, self._live))
+        slot = array('i', [-1]) * len(alive)
+        for index, block_id in enumerate(self._live):
+            slot[block_id] = index
+        self._slot = slot
+        self.kill_log = []
+
+    def in_radius(self, x, y, radius):
+        """Ids of live blocks whose center is within radius of (x, y)"""
+        cx = self.cx
+        cy = self.cy
+        radius_sq = radius * radius
+        found = []
+        candidates = self._live
+        if self.grid:
+            # Every block's rect holds its center, so a center inside the
+            # circle is in a cell of the circle's bounding box
+            candidates = self.grid.near(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
+        for block_id in candidates:
+            dx = cx[block_id] - x
+            dy = cy[block_id] - y
+            if dx * dx + dy * dy <= radius_sq:
+                found.append(block_id)
+        return found
@@ -0,0 +1,198 @@
+# Fireworks Attract Mode
+# ======================
+# Shows fireworks behind part5's menu (python part5.py --fireworks 4) with far
+# more particles than one core could move, using several processes:
+#
+# - All particle arrays live in one multiprocessing.shared_memory block
+# - Each worker process owns a slice of the particles. Every frame the main
+#   process releases the workers through a barrier, each worker steps its
+#   slice with NumPy, and a second barrier signals that the frame is done.
+# - The main process launches new bursts into free slots (a ring, so the
+#   oldest particles are reused first) and draws straight from the shared
+#   arrays into the screen's pixels - no copies between processes
+#
+# With 0 workers the same kernel runs in the main process, which is the
+# baseline for benchmark.py's scaling numbers.
+#
+# Needs NumPy. Workers are spawned, and a spawned process first re-imports
+# the main module - part5, with pygame and the whole game. While they start,
+# this module stands in as the main module, and it doesn't import pygame,
+# so the workers start quickly.
+
+import math
+import multiprocessing
+import random
+import sys
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIELDS = ('x', 'y', 'dx', 'dy', 'life', 'max_life', 'r', 'g', 'b')
+GRAVITY = 0.04
+DRAG = 0.985
+BURST_SIZE = 6000
+BURST_INTERVAL = 25  # Frames between bursts
+BARRIER_TIMEOUT = 10.0
+
+
+def available():
+    return np is not None
+
+
+class SharedParticles:
+    """Particle arrays inside a shared memory block (created or attached by name)"""
+    def __init__(self, capacity, name=None):
+        self.capacity = capacity
+        size = len(FIELDS) * capacity * 4
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.arrays = np.ndarray((len(FIELDS), capacity), dtype='f4', buffer=self.shm.buf)
+        for i, field in enumerate(FIELDS):
+            setattr(self, field, self.arrays[i])
+        if name is None:
+            self.arrays[:] = 0
+
+    def close(self):
+        # Drop our views before the buffer goes away
+        self.arrays = None
+        for field in FIELDS:
+            setattr(self, field, None)
+        self.shm.close()
+
+
+def step_slice(p, start, end):
+    """Advance particles [start, end) by one frame"""
+    s = slice(start, end)
+    p.x[s] += p.dx[s]
+    p.y[s] += p.dy[s]
+    p.dy[s] += GRAVITY
+    p.dx[s] *= DRAG
+    p.dy[s] *= DRAG
+    p.life[s] -= 1
+
+
+def _worker(name, capacity, start, end, start_barrier, done_barrier, stop):
+    particles = SharedParticles(capacity, name)
+    try:
+        while True:
+            start_barrier.wait()
+            if stop.value:
+                return
+            step_slice(particles, start, end)
+            done_barrier.wait()
+    finally:
+        particles.close()
+
+
+class FireworksShow:
+    def __init__(self, width, height, workers=2, capacity=200_000):
+        if np is None:
+            raise RuntimeError("fireworks need NumPy (pip install numpy)")
+        self.width = width
+        self.height = height
+        self.particles = SharedParticles(capacity)
+        self.capacity = capacity
+        self.cursor = 0  # Next slot a burst writes to
+        self.frame = 0
+        self.rng = np.random.default_rng()
+        self.processes = []
+        self.workers = workers
+        if workers:
+            ctx = multiprocessing.get_context('spawn')
+            self._start = ctx.Barrier(workers + 1)
+            self._done = ctx.Barrier(workers + 1)
+            self._stop = ctx.Value('b', 0)
+            bounds = [capacity * i // workers for i in range(workers + 1)]
+            main = sys.modules['__main__']
+            sys.modules['__main__'] = sys.modules[__name__]  # What the workers re-import
+            try:
+                for i in range(workers):
+                    process = ctx.Process(
+                        target=_worker, name=f"fireworks-{i}", daemon=True,
+                        args=(self.particles.shm.name, capacity, bounds[i], bounds[i + 1],
+                              self._start, self._done, self._stop))
+                    process.start()
+                    self.processes.append(process)
+            finally:
+                sys.modules['__main__'] = main
+
+    def launch(self, x, y, count=BURST_SIZE):
+        """Write a new burst into the ring of particle slots"""
+        rng = self.rng
+        count = min(count, self.capacity)
+        slots = (self.cursor + np.arange(count)) % self.capacity
+        self.cursor = (self.cursor + count) % self.capacity
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = 5 * np.sqrt(rng.uniform(0, 1, count))  # Filled disc, not a ring
+        life = rng.uniform(50, 110, count)
+        hue = rng.uniform(0, 1)
+        base = np.array(_hue_to_rgb(hue), dtype='f4')
+        tint = rng.uniform(0.7, 1.0, (count, 1)) * base + rng.uniform(0, 60, (count, 1))
+        p = self.particles
+        p.x[slots] = x
+        p.y[slots] = y
+        p.dx[slots] = np.cos(angle) * speed
+        p.dy[slots] = np.sin(angle) * speed - 1
+        p.life[slots] = life
+        p.max_life[slots] = life
+        p.r[slots] = tint[:, 0]
+        p.g[slots] = tint[:, 1]
+        p.b[slots] = tint[:, 2]
+
+    def step(self):
+        """Launch bursts on schedule and advance every particle one frame"""
+        if self.frame % BURST_INTERVAL == 0:
+            self.launch(random.uniform(0.15, 0.85) * self.width, random.uniform(0.15, 0.5) * self.height)
+        self.frame += 1
+        self.advance()
+
+    def advance(self):
+        """Move every particle one frame (in the worker processes if there are any)"""
+        if self.workers:
+            self._start.wait(BARRIER_TIMEOUT)
+            self._done.wait(BARRIER_TIMEOUT)
+        else:
+            step_slice(self.particles, 0, self.capacity)
+
+    def live_count(self):
+        return int(np.count_nonzero(self.particles.life > 0))
+
+    def draw(self, surface, scale=1.0):
+        """Plot live particles straight into the surface's pixels"""
+        p = self.particles
+        live = p.life > 0
+        x = (p.x[live] * scale).astype('i4')
+        y = (p.y[live] * scale).astype('i4')
+        visible = (x >= 0) & (x < surface.get_width()) & (y >= 0) & (y < surface.get_height())
+        x = x[visible]
+        y = y[visible]
+        fade = (p.life[live] / p.max_life[live])[visible]
+        r_shift, g_shift, b_shift, _ = surface.get_shifts()
+        color = ((np.minimum(255, p.r[live][visible] * fade).astype('u4') << r_shift)
+                 | (np.minimum(255, p.g[live][visible] * fade).astype('u4') << g_shift)
+                 | (np.minimum(255, p.b[live][visible] * fade).astype('u4') << b_shift))
+        pixels = np.asarray(surface.get_view('2'))
+        pixels[x, y] = color
+        del pixels  # Unlocks the surface
+
+    def close(self):
+        if self.workers:
+            self._stop.value = 1
+            try:
+                self._start.wait(BARRIER_TIMEOUT)
+            except Exception:
+                pass
+            for process in self.processes:
+                process.join(BARRIER_TIMEOUT)
+        self.particles.close()
+        self.particles.shm.unlink()
+
+
+def _hue_to_rgb(hue):
+    """Fully saturated color for a hue in 0..1"""
+    r = abs(hue * 6 - 3) - 1
+    g = 2 - abs(hue * 6 - 2)
+    b = 2 - abs(hue * 6 - 4)
+    return tuple(255 * min(1, max(0, c)) for c in (r, g, b))
@@ -0,0 +1,166 @@
+# Frame Monitor
+# =============
+# Records how long every part5 frame really took (wall time from one flip
+# to the next, so the clock.tick() sleep is included).
+#
+# - Durations go into a histogram of 0.5 ms buckets. One histogram covers
+#   the last `window` frames (old frames are subtracted again as they drop
+#   out) and drives the live HUD readout. A second one covers the whole
+#   session for the summary at exit. Percentiles are read from the buckets,
+#   so nothing is sorted per frame.
+# - A frame that runs over budget is a spike. Game code calls tag() when
+#   something notable happens (an explosion, a ball spawn, ...), and a spike
+#   remembers the tags of the frame it happened in, so the summary can show
+#   what was going on when frames were dropped.
+# - frame() also takes how many simulation steps the frame ran, so the
+#   readout can show steps per second when the game is fast-forwarded.
+# - The presentation settings (vsync, frame cap, pacing) are part of the
+#   readout and summary, with how long frames spent waiting for their
+#   deadline and inside flip(), and how busy the CPU was - so different
+#   settings can be compared on the same display.
+
+import time
+from collections import Counter, deque
+
+BUCKET_MS = 0.5
+BUCKETS = 400  # Up to 200 ms, slower frames share the last bucket
+SLACK = 0.1  # A frame is over budget when it takes 10% longer than planned
+WORST_SPIKES = 5
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.total = 0
+
+    def add(self, ms, amount=1):
+        self.counts[min(BUCKETS - 1, int(ms / BUCKET_MS))] += amount
+        self.total += amount
+
+    def percentile(self, fraction):
+        """Upper edge of the bucket holding the given fraction of frames"""
+        if not self.total:
+            return 0.0
+        wanted = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return (index + 1) * BUCKET_MS
+        return BUCKETS * BUCKET_MS
+
+
+class FrameMonitor:
+    def __init__(self, fps=60, window=300):
+        self.budget_ms = 1000 / fps if fps else 0.0
+        self.presentation = f"{fps} fps cap" if fps else "uncapped"
+        self.recent = deque(maxlen=window)
+        self.recent_steps = deque(maxlen=window)
+        self.recent_wait = deque(maxlen=window)
+        self.recent_present = deque(maxlen=window)
+        self.steps = 0
+        self.wait_ms = 0.0
+        self.present_ms = 0.0
+        self.cpu_started = None
+        self.rolling = Histogram()
+        self.session = Histogram()
+        self.max_ms = 0.0
+        self.over_budget = 0
+        self.spike_tags = Counter()
+        self.worst = []  # (ms, frame number, tags), slowest first
+        self.tags = set()
+        self.frames = 0
+        self.last = None
+
+    def set_presentation(self, description, fps):
+        """Describe the presentation settings; fps (0 for none) sets the budget"""
+        self.presentation = description
+        self.budget_ms = 1000 / fps if fps else 0.0
+
+    def tag(self, event):
+        """Note an event that happened during the current frame"""
+        self.tags.add(event)
+
+    def frame(self, steps=1, wait_ms=0.0, present_ms=0.0):
+        """Call once per frame, right after the frame is shown, with the time
+        spent waiting for this frame's deadline and inside flip()"""
+        now = time.perf_counter()
+        if self.last is None:
+            self.last = now
+            self.cpu_started = (now, time.process_time())
+            self.tags.clear()
+            return
+        ms = (now - self.last) * 1000
+        self.last = now
+        self.frames += 1
+        self.steps += steps
+        self.recent_steps.append(steps)
+        self.wait_ms += wait_ms
+        self.present_ms += present_ms
+        self.recent_wait.append(wait_ms)
+        self.recent_present.append(present_ms)
+        if len(self.recent) == self.recent.maxlen:
+            self.rolling.add(self.recent[0], -1)
+        self.recent.append(ms)
+        self.rolling.add(ms)
+        self.session.add(ms)
+        self.max_ms = max(self.max_ms, ms)
+        if self.budget_ms and ms > self.budget_ms * (1 + SLACK):
+            self.over_budget += 1
+            tags = tuple(sorted(self.tags))
+            self.spike_tags.update(tags or ("(none)",))
+            if len(self.worst) < WORST_SPIKES or ms > self.worst[-1][0]:
+                self.worst.append((ms, self.frames, tags))
+                self.worst.sort(reverse=True)
+                del self.worst[WORST_SPIKES:]
+        self.tags.clear()
+
+    def readout(self):
+        """One line for the HUD, over the last window of frames"""
+        if not self.recent:
+            return "measuring..."
+        rolling = self.rolling
+        average = sum(self.recent) / len(self.recent)
+        over = sum(1 for ms in self.recent if self.budget_ms and ms > self.budget_ms * (1 + SLACK))
+        worst = max(self.recent)
+        # Bucket edges can overshoot the slowest frame
+        p50, p95, p99 = (min(worst, rolling.percentile(f)) for f in (0.5, 0.95, 0.99))
+        steps_per_second = sum(self.recent_steps) * 1000 / sum(self.recent)
+        return (f"{1000 / average:5.1f} fps  p50 {p50:4.1f}  p95 {p95:4.1f}  p99 {p99:4.1f}  "
+                f"max {worst:5.1f} ms  over {over}  {steps_per_second:4.0f} steps/s")
+
+    def pacing_readout(self):
+        """Second HUD line: presentation settings and where frame time went"""
+        if not self.recent:
+            return self.presentation
+        frames = len(self.recent)
+        return (f"{self.presentation}  wait {sum(self.recent_wait) / frames:4.1f}  "
+                f"flip {sum(self.recent_present) / frames:4.1f} ms")
+
+    def summary(self):
+        """Lines describing the whole session"""
+        session = self.session
+        if not session.total:
+            return ["Frame times: no frames recorded"]
+        p50, p95, p99 = (min(self.max_ms, session.percentile(f)) for f in (0.5, 0.95, 0.99))
+        lines = [
+            f"Frame times: {session.total} frames, budget {self.budget_ms:.1f} ms",
+            f"  p50 {p50:.1f} ms  p95 {p95:.1f} ms  p99 {p99:.1f} ms  max {self.max_ms:.1f} ms",
+            f"  over budget: {self.over_budget} frames ({self.over_budget / session.total:.1%})",
+            f"  simulation: {self.steps} steps ({self.steps / session.total:.2f} per frame)",
+            f"  presentation: {self.presentation}, waited {self.wait_ms / session.total:.1f} ms and "
+            f"flipped in {self.present_ms / session.total:.1f} ms per frame, {self.cpu_usage():.0%} CPU",
+        ]
+        if self.spike_tags:
+            tags = ", ".join(f"{tag} {count}" for tag, count in self.spike_tags.most_common())
+            lines.append(f"  spikes during: {tags}")
+        for ms, frame, tags in self.worst:
+            lines.append(f"  frame {frame}: {ms:.1f} ms [{', '.join(tags) or 'no events'}]")
+        return lines
+
+    def cpu_usage(self):
+        """Process CPU time over wall time since the first frame (can exceed 1 with threads)"""
+        if self.cpu_started is None:
+            return 0.0
+        wall = time.perf_counter() - self.cpu_started[0]
+        return (time.process_time() - self.cpu_started[1]) / wall if wall > 0 else 0.0
@@ -0,0 +1,170 @@
+# High Score Archive
+# ==================
+# Retention for highscores.csv, which otherwise grows with every saved score.
+#
+# A RetentionPolicy decides which rows stay in the CSV ("hot"):
+# - the fastest keep_top scores
+# - everything from the last keep_days days
+# - every player's personal best, so the player bests view doesn't change
+#
+# Everything else is moved into gzipped CSV files in the archive directory,
+# one per month of the score's date (highscores-2024-05.csv.gz). They have
+# the same columns as highscores.csv, so zcat or gzip.open reads them back.
+#
+# HighscoreWriter (highscore_writer.py) moves one month per step, on its own
+# thread while no scores are being saved. Rows are told apart by where they
+# are, not by what they hold - two players can set the same time in the
+# same minute, and both scores count. The archive files are appended to
+# first and the hot CSV rewritten last, each atomically, with the rows
+# archived by their position in the CSV (it only ever grows at the end
+# meanwhile).
+#
+# A journal in the archive directory says how long every archive file was
+# before, and what the CSV held when the rows were picked. If the next
+# compaction finds it, the last one was interrupted: if the CSV still
+# starts with the same rows it wasn't rewritten, so the archive files are
+# cut back, and the rows will simply be archived again.
+
+import csv
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+
+FIELDNAMES = ['name', 'time', 'date']
+JOURNAL = 'archiving.json'
+DATE = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d')  # How the game writes dates
+
+
+class RetentionPolicy:
+    def __init__(self, keep_top=1000, keep_days=365, keep_player_bests=True):
+        self.keep_top = keep_top
+        self.keep_days = keep_days
+        self.keep_player_bests = keep_player_bests
+
+    def split(self, rows, now=None):
+        """(hot rows, {month: [(position, cold row)]}), each in their original order"""
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.keep_days)).strftime('%Y-%m-%d %H:%M')
+        # No sort() here: it can't be interrupted, and this runs next to the
+        # game loop, which would wait for the whole sort to get the GIL back
+        scores = []
+        best = {}
+        for index, row in enumerate(rows):
+            try:
+                score = (int(row['time']), row['date'], row['name'], index)
+            except (KeyError, TypeError, ValueError):
+                continue  # Rows the game can't read stay where they are
+            if not (isinstance(score[1], str) and DATE.fullmatch(score[1]) and isinstance(score[2], str)):
+                continue  # ...and so do short rows (None for what's missing) and odd dates
+            scores.append(score)
+            if self.keep_player_bests and score < best.get(score[2], (float('inf'),)):
+                best[score[2]] = score
+        keep = set(score[3] for score in heapq.nsmallest(self.keep_top, scores))
+        keep.update(score[3] for score in best.values())
+        keep.update(score[3] for score in scores if score[1] >= cutoff)
+        readable = set(score[3] for score in scores)
+        hot, cold = [], {}
+        for index, row in enumerate(rows):
+            if index in keep or index not in readable:
+                hot.append(row)
+            else:
+                cold.setdefault(row['date'][:7], []).append((index, row))
+        return hot, cold
+
+
+def rows_digest(rows):
+    """A fingerprint of rows, in order"""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr((row['name'], str(row['time']), row['date'])).encode())
+    return digest.hexdigest()
+
+
+def archive_path(directory, month):
+    return os.path.join(directory, f"highscores-{month}.csv.gz")
+
+
+def read_archive(path):
+    """Rows of one archive file (empty list if it doesn't exist)"""
+    if not os.path.exists(path):
+        return []
+    with gzip.open(path, 'rt', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def write_archive(path, rows):
+    """Atomically replace the archive file at path with rows"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.highscores-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            with gzip.open(raw, 'wt', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)  # Not writerows(), see RetentionPolicy.split()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def start_journal(rows):
+    """A journal for archiving rows picked from the CSV rows"""
+    return {'rows': len(rows), 'digest': rows_digest(rows), 'months': {}}
+
+
+def write_journal(directory, journal):
+    """Atomically replace the journal"""
+    fd, tmp_path = tempfile.mkstemp(prefix='.archiving-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(journal, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(directory, JOURNAL))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def finish_journal(directory):
+    """The CSV has been rewritten: the archived rows are only in the archive now"""
+    path = os.path.join(directory, JOURNAL)
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def undo_interrupted(directory, rows):
+    """Cut the archive files back if the compaction in the journal never
+    rewrote the CSV, which holds rows now. Returns True if it did."""
+    path = os.path.join(directory, JOURNAL)
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        journal = json.load(f)
+    undone = len(rows) >= journal['rows'] and rows_digest(rows[:journal['rows']]) == journal['digest']
+    if undone:
+        for month, count in journal['months'].items():
+            archive = archive_path(directory, month)
+            write_archive(archive, read_archive(archive)[:count])
+    os.unlink(path)
+    return undone
+
+
+def archive_rows(directory, month, rows, journal):
+    """Append rows to the month's archive file, noting in the journal how
+    long it was before"""
+    os.makedirs(directory, exist_ok=True)
+    path = archive_path(directory, month)
+    archived = read_archive(path)
+    journal['months'].setdefault(month, len(archived))
+    write_journal(directory, journal)
+    write_archive(path, archived + list(rows))
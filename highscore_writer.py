@@ -0,0 +1,199 @@
+# High Score Writer
+# =================
+# Saves high scores on a background thread so the game loop never waits
+# on the disk.
+#
+# - The game hands new rows to submit(), which only puts them on a queue
+# - The writer thread drains everything that is waiting and writes it in
+#   one go, so several scores saved close together cost a single rewrite
+# - Each rewrite goes to a temporary file that is fsynced and then renamed
+#   over the real file, so a crash never leaves a half-written CSV
+# - close() writes whatever is still queued and stops the thread
+# - With load_index the thread first builds a Leaderboard of the whole CSV,
+#   which the game picks up with poll_index(), so a big file doesn't hold
+#   up the menu
+# - With a RetentionPolicy (highscore_archive.py) the thread also moves old
+#   rows out of the CSV whenever it has been idle for a moment, one small
+#   step at a time: pick the rows, archive them a month per step, rewrite
+#   the CSV once. Then it builds a fresh Leaderboard from the rows left in
+#   the CSV, which the game picks up with poll_index() - scores submitted
+#   after that are added on the way.
+
+import csv
+import os
+import queue
+import tempfile
+import threading
+
+from highscore_archive import archive_rows, finish_journal, start_journal, undo_interrupted
+from leaderboard import Leaderboard
+
+FIELDNAMES = ['name', 'time', 'date']
+
+STEP_PAUSE = 0.05  # Seconds between compaction steps once one has started
+
+_STOP = object()
+
+
+def read_rows(path):
+    """Read all rows of a high score CSV (empty list if it doesn't exist)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def write_rows(path, rows):
+    """Atomically replace the CSV at path with rows"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.highscores-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)  # writerows() would hold the GIL for the whole file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class HighscoreWriter:
+    def __init__(self, path, retention=None, archive_dir=None, idle_delay=1.0, load_index=False):
+        self.path = path
+        self.retention = retention
+        self.archive_dir = archive_dir
+        self.idle_delay = idle_delay  # Seconds without new scores before a compaction step
+        self.archived = 0  # Rows moved to the archive by this writer
+        self._compact_due = retention is not None
+        self._reindex = False  # Rows were archived since the last index was built
+        self._plan = None  # [(month, [(position, row)])] still to archive, newest first
+        self._journal = None  # For the current plan, see highscore_archive.py
+        self._archived = set()  # Positions in the CSV of the rows archived by the current plan
+        self._submitted = 0
+        self._written = 0  # Only touched by the writer thread
+        self.loading = load_index  # The first index hasn't been picked up yet
+        self._unindexed = []  # (number, row) submitted since the last index, game thread only
+        self._index = None  # (Leaderboard, rows written when it was built)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, args=(load_index,), name="highscore-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Queue a {'name', 'time', 'date'} row to be appended to the file"""
+        self._submitted += 1
+        if self.retention or self.loading:
+            self._unindexed.append((self._submitted, row))
+        self._queue.put(row)
+
+    def poll_index(self):
+        """A Leaderboard loaded at start or rebuilt after compaction, once,
+        or None if there is no new one"""
+        with self._lock:
+            index, self._index = self._index, None
+        if index is None:
+            return None
+        board, written = index
+        self._unindexed = [(number, row) for number, row in self._unindexed if number > written]
+        for _, row in self._unindexed:
+            board.add(row['name'], row['time'], row['date'])
+        self.loading = False
+        return board
+
+    def flush(self):
+        """Block until everything submitted so far is on disk"""
+        self._queue.join()
+
+    def close(self):
+        """Write any pending rows and stop the writer thread"""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self, load_index):
+        if load_index:
+            # Before any queued rows are written, so all of them get added
+            # by poll_index()
+            try:
+                board = Leaderboard.load(self.path)
+            except Exception as e:
+                print(f"Could not load high scores: {e}")
+                board = Leaderboard()
+            with self._lock:
+                self._index = (board, self._written)
+        while True:
+            if not self._compact_due:
+                timeout = None
+            elif self._plan is None and not self._reindex:
+                timeout = self.idle_delay  # Wait for a quiet moment before starting
+            else:
+                timeout = STEP_PAUSE
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                self._compact_step()
+                continue
+            # Coalesce: take everything else that is already waiting
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if item is not _STOP]
+            if rows:
+                try:
+                    write_rows(self.path, read_rows(self.path) + rows)
+                except Exception as e:  # Whatever is in the file, later saves still get a go
+                    print(f"Could not save high scores: {e}")
+                self._written += len(rows)
+                self._compact_due = self.retention is not None
+            for _ in batch:
+                self._queue.task_done()
+            if _STOP in batch:
+                return
+
+    def _compact_step(self):
+        """One step of moving old rows out of the file, whichever comes next:
+        pick the rows to archive, archive one month of them, or drop them all
+        from the file and build a new index"""
+        try:
+            if self._plan is None:
+                rows = read_rows(self.path)
+                if undo_interrupted(self.archive_dir, rows):
+                    print("Undid an interrupted high score archiving")
+                cold = self.retention.split(rows)[1]
+                if cold:
+                    self._plan = sorted(cold.items(), reverse=True)  # Oldest month last
+                    self._journal = start_journal(rows)
+                    return
+                if self._reindex:
+                    board = Leaderboard(rows)
+                    with self._lock:
+                        self._index = (board, self._written)
+                    self._reindex = False
+            elif self._plan:
+                month, cold = self._plan[-1]
+                archive_rows(self.archive_dir, month, [row for _, row in cold], self._journal)
+                self._archived.update(position for position, _ in cold)
+                self._plan.pop()
+                return
+            else:
+                # Newer scores may have been appended since the plan was
+                # made, after the rows it picked
+                archived = self._archived
+                rows = [row for position, row in enumerate(read_rows(self.path)) if position not in archived]
+                write_rows(self.path, rows)
+                finish_journal(self.archive_dir)
+                self.archived += len(archived)
+                self._archived = set()
+                self._plan = None
+                self._reindex = True
+                return  # Check again - the file should have nothing left to archive
+        except Exception as e:  # A bad row mustn't stop the thread, or saves with it
+            print(f"Could not archive high scores: {e}")
+            self._plan = None
+            self._archived = set()
+        self._compact_due = False
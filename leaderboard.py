@@ -0,0 +1,200 @@
+# Leaderboard
+# ===========
+# In-memory index over every high score part5 knows about, so the High
+# Scores screen can browse years of kiosk history without touching the disk
+# or sorting anything while it draws.
+#
+# Scores are kept as (time, date, name) tuples in three presorted lists:
+# - ranked: every score, fastest first. top(k, offset) is a slice, so a page
+#   costs O(k) however many scores there are.
+# - by_date: the same tuples ordered by date. Two bisects give how many
+#   scores fall in a date range.
+# - players: each player's personal best, fastest first, next to a
+#   name -> best dict.
+#
+# Dates are the CSV's 'YYYY-MM-DD HH:MM' strings, which sort by time, so a
+# range can be given as any prefix: since='2024-05' includes all of May.
+#
+# A date-filtered page either walks ranked until it has found enough scores
+# in the range, or sorts the range's by_date slice, whichever is expected to
+# look at fewer scores. Either way the work stays around sqrt(k * total)
+# scores in the worst case. The scores found for the last range are kept
+# (with where the walk stopped), so paging through one range only pays for
+# the scores on the new page.
+#
+# add() inserts with bisect, so a new score costs O(log n) comparisons plus
+# a list memmove.
+#
+# part5 builds its board on the high score writer's thread while the menu
+# is up. A single sort() or list(reader) can't be interrupted, and would
+# keep the game loop from getting the GIL back for seconds on a big file,
+# and neither can freeing a million parsed rows at once. So big lists are
+# sorted in chunks and merged, and rows are parsed as they're read.
+
+import bisect
+import csv
+import heapq
+import os
+import sys
+from operator import itemgetter
+
+SORT_CHUNK = 20000  # Most entries one sort() call sorts
+
+_date = itemgetter(1)
+
+
+def _sorted(entries, key=None):
+    """sorted(entries), a chunk of SORT_CHUNK entries per sort() call"""
+    if len(entries) <= SORT_CHUNK:
+        return sorted(entries, key=key)
+    chunks = [sorted(entries[start:start + SORT_CHUNK], key=key) for start in range(0, len(entries), SORT_CHUNK)]
+    return list(heapq.merge(*chunks, key=key))
+
+
+def _date_order(entry):
+    time_seconds, date, name = entry
+    return date, time_seconds, name
+
+
+def _as_dict(entry):
+    time_seconds, date, name = entry
+    return {'name': name, 'time': time_seconds, 'date': date}
+
+
+def _read_rows(path):
+    """The CSV's rows one at a time, so each is freed once it's been parsed"""
+    try:
+        with open(path, 'r', newline='') as f:
+            yield from csv.DictReader(f)
+    except (OSError, csv.Error) as e:
+        print(f"Could not read high scores: {e}")
+
+
+class Leaderboard:
+    def __init__(self, rows=()):
+        self.ranked = []
+        self.by_date = []
+        self.best = {}
+        self.players = []
+        self._range = None  # (since, until, scores found, next index into ranked)
+        self.extend(rows)
+
+    @classmethod
+    def load(cls, path):
+        """Build a leaderboard from a high score CSV, skipping broken rows"""
+        return cls(_read_rows(path) if os.path.exists(path) else ())
+
+    def extend(self, rows):
+        """Add many {'name', 'time', 'date'} rows, re-sorting once"""
+        entries = []
+        for row in rows:
+            try:
+                entries.append((int(row['time']), sys.intern(row['date']), sys.intern(row['name'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if len(entries) < 16:
+            for entry in entries:
+                self._insert(entry)
+            return
+        self._range = None
+        self.ranked = _sorted(self.ranked + entries)
+        self.by_date = _sorted(self.ranked, key=_date_order)
+        for entry in reversed(self.ranked):
+            self.best[entry[2]] = entry  # Fastest run is written last
+        self.players = _sorted(list(self.best.values()))
+
+    def add(self, name, time_seconds, date):
+        """Add one score. Dates are to the minute, so a player can set the
+        same time twice with the same date - both count."""
+        self._insert((int(time_seconds), sys.intern(date), sys.intern(name)))
+
+    def add_shared(self, score):
+        """Add a {'name', 'time', 'date'} score from the shared leaderboard.
+        The shared top-N is fetched again and again, and holds our own scores
+        too, so returns False without adding if the same score is already in."""
+        entry = (int(score['time']), sys.intern(score['date']), sys.intern(score['name']))
+        index = bisect.bisect_left(self.ranked, entry)
+        if index < len(self.ranked) and self.ranked[index] == entry:
+            return False
+        self._insert(entry, index)
+        return True
+
+    def _insert(self, entry, index=None):
+        if index is None:
+            index = bisect.bisect_left(self.ranked, entry)
+        self._range = None
+        self.ranked.insert(index, entry)
+        bisect.insort(self.by_date, entry, key=_date_order)
+        name = entry[2]
+        old = self.best.get(name)
+        if old is None or entry < old:
+            if old is not None:
+                del self.players[bisect.bisect_left(self.players, old)]
+            self.best[name] = entry
+            bisect.insort(self.players, entry)
+
+    def count(self, since=None, until=None):
+        """Number of scores with since <= date < until"""
+        if since is None and until is None:
+            return len(self.ranked)
+        low, high = self._date_span(since, until)
+        return high - low
+
+    def _date_span(self, since, until):
+        by_date = self.by_date
+        low = 0 if since is None else bisect.bisect_left(by_date, since, key=_date)
+        high = len(by_date) if until is None else bisect.bisect_left(by_date, until, key=_date)
+        return low, max(low, high)
+
+    def top(self, k=10, offset=0, since=None, until=None):
+        """Fastest k scores after skipping offset, optionally within a date range"""
+        if since is None and until is None:
+            return [_as_dict(entry) for entry in self.ranked[offset:offset + k]]
+        low, high = self._date_span(since, until)
+        matching = high - low
+        if offset >= matching:
+            return []
+        wanted = min(offset + k, matching)
+        if self._range and self._range[:2] == (since, until):
+            found, position = self._range[2:]
+        elif matching * matching <= wanted * len(self.ranked):
+            # Walking ranked is expected to look at wanted * total / matching
+            # scores, sorting looks at all matching ones (once - later pages
+            # are slices)
+            found, position = sorted(self.by_date[low:high]), None
+        else:
+            found, position = [], 0
+        if position is not None and len(found) < wanted:
+            ranked = self.ranked
+            for position in range(position, len(ranked)):
+                entry = ranked[position]
+                if (since is None or entry[1] >= since) and (until is None or entry[1] < until):
+                    found.append(entry)
+                    if len(found) == wanted:
+                        break
+            position += 1
+        self._range = (since, until, found, position)
+        return [_as_dict(entry) for entry in found[offset:offset + k]]
+
+    def personal_best(self, name):
+        """A player's fastest score, or None if they have none"""
+        entry = self.best.get(name)
+        return _as_dict(entry) if entry else None
+
+    def player_rank(self, name):
+        """1-based position of a player's best among all players' bests"""
+        entry = self.best.get(name)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self.players, entry) + 1
+
+    def player_count(self):
+        return len(self.players)
+
+    def top_players(self, k=10, offset=0):
+        """Personal bests, fastest player first"""
+        return [_as_dict(entry) for entry in self.players[offset:offset + k]]
+
+    def rows(self):
+        """Every score as a CSV row dict, fastest first"""
+        return [{'name': name, 'time': time_seconds, 'date': date} for time_seconds, date, name in self.ranked]
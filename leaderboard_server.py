@@ -0,0 +1,124 @@
+# Leaderboard Server
+# ==================
+# A small shared leaderboard built only on the standard library. It is the
+# stand-in for the fleet leaderboard that leaderboard_sync.py talks to, so
+# the sync client can be run and tested entirely on localhost:
+#
+#     python leaderboard_server.py --port 8765
+#     python part5.py --leaderboard-url http://127.0.0.1:8765
+#
+# Endpoints (JSON):
+# - POST /scores   {"scores": [{"id", "name", "time", "date", "machine"}, ...]}
+#                  Scores whose id was already accepted are ignored, so a
+#                  client may safely resend a batch after a lost response.
+# - GET  /top?n=10 {"scores": [...]} - best n times, lowest first
+#
+# Connections are HTTP/1.1 keep-alive. Scores are kept in memory only.
+
+import argparse
+import bisect
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_TOP = 100
+
+
+class LeaderboardStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = set()
+        self._sorted = []  # (time, name, date, id) kept sorted by time
+
+    def add(self, scores):
+        """Add scores, returns how many were new"""
+        added = 0
+        with self._lock:
+            for score in scores:
+                score_id = str(score['id'])
+                if score_id in self._ids:
+                    continue
+                self._ids.add(score_id)
+                entry = (int(score['time']), str(score['name'])[:12], str(score['date']), score_id)
+                bisect.insort(self._sorted, entry)
+                added += 1
+        return added
+
+    def top(self, n):
+        with self._lock:
+            best = self._sorted[:n]
+        return [{'name': name, 'time': time_seconds, 'date': date, 'id': score_id}
+                for time_seconds, name, date, score_id in best]
+
+
+class LeaderboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/top':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            n = int(parse_qs(url.query).get('n', ['10'])[0])
+        except ValueError:
+            self._send(400, {'error': 'n must be an integer'})
+            return
+        n = max(1, min(MAX_TOP, n))
+        self._send(200, {'scores': self.server.store.top(n)})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/scores':
+            self._send(404, {'error': 'not found'})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            body = json.loads(self.rfile.read(length))
+            added = self.server.store.add(body['scores'])
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {'error': 'expected {"scores": [...]}'})
+            return
+        self._send(200, {'added': added})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=8765, verbose=False):
+    """Create (but don't start) a leaderboard server - port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), LeaderboardHandler)
+    server.daemon_threads = True
+    server.store = LeaderboardStore()
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in leaderboard server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.verbose)
+    print(f"Leaderboard server on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
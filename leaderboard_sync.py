@@ -0,0 +1,180 @@
+# Leaderboard Sync
+# ================
+# Optional client that shares high scores with a fleet leaderboard
+# (see leaderboard_server.py for the local stand-in).
+#
+# - submit() only appends to a pending list, so it is safe on the frame
+# - A background thread sends pending scores in batches over a small pool
+#   of keep-alive HTTP connections
+# - When the server can't be reached the batch stays pending and the
+#   thread retries with exponential backoff (plus a little jitter)
+# - After every successful sync the remote top-N is fetched; the game picks
+#   it up with poll() and adds it to its local board (leaderboard.py). A
+#   reply that isn't a list of scores counts as a failed sync.
+
+import http.client
+import json
+import random
+import socket
+import threading
+import uuid
+from urllib.parse import urlparse
+
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class ConnectionPool:
+    """Reuses keep-alive HTTP connections to one host"""
+    def __init__(self, url, size=2, timeout=5.0):
+        parsed = urlparse(url)
+        self.https = parsed.scheme == 'https'
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.size = size
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def request(self, method, path, payload=None):
+        """Send a JSON request and return the decoded JSON response"""
+        body = json.dumps(payload).encode() if payload is not None else None
+        conn = self._take_idle()
+        if conn is not None:
+            try:
+                return self._send(conn, method, path, body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                pass  # The server dropped the idle connection - retry on a fresh one
+        return self._send(self._connect(), method, path, body)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _send(self, conn, method, path, body):
+        try:
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            conn.request(method, self.base_path + path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            if response.status != 200:
+                raise OSError(f"{method} {path} returned HTTP {response.status}")
+            result = json.loads(data)
+        except BaseException:
+            # The connection may be half-broken - never reuse it
+            conn.close()
+            raise
+        self._give_back(conn)
+        return result
+
+    def _take_idle(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return None
+
+    def _connect(self):
+        if self.https:
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _give_back(self, conn):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+
+def _top_scores(result):
+    """The scores of a /top reply, checked so the game can add them as is"""
+    scores = result.get('scores') if isinstance(result, dict) else None
+    if not isinstance(scores, list):
+        raise ValueError("top scores reply has no list of scores")
+    for score in scores:
+        if not (isinstance(score, dict) and isinstance(score.get('name'), str)
+                and isinstance(score.get('time'), int) and isinstance(score.get('date'), str)):
+            raise ValueError(f"malformed score in top scores reply: {score!r}")
+    return scores
+
+
+class LeaderboardSync:
+    def __init__(self, url, top_n=10, batch_size=50, refresh_interval=30.0):
+        self.pool = ConnectionPool(url)
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.refresh_interval = refresh_interval
+        self.machine = socket.gethostname()
+        self.online = False
+        self._pending = []
+        self._remote_top = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="leaderboard-sync", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, time_seconds, date):
+        """Queue a score for upload (never blocks on the network)"""
+        score = {'id': uuid.uuid4().hex, 'name': name, 'time': int(time_seconds),
+                 'date': date, 'machine': self.machine}
+        with self._lock:
+            self._pending.append(score)
+        self._wake.set()
+
+    def poll(self):
+        """Return the newest remote top-N once, or None if nothing new arrived"""
+        with self._lock:
+            remote, self._remote_top = self._remote_top, None
+        return remote
+
+    @property
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, timeout=2.0):
+        """Try one last sync (bounded by timeout) and stop the thread"""
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+        self.pool.close()
+
+    def _run(self):
+        backoff = MIN_BACKOFF
+        while not self._stopping:
+            try:
+                self._sync()
+                self.online = True
+                backoff = MIN_BACKOFF
+                wait = self.refresh_interval
+            except (OSError, ValueError, http.client.HTTPException):
+                self.online = False
+                wait = backoff * random.uniform(0.8, 1.2)
+                backoff = min(MAX_BACKOFF, backoff * 2)
+            # submit() and close() wake the thread early
+            self._wake.wait(wait)
+            self._wake.clear()
+        if self.pending_count:
+            try:
+                self._sync()
+            except (OSError, ValueError, http.client.HTTPException):
+                pass
+
+    def _sync(self):
+        """Upload all pending scores batch by batch, then fetch the top-N"""
+        while True:
+            with self._lock:
+                batch = self._pending[:self.batch_size]
+            if not batch:
+                break
+            self.pool.request('POST', '/scores', {'scores': batch})
+            # Only drop the batch once the server has confirmed it
+            with self._lock:
+                del self._pending[:len(batch)]
+        scores = _top_scores(self.pool.request('GET', f'/top?n={self.top_n}'))
+        with self._lock:
+            self._remote_top = scores
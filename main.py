@@ -1,12 +1,12 @@
-import pygame
+import time
+STARTUP_T0 = time.perf_counter()  # Taken before pygame is imported
 
-# Initialize pygame
-pygame.init()
+import argparse
+import pygame
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Breakout")
+screen = None  # Window is opened in main()
 
 # Colors
 WHITE = (255, 255, 255)
@@ -26,57 +26,94 @@ ball_y = HEIGHT // 2
 ball_dx = 4
 ball_dy = -4
 
-# Game loop
-clock = pygame.time.Clock()
-running = True
-
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Paddle movement
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT] and paddle_x > 0:
-        paddle_x -= paddle_speed
-    if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
-        paddle_x += paddle_speed
-
-    # Ball movement
-    ball_x += ball_dx
-    ball_y += ball_dy
-
-    # Ball collision with walls
-    if ball_x <= 0 or ball_x >= WIDTH - ball_size:
-        ball_dx = -ball_dx
-    if ball_y <= 0:
-        ball_dy = -ball_dy
-
-    # Ball collision with paddle
-    if (ball_y + ball_size >= paddle_y and 
-        ball_y + ball_size <= paddle_y + paddle_height and
-        ball_x + ball_size >= paddle_x and 
-        ball_x <= paddle_x + paddle_width):
-        ball_dy = -ball_dy
-        ball_y = paddle_y - ball_size  # Prevent sticking
-
-    # Ball falls off bottom - reset
-    if ball_y > HEIGHT:
-        ball_x = WIDTH // 2
-        ball_y = HEIGHT // 2
-        ball_dy = -4
-
-    # Draw everything
-    screen.fill(BLACK)
-
-    # paddle
-    pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
-
-    # ball
-    pygame.draw.ellipse(screen, WHITE, (ball_x, ball_y, ball_size, ball_size))
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Breakout - part 1")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print time-to-first-frame measurements")
+    return parser.parse_args()
+
+def report_startup(marks):
+    """Print how long each startup phase took, starting from STARTUP_T0"""
+    print("Startup profile:")
+    previous = STARTUP_T0
+    for name, timestamp in marks:
+        print(f"  {name:<14}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"  {'total':<14}{(previous - STARTUP_T0) * 1000:8.1f} ms")
+
+def main():
+    global screen, paddle_x, ball_x, ball_y, ball_dx, ball_dy
+    args = parse_args()
+    startup_marks = [("imports", time.perf_counter())]
+    
+    # Only start the subsystems we use - pygame.init() would also start audio
+    pygame.display.init()
+    startup_marks.append(("pygame init", time.perf_counter()))
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Breakout")
+    startup_marks.append(("window", time.perf_counter()))
+    
+    # Game loop
+    clock = pygame.time.Clock()
+    clock.tick()  # Also starts the SDL timer behind pygame.time.get_ticks()
+    running = True
+    first_frame = True
+
+    while running:
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        # Paddle movement
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT] and paddle_x > 0:
+            paddle_x -= paddle_speed
+        if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
+            paddle_x += paddle_speed
+
+        # Ball movement
+        ball_x += ball_dx
+        ball_y += ball_dy
+
+        # Ball collision with walls
+        if ball_x <= 0 or ball_x >= WIDTH - ball_size:
+            ball_dx = -ball_dx
+        if ball_y <= 0:
+            ball_dy = -ball_dy
+
+        # Ball collision with paddle
+        if (ball_y + ball_size >= paddle_y and 
+            ball_y + ball_size <= paddle_y + paddle_height and
+            ball_x + ball_size >= paddle_x and 
+            ball_x <= paddle_x + paddle_width):
+            ball_dy = -ball_dy
+            ball_y = paddle_y - ball_size  # Prevent sticking
+
+        # Ball falls off bottom - reset
+        if ball_y > HEIGHT:
+            ball_x = WIDTH // 2
+            ball_y = HEIGHT // 2
+            ball_dy = -4
+
+        # Draw everything
+        screen.fill(BLACK)
+
+        # paddle
+        pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
+
+        # ball
+        pygame.draw.ellipse(screen, WHITE, (ball_x, ball_y, ball_size, ball_size))
+
+        pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            startup_marks.append(("first frame", time.perf_counter()))
+            if args.startup_profile:
+                report_startup(startup_marks)
+        clock.tick(60)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
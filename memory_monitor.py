@@ -0,0 +1,136 @@
+# Memory Monitor
+# ==============
+# Opt-in memory sampling for long part5 sessions (F4 starts and stops it).
+#
+# While running, every `interval` seconds it records:
+# - the resident set size of the process
+# - how many objects of the watched types exist (particles, balls, Rects,
+#   Surfaces, ...). Rect and Surface aren't tracked by the garbage collector,
+#   so they are found by also looking one level inside every tracked object.
+# - the top allocation sites from tracemalloc, with how much each one grew
+#   since the previous sample
+#
+# Each sample is appended as one JSON line to the log file, so a session can
+# be plotted or diffed afterwards. Sampling walks the whole heap and takes a
+# while, which is why it is off by default.
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+TRACE_FRAMES = 1  # Stack depth kept by tracemalloc per allocation
+
+
+def read_rss():
+    """Resident set size in bytes (peak size where the current one isn't available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def count_objects(watched):
+    """Count live instances of each type in watched (exact type match)"""
+    counts = dict.fromkeys(watched, 0)
+    seen = set()
+    for obj in gc.get_objects():
+        kind = type(obj)
+        if kind in counts:
+            counts[kind] += 1
+        # Untracked objects (Rect, Surface) only show up as referents
+        for inner in gc.get_referents(obj):
+            kind = type(inner)
+            if kind in counts and not gc.is_tracked(inner) and id(inner) not in seen:
+                seen.add(id(inner))
+                counts[kind] += 1
+    return {kind.__name__: count for kind, count in counts.items()}
+
+
+class MemoryMonitor:
+    def __init__(self, path, watched, interval=5.0, top=10):
+        self.path = path
+        self.watched = tuple(watched)
+        self.interval = interval
+        self.top = top
+        self.active = False
+        self.samples = 0
+        self.last_rss = 0
+        self.started = 0.0
+        self.next_sample = 0.0
+        self.snapshot = None
+        self.tracing = False  # Whether we started tracemalloc
+
+    def toggle(self):
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+        return self.active
+
+    def start(self):
+        self.active = True
+        self.started = time.perf_counter()
+        self.next_sample = self.started
+        self.snapshot = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self.tracing = True
+
+    def stop(self):
+        self.active = False
+        self.snapshot = None
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def update(self):
+        """Take a sample if one is due. Returns True when it did."""
+        if not self.active or time.perf_counter() < self.next_sample:
+            return False
+        self.sample()
+        # Scheduled after the sample, which can take a while itself
+        self.next_sample = time.perf_counter() + self.interval
+        return True
+
+    def sample(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        if self.snapshot is None:
+            stats = [(stat, 0) for stat in snapshot.statistics('lineno')[:self.top]]
+        else:
+            stats = [(stat, stat.size_diff) for stat in snapshot.compare_to(self.snapshot, 'lineno')[:self.top]]
+        self.snapshot = snapshot
+        self.last_rss = read_rss()
+        record = {
+            'time': round(time.perf_counter() - self.started, 3),
+            'rss': self.last_rss,
+            'traced': tracemalloc.get_traced_memory()[0],
+            'objects': count_objects(self.watched),
+            'top': [{
+                'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'size': stat.size,
+                'count': stat.count,
+                'growth': growth,
+            } for stat, growth in stats],
+        }
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Memory monitor: could not write {self.path}: {e}")
+        self.samples += 1
+
+    def readout(self):
+        return f"memory log: {self.samples} samples, RSS {self.last_rss / 2**20:.0f} MB"
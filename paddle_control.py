@@ -0,0 +1,282 @@
+# Paddle Control
+# ==============
+# Where part5's paddle input comes from. Every controller has the same
+# move(paddle_x, balls, start, end) method returning where the paddle should
+# be after one simulation step, so the game moves the paddle the same way
+# whoever is playing. start and end are the stretch of real time
+# (time.perf_counter()) the step stands for.
+#
+# - KeyboardControl moves the paddle for as much of the step as an arrow
+#   key was held
+# - MouseControl puts the paddle center under the mouse
+# - Autopilot plays by itself, for headless runs and soak tests
+#
+# Input timeline
+# --------------
+# Reading the keys once per frame means a key pressed just after that read
+# waits a whole frame, and a tap shorter than a frame moves the paddle a
+# whole step (or not at all). Instead an InputTimeline polls SDL's event
+# queue several times per frame - at the start, again right before the
+# paddle is drawn and every millisecond while waiting for the next frame -
+# and stamps every event with the time it was polled. Controllers replay
+# those stamped changes over the steps of the next frame, so the paddle
+# ends each frame where the input says it should be at that moment. After
+# every step the game calls applied(), whichever controller (or the
+# autopilot, or a rewind replay) moved the paddle, so the history only
+# ever holds input the simulation hasn't reached yet.
+#
+# Late latch: just before the paddle is drawn the timeline is polled once
+# more, and latch() says where the paddle would be by now. It is drawn
+# there; the simulation catches up with the same input next frame.
+#
+# With measure_latency the timeline also records, for every paddle input,
+# how long it took until a frame showing its effect was presented.
+#
+# Autopilot
+# ---------
+# The autopilot doesn't step the simulation forward to see where a ball
+# lands. A ball moves in straight lines and the side walls mirror it, so its
+# x position at the paddle is its unfolded x (x + dx * frames) folded back
+# into the playfield like a triangle wave. Balls on their way up are
+# treated as bouncing off the top wall. That's a handful of arithmetic per
+# ball per frame, so thousands of balls are fine.
+#
+# The ball that lands first is chased, unless the paddle can't get there in
+# time, in which case the next most urgent reachable ball is picked.
+
+import time
+from collections import deque
+
+import pygame
+
+from frame_monitor import Histogram
+
+POLL_INTERVAL = 0.001  # Seconds between polls while waiting for the next frame
+SPIN_MARGIN = 0.002  # Hybrid pacing stops sleeping this long before the deadline
+PACING_MODES = ("sleep", "hybrid", "busy")
+LATENCY_TIMEOUT = 1.0  # Input not shown within this long (game paused) isn't counted
+
+
+class InputTimeline:
+    def __init__(self, to_logical, measure_latency=None):
+        self.to_logical = to_logical  # Window pixels -> playfield (Viewport.to_logical)
+        self.measure_latency = measure_latency  # None, "keys" or "mouse"
+        self.pending = []  # Polled events the game loop hasn't handled yet
+        self.last_poll = time.perf_counter()
+        self.left = self.right = False
+        self.keys = deque()  # (time, left held, right held) at every change
+        self.keys_before = (False, False)  # Held state before the oldest change
+        self.mouse_x = None
+        self.mouse = deque()  # (time, x) at every move
+        self.mouse_before = None
+        self.unshown = deque()  # Times of inputs not presented yet
+        self.applied_until = 0.0  # Inputs up to here are in the simulation or latch
+        self.latency = Histogram()
+        self.latency_max = 0.0
+
+    def poll(self):
+        """Take everything waiting in the event queue, stamping paddle input"""
+        now = time.perf_counter()
+        # The events arrived some time since the last poll - halfway is the best guess
+        stamp = (self.last_poll + now) / 2
+        self.last_poll = now
+        for event in pygame.event.get():
+            self.pending.append(event)
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                held = event.type == pygame.KEYDOWN
+                if event.key == pygame.K_LEFT:
+                    self.left = held
+                else:
+                    self.right = held
+                self.keys.append((stamp, self.left, self.right))
+                if self.measure_latency == "keys":
+                    self.unshown.append(stamp)
+            elif event.type == pygame.MOUSEMOTION:
+                self.mouse_x = self.to_logical(event.pos)[0]
+                self.mouse.append((stamp, self.mouse_x))
+                if self.measure_latency == "mouse":
+                    self.unshown.append(stamp)
+        return now
+
+    def events(self):
+        """Poll, then hand over every event since the last call"""
+        self.poll()
+        events, self.pending = self.pending, []
+        return events
+
+    def wait_until(self, deadline, pacing="sleep"):
+        """Wait for deadline while polling input. "sleep" sleeps POLL_INTERVAL
+        between polls (a sleep can overshoot), "busy" polls without sleeping
+        (on time, but keeps a core busy), "hybrid" sleeps until SPIN_MARGIN
+        before the deadline and then polls without sleeping."""
+        spin_from = deadline - SPIN_MARGIN if pacing == "hybrid" else deadline
+        while True:
+            now = self.poll()
+            if now >= deadline:
+                return
+            if pacing != "busy" and now < spin_from:
+                time.sleep(min(POLL_INTERVAL, spin_from - now))
+
+    def held(self, start, end):
+        """Fractions of [start, end) the left and right keys were held"""
+        left, right = self.keys_before
+        left_time = right_time = 0.0
+        since = start
+        for stamp, new_left, new_right in self.keys:
+            if stamp >= end:
+                break
+            if stamp > since:
+                left_time += left * (stamp - since)
+                right_time += right * (stamp - since)
+                since = stamp
+            left, right = new_left, new_right
+        left_time += left * (end - since)
+        right_time += right * (end - since)
+        span = end - start
+        if span <= 0:
+            return float(left), float(right)
+        return left_time / span, right_time / span
+
+    def mouse_at(self, when):
+        """Mouse x at a moment, or None if it hasn't moved over the window yet"""
+        x = self.mouse_before
+        for stamp, new_x in self.mouse:
+            if stamp >= when:
+                break
+            x = new_x
+        return x
+
+    def applied(self, until):
+        """Input up to until has been applied; older history can go"""
+        self.applied_until = max(self.applied_until, until)
+        while self.keys and self.keys[0][0] < until:
+            self.keys_before = self.keys.popleft()[1:]
+        while self.mouse and self.mouse[0][0] < until:
+            self.mouse_before = self.mouse.popleft()[1]
+
+    def presented(self):
+        """Call right after a frame is shown to record input latency"""
+        if not self.unshown:
+            return
+        now = time.perf_counter()
+        while self.unshown and (self.unshown[0] <= self.applied_until or now - self.unshown[0] > LATENCY_TIMEOUT):
+            stamp = self.unshown.popleft()
+            if stamp <= self.applied_until:
+                ms = (now - stamp) * 1000
+                self.latency.add(ms)
+                self.latency_max = max(self.latency_max, ms)
+
+    def readout(self):
+        latency = self.latency
+        if not latency.total:
+            return f"input latency ({self.measure_latency}): waiting for input"
+        p50, p95 = (min(self.latency_max, latency.percentile(f)) for f in (0.5, 0.95))
+        return (f"input latency ({self.measure_latency}): {latency.total} inputs  "
+                f"p50 {p50:4.1f}  p95 {p95:4.1f}  max {self.latency_max:5.1f} ms")
+
+    def summary(self):
+        """Lines describing the whole session"""
+        latency = self.latency
+        if not latency.total:
+            return [f"Input latency ({self.measure_latency}): no input measured"]
+        p50, p95, p99 = (min(self.latency_max, latency.percentile(f)) for f in (0.5, 0.95, 0.99))
+        return [
+            f"Input latency ({self.measure_latency}): {latency.total} inputs, to the frame shown",
+            f"  p50 {p50:.1f} ms  p95 {p95:.1f} ms  p99 {p99:.1f} ms  max {self.latency_max:.1f} ms",
+        ]
+
+
+class KeyboardControl:
+    def __init__(self, timeline, paddle_speed):
+        self.timeline = timeline
+        self.paddle_speed = paddle_speed
+
+    def move(self, paddle_x, balls, start, end):
+        left, right = self.timeline.held(start, end)
+        return paddle_x + (right - left) * self.paddle_speed
+
+    def latch(self, paddle_x, start, now, step_seconds):
+        """Where the paddle would be by now (start is where the simulation is)"""
+        left, right = self.timeline.held(start, now)
+        self.timeline.applied_until = max(self.timeline.applied_until, now)
+        return paddle_x + (right - left) * self.paddle_speed * (now - start) / step_seconds
+
+
+class MouseControl:
+    def __init__(self, timeline, paddle_width):
+        self.timeline = timeline
+        self.paddle_width = paddle_width
+
+    def move(self, paddle_x, balls, start, end):
+        x = self.timeline.mouse_at(end)
+        return paddle_x if x is None else x - self.paddle_width / 2
+
+    def latch(self, paddle_x, start, now, step_seconds):
+        x = self.timeline.mouse_x
+        self.timeline.applied_until = max(self.timeline.applied_until, now)
+        return paddle_x if x is None else x - self.paddle_width / 2
+
+
+class Autopilot:
+    def __init__(self, width, paddle_y, paddle_width, paddle_speed, ball_size):
+        self.paddle_y = paddle_y
+        self.paddle_width = paddle_width
+        self.paddle_speed = paddle_speed
+        self.ball_size = ball_size
+        self.max_x = width - ball_size  # Balls bounce between x = 0 and here
+        self.target = None  # Paddle center being aimed for
+
+    def choose(self, paddle_x, balls):
+        """Paddle center to aim for, or None without any balls to catch"""
+        center = paddle_x + self.paddle_width / 2
+        reach = self.paddle_width / 2
+        speed = self.paddle_speed
+        catch_y = self.paddle_y - self.ball_size
+        max_x = self.max_x
+        span = 2 * max_x
+        half_ball = self.ball_size / 2
+        best_frames = fallback_frames = float('inf')
+        best = fallback = None  # Most urgent reachable ball, most urgent overall
+        # Written out in one loop rather than helper calls - this runs for
+        # every ball every frame
+        for ball in balls:
+            # Frames until the ball reaches the paddle
+            dy = ball.dy
+            if dy > 0:
+                if ball.y > catch_y:
+                    continue  # Already past the paddle
+                frames = (catch_y - ball.y) / dy
+            elif dy < 0:
+                frames = (ball.y + catch_y) / -dy  # Up to the top wall and back down
+            else:
+                continue
+            if frames >= best_frames:
+                continue  # Can't beat the current pick (fallback_frames <= best_frames)
+            # Its x there, folded back between the side walls
+            x = (ball.x + ball.dx * frames) % span
+            if x > max_x:
+                x = span - x
+            target = x + half_ball
+            if frames < fallback_frames:
+                fallback_frames = frames
+                fallback = target
+            if abs(target - center) - reach <= frames * speed:
+                best_frames = frames
+                best = target
+        return best if best is not None else fallback
+
+    def read(self, paddle_x, balls):
+        """(left, right) like the arrow keys"""
+        self.target = self.choose(paddle_x, balls)
+        if self.target is None:
+            return False, False
+        offset = self.target - (paddle_x + self.paddle_width / 2)
+        # Close enough is within one step, so the paddle doesn't jitter
+        return offset < -self.paddle_speed / 2, offset > self.paddle_speed / 2
+
+    def move(self, paddle_x, balls, start, end):
+        left, right = self.read(paddle_x, balls)
+        return paddle_x + (right - left) * self.paddle_speed
+
+    def latch(self, paddle_x, start, now, step_seconds):
+        return paddle_x
@@ -10,17 +10,17 @@
 # - Credits screen showing author info
 # - Game pause functionality
 
+import time
+STARTUP_T0 = time.perf_counter()  # Taken before pygame is imported
+
+import argparse
 import pygame
 import random
 import math
 
-# Initialize pygame
-pygame.init()
-
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Breakout")
+screen = None  # Window is opened in main()
 
 # Colors
 WHITE = (255, 255, 255)
@@ -33,10 +33,21 @@ YELLOW = (255, 255, 0)
 CYAN = (0, 255, 255)
 GRAY = (100, 100, 100)
 
-# Fonts
-font_large = pygame.font.Font(None, 72)
-font_medium = pygame.font.Font(None, 48)
-font_small = pygame.font.Font(None, 36)
+# Fonts (loaded on first use, not at import)
+class LazyFont:
+    """pygame Font that is only loaded the first time it renders"""
+    def __init__(self, size):
+        self.size = size
+        self.font = None
+    
+    def render(self, *args):
+        if self.font is None:
+            self.font = pygame.font.Font(None, self.size)
+        return self.font.render(*args)
+
+font_large = LazyFont(72)
+font_medium = LazyFont(48)
+font_small = LazyFont(36)
 
 # 1. Block settings
 block_width, block_height = 75, 20
@@ -355,137 +366,177 @@ def draw_hud():
     esc_text = font_small.render("ESC - Menu", True, GRAY)
     screen.blit(esc_text, (WIDTH // 2 - 50, HEIGHT - 30))
 
-# Game loop
-clock = pygame.time.Clock()
-running = True
-pause_time = 0
-
-while running:
-    mouse_pos = pygame.mouse.get_pos()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Breakout - part 3")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print time-to-first-frame measurements")
+    return parser.parse_args()
+
+def report_startup(marks):
+    """Print how long each startup phase took, starting from STARTUP_T0"""
+    print("Startup profile:")
+    previous = STARTUP_T0
+    for name, timestamp in marks:
+        print(f"  {name:<14}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"  {'total':<14}{(previous - STARTUP_T0) * 1000:8.1f} ms")
+
+def main():
+    global screen, paddle_x, ball_x, ball_y, ball_dx, ball_dy, particles, explosion_particles
+    global game_paused, show_credits, start_time, pause_time
+    args = parse_args()
+    startup_marks = [("imports", time.perf_counter())]
+    
+    # Only start the subsystems we use - pygame.init() would also start audio
+    pygame.display.init()
+    pygame.font.init()
+    startup_marks.append(("pygame init", time.perf_counter()))
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Breakout")
+    startup_marks.append(("window", time.perf_counter()))
     
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    # Game loop
+    clock = pygame.time.Clock()
+    clock.tick()  # Also starts the SDL timer behind pygame.time.get_ticks()
+    start_time = pygame.time.get_ticks()
+    running = True
+    first_frame = True
+    pause_time = 0
+
+    while running:
+        mouse_pos = pygame.mouse.get_pos()
         
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                if show_credits:
-                    show_credits = False
-                else:
-                    game_paused = not game_paused
-                    if game_paused:
-                        pause_time = pygame.time.get_ticks()
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    if show_credits:
+                        show_credits = False
                     else:
-                        # Adjust start_time to account for pause duration
-                        start_time += pygame.time.get_ticks() - pause_time
+                        game_paused = not game_paused
+                        if game_paused:
+                            pause_time = pygame.time.get_ticks()
+                        else:
+                            # Adjust start_time to account for pause duration
+                            start_time += pygame.time.get_ticks() - pause_time
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if game_paused and not show_credits:
+                    if btn_new_game.is_clicked(mouse_pos):
+                        reset_game()
+                        game_paused = False
+                    elif btn_credits.is_clicked(mouse_pos):
+                        show_credits = True
+                elif show_credits:
+                    if btn_back.is_clicked(mouse_pos):
+                        show_credits = False
         
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if game_paused and not show_credits:
-                if btn_new_game.is_clicked(mouse_pos):
-                    reset_game()
-                    game_paused = False
-                elif btn_credits.is_clicked(mouse_pos):
-                    show_credits = True
-            elif show_credits:
-                if btn_back.is_clicked(mouse_pos):
-                    show_credits = False
-    
-    # Update button hover states
-    if game_paused and not show_credits:
-        btn_new_game.check_hover(mouse_pos)
-        btn_credits.check_hover(mouse_pos)
-    elif show_credits:
-        btn_back.check_hover(mouse_pos)
-    
-    if not game_paused:
-        # Paddle movement
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and paddle_x > 0:
-            paddle_x -= paddle_speed
-        if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
-            paddle_x += paddle_speed
-
-        # Ball movement
-        ball_x += ball_dx
-        ball_y += ball_dy
+        # Update button hover states
+        if game_paused and not show_credits:
+            btn_new_game.check_hover(mouse_pos)
+            btn_credits.check_hover(mouse_pos)
+        elif show_credits:
+            btn_back.check_hover(mouse_pos)
         
-        particles.extend(create_comet_trail(ball_x + ball_size // 2, ball_y + ball_size // 2, ball_dx, ball_dy))
-
-        # Ball collision with walls
-        if ball_x <= 0 or ball_x >= WIDTH - ball_size:
-            ball_dx = -ball_dx
-        if ball_y <= 0:
-            ball_dy = -ball_dy
-
-        # Ball collision with paddle
-        if (ball_y + ball_size >= paddle_y and 
-            ball_y + ball_size <= paddle_y + paddle_height and
-            ball_x + ball_size >= paddle_x and 
-            ball_x <= paddle_x + paddle_width):
-            ball_dy = -ball_dy
-            ball_y = paddle_y - ball_size  # Prevent sticking
-
-        # 3. Ball collision with blocks
-        ball_rect = pygame.Rect(ball_x, ball_y, ball_size, ball_size)
-        for block in blocks[:]:
-            if ball_rect.colliderect(block["rect"]):
-                cx = block["rect"].centerx
-                cy = block["rect"].centery
-                explosion_particles.extend(create_fiery_explosion(cx, cy))
-                
-                blocks.remove(block)
+        if not game_paused:
+            # Paddle movement
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_LEFT] and paddle_x > 0:
+                paddle_x -= paddle_speed
+            if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
+                paddle_x += paddle_speed
+
+            # Ball movement
+            ball_x += ball_dx
+            ball_y += ball_dy
+            
+            particles.extend(create_comet_trail(ball_x + ball_size // 2, ball_y + ball_size // 2, ball_dx, ball_dy))
+
+            # Ball collision with walls
+            if ball_x <= 0 or ball_x >= WIDTH - ball_size:
+                ball_dx = -ball_dx
+            if ball_y <= 0:
                 ball_dy = -ball_dy
-                break
 
-        # Ball falls off bottom - reset
-        if ball_y > HEIGHT:
-            ball_x = WIDTH // 2
-            ball_y = HEIGHT // 2
-            ball_dy = -4
+            # Ball collision with paddle
+            if (ball_y + ball_size >= paddle_y and 
+                ball_y + ball_size <= paddle_y + paddle_height and
+                ball_x + ball_size >= paddle_x and 
+                ball_x <= paddle_x + paddle_width):
+                ball_dy = -ball_dy
+                ball_y = paddle_y - ball_size  # Prevent sticking
+
+            # 3. Ball collision with blocks
+            ball_rect = pygame.Rect(ball_x, ball_y, ball_size, ball_size)
+            for block in blocks[:]:
+                if ball_rect.colliderect(block["rect"]):
+                    cx = block["rect"].centerx
+                    cy = block["rect"].centery
+                    explosion_particles.extend(create_fiery_explosion(cx, cy))
+                    
+                    blocks.remove(block)
+                    ball_dy = -ball_dy
+                    break
+
+            # Ball falls off bottom - reset
+            if ball_y > HEIGHT:
+                ball_x = WIDTH // 2
+                ball_y = HEIGHT // 2
+                ball_dy = -4
+            
+            particles = [p for p in particles if p.update()]
+            explosion_particles = [p for p in explosion_particles if p.update()]
+
+        # Draw everything
+        screen.fill(BLACK)
         
-        particles = [p for p in particles if p.update()]
-        explosion_particles = [p for p in explosion_particles if p.update()]
-
-    # Draw everything
-    screen.fill(BLACK)
-    
-    for p in particles:
-        p.draw(screen)
-    for p in explosion_particles:
-        p.draw(screen)
-    
-    # 4. Draw blocks
-    for block in blocks:
-        pygame.draw.rect(screen, block["color"], block["rect"])
-        # Add subtle highlight
-        highlight_rect = pygame.Rect(block["rect"].x, block["rect"].y, block["rect"].width, 3)
-        highlight_color = tuple(min(255, c + 60) for c in block["color"])
-        pygame.draw.rect(screen, highlight_color, highlight_rect)
-    
-    pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
-    
-    # 5) Ball with fiery glow effect
-    glow_size = ball_size + 8
-    glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-    # Outer orange glow
-    pygame.draw.circle(glow_surface, (255, 100, 0, 40), (glow_size, glow_size), glow_size)
-    # Inner yellow glow
-    pygame.draw.circle(glow_surface, (255, 200, 50, 60), (glow_size, glow_size), glow_size - 3)
-    # White core glow
-    pygame.draw.circle(glow_surface, (255, 255, 200, 80), (glow_size, glow_size), glow_size - 6)
-    screen.blit(glow_surface, (ball_x - glow_size + ball_size // 2, ball_y - glow_size + ball_size // 2))
-    # Main ball - white hot center
-    pygame.draw.ellipse(screen, (255, 255, 240), (ball_x, ball_y, ball_size, ball_size))
-    
-    draw_hud()
-    
-    if game_paused and not show_credits:
-        draw_menu()
-    elif show_credits:
-        draw_credits()
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+        for p in particles:
+            p.draw(screen)
+        for p in explosion_particles:
+            p.draw(screen)
+        
+        # 4. Draw blocks
+        for block in blocks:
+            pygame.draw.rect(screen, block["color"], block["rect"])
+            # Add subtle highlight
+            highlight_rect = pygame.Rect(block["rect"].x, block["rect"].y, block["rect"].width, 3)
+            highlight_color = tuple(min(255, c + 60) for c in block["color"])
+            pygame.draw.rect(screen, highlight_color, highlight_rect)
+        
+        pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
+        
+        # 5) Ball with fiery glow effect
+        glow_size = ball_size + 8
+        glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+        # Outer orange glow
+        pygame.draw.circle(glow_surface, (255, 100, 0, 40), (glow_size, glow_size), glow_size)
+        # Inner yellow glow
+        pygame.draw.circle(glow_surface, (255, 200, 50, 60), (glow_size, glow_size), glow_size - 3)
+        # White core glow
+        pygame.draw.circle(glow_surface, (255, 255, 200, 80), (glow_size, glow_size), glow_size - 6)
+        screen.blit(glow_surface, (ball_x - glow_size + ball_size // 2, ball_y - glow_size + ball_size // 2))
+        # Main ball - white hot center
+        pygame.draw.ellipse(screen, (255, 255, 240), (ball_x, ball_y, ball_size, ball_size))
+        
+        draw_hud()
+        
+        if game_paused and not show_credits:
+            draw_menu()
+        elif show_credits:
+            draw_credits()
+
+        pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            startup_marks.append(("first frame", time.perf_counter()))
+            if args.startup_profile:
+                report_startup(startup_marks)
+        clock.tick(60)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
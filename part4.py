@@ -13,6 +13,10 @@
 # - High Scores menu option showing top 10 scores
 # - Ball count display in HUD
 
+import time
+STARTUP_T0 = time.perf_counter()  # Taken before pygame is imported
+
+import argparse
 import pygame
 import random
 import math
@@ -20,13 +24,9 @@ import os
 import csv
 from datetime import datetime
 
-# Initialize pygame
-pygame.init()
-
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Breakout")
+screen = None  # Window is opened in main()
 
 # High score file
 HIGHSCORE_FILE = "highscores.csv"
@@ -43,10 +43,21 @@ CYAN = (0, 255, 255)
 GRAY = (100, 100, 100)
 GOLD = (255, 215, 0)
 
-# Fonts
-font_large = pygame.font.Font(None, 72)
-font_medium = pygame.font.Font(None, 48)
-font_small = pygame.font.Font(None, 36)
+# Fonts (loaded on first use, not at import)
+class LazyFont:
+    """pygame Font that is only loaded the first time it renders"""
+    def __init__(self, size):
+        self.size = size
+        self.font = None
+    
+    def render(self, *args):
+        if self.font is None:
+            self.font = pygame.font.Font(None, self.size)
+        return self.font.render(*args)
+
+font_large = LazyFont(72)
+font_medium = LazyFont(48)
+font_small = LazyFont(36)
 
 # 1. Block settings
 block_width, block_height = 75, 20
@@ -538,220 +549,261 @@ def draw_hud():
     esc_text = font_small.render("ESC - Menu", True, GRAY)
     screen.blit(esc_text, (WIDTH // 2 - 50, HEIGHT - 30))
 
-# Game loop
-clock = pygame.time.Clock()
-running = True
-pause_time = 0
+def parse_args():
+    parser = argparse.ArgumentParser(description="Breakout - part 4")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print time-to-first-frame measurements")
+    return parser.parse_args()
+
+def report_startup(marks):
+    """Print how long each startup phase took, starting from STARTUP_T0"""
+    print("Startup profile:")
+    previous = STARTUP_T0
+    for name, timestamp in marks:
+        print(f"  {name:<14}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"  {'total':<14}{(previous - STARTUP_T0) * 1000:8.1f} ms")
+
+def main():
+    global screen, paddle_x, paddle_velocity, particles, explosion_particles, start_time, pause_time
+    global game_paused, game_over, game_won, show_credits, show_highscores
+    global entering_name, player_name, final_time
+    args = parse_args()
+    startup_marks = [("imports", time.perf_counter())]
+    
+    # Only start the subsystems we use - pygame.init() would also start audio
+    pygame.display.init()
+    pygame.font.init()
+    startup_marks.append(("pygame init", time.perf_counter()))
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Breakout")
+    startup_marks.append(("window", time.perf_counter()))
+    
+    # Game loop
+    clock = pygame.time.Clock()
+    clock.tick()  # Also starts the SDL timer behind pygame.time.get_ticks()
+    start_time = pygame.time.get_ticks()
+    running = True
+    first_frame = True
+    pause_time = 0
 
-while running:
-    mouse_pos = pygame.mouse.get_pos()
-    
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    while running:
+        mouse_pos = pygame.mouse.get_pos()
         
-        if event.type == pygame.KEYDOWN:
-            # Name entry mode
-            if entering_name:
-                if event.key == pygame.K_RETURN and player_name:
-                    # Save score and go to menu
-                    save_highscore(player_name, final_time)
-                    entering_name = False
-                    game_paused = True
-                    player_name = ""
-                elif event.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif event.unicode.isalnum() or event.unicode == ' ':
-                    if len(player_name) < 12:
-                        player_name += event.unicode
-            else:
-                if event.key == pygame.K_ESCAPE:
-                    if show_credits or show_highscores:
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            
+            if event.type == pygame.KEYDOWN:
+                # Name entry mode
+                if entering_name:
+                    if event.key == pygame.K_RETURN and player_name:
+                        # Save score and go to menu
+                        save_highscore(player_name, final_time)
+                        entering_name = False
+                        game_paused = True
+                        player_name = ""
+                    elif event.key == pygame.K_BACKSPACE:
+                        player_name = player_name[:-1]
+                    elif event.unicode.isalnum() or event.unicode == ' ':
+                        if len(player_name) < 12:
+                            player_name += event.unicode
+                else:
+                    if event.key == pygame.K_ESCAPE:
+                        if show_credits or show_highscores:
+                            show_credits = False
+                            show_highscores = False
+                        elif game_over or game_won:
+                            # Can't unpause if game is over
+                            pass
+                        else:
+                            game_paused = not game_paused
+                            if game_paused:
+                                pause_time = pygame.time.get_ticks()
+                            else:
+                                # Adjust start_time to account for pause duration
+                                start_time += pygame.time.get_ticks() - pause_time
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if game_paused and not show_credits and not show_highscores and not entering_name:
+                    if btn_new_game.is_clicked(mouse_pos):
+                        reset_game()
+                        game_paused = False
+                    elif btn_highscores.is_clicked(mouse_pos):
+                        show_highscores = True
+                    elif btn_credits.is_clicked(mouse_pos):
+                        show_credits = True
+                elif show_credits or show_highscores:
+                    if btn_back.is_clicked(mouse_pos):
                         show_credits = False
                         show_highscores = False
-                    elif game_over or game_won:
-                        # Can't unpause if game is over
-                        pass
-                    else:
-                        game_paused = not game_paused
-                        if game_paused:
-                            pause_time = pygame.time.get_ticks()
-                        else:
-                            # Adjust start_time to account for pause duration
-                            start_time += pygame.time.get_ticks() - pause_time
         
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if game_paused and not show_credits and not show_highscores and not entering_name:
-                if btn_new_game.is_clicked(mouse_pos):
-                    reset_game()
-                    game_paused = False
-                elif btn_highscores.is_clicked(mouse_pos):
-                    show_highscores = True
-                elif btn_credits.is_clicked(mouse_pos):
-                    show_credits = True
-            elif show_credits or show_highscores:
-                if btn_back.is_clicked(mouse_pos):
-                    show_credits = False
-                    show_highscores = False
-    
-    # Update button hover states
-    if game_paused and not show_credits and not show_highscores and not entering_name:
-        btn_new_game.check_hover(mouse_pos)
-        btn_highscores.check_hover(mouse_pos)
-        btn_credits.check_hover(mouse_pos)
-    elif show_credits or show_highscores:
-        btn_back.check_hover(mouse_pos)
-    
-    if not game_paused and not game_over and not game_won and not entering_name:
-        # Paddle movement
-        keys = pygame.key.get_pressed()
-        paddle_velocity = 0  # Reset each frame
-        if keys[pygame.K_LEFT] and paddle_x > 0:
-            paddle_x -= paddle_speed
-            paddle_velocity = -paddle_speed
-        if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
-            paddle_x += paddle_speed
-            paddle_velocity = paddle_speed
-
-        # Update all balls
-        balls_to_remove = []
-        new_balls = []
+        # Update button hover states
+        if game_paused and not show_credits and not show_highscores and not entering_name:
+            btn_new_game.check_hover(mouse_pos)
+            btn_highscores.check_hover(mouse_pos)
+            btn_credits.check_hover(mouse_pos)
+        elif show_credits or show_highscores:
+            btn_back.check_hover(mouse_pos)
         
-        for ball in balls:
-            # Ball movement
-            ball.update()
+        if not game_paused and not game_over and not game_won and not entering_name:
+            # Paddle movement
+            keys = pygame.key.get_pressed()
+            paddle_velocity = 0  # Reset each frame
+            if keys[pygame.K_LEFT] and paddle_x > 0:
+                paddle_x -= paddle_speed
+                paddle_velocity = -paddle_speed
+            if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
+                paddle_x += paddle_speed
+                paddle_velocity = paddle_speed
+
+            # Update all balls
+            balls_to_remove = []
+            new_balls = []
             
-            # Create comet trail particles
-            particles.extend(create_comet_trail(ball.x + ball_size // 2, ball.y + ball_size // 2, ball.dx, ball.dy))
-
-            # Ball collision with walls
-            if ball.x <= 0 or ball.x >= WIDTH - ball_size:
-                ball.dx = -ball.dx
-            if ball.y <= 0:
-                ball.dy = -ball.dy
-
-            # Ball collision with paddle
-            if (ball.y + ball_size >= paddle_y and 
-                ball.y + ball_size <= paddle_y + paddle_height and
-                ball.x + ball_size >= paddle_x and 
-                ball.x <= paddle_x + paddle_width):
-                
-                # 2) Angle based on where ball hits paddle
-                ball_center = ball.x + ball_size // 2
-                hit_pos = (ball_center - paddle_x) / paddle_width
-                
-                # Convert to angle: -1 (far left) to 1 (far right)
-                # Center (0.5) = 0, meaning straight up
-                angle_factor = (hit_pos - 0.5) * 2
-                
-                # Set new dx based on hit position, max speed of 6
-                ball.dx = angle_factor * 6
-                
-                # 3) Paddle movement adds spin to ball
-                spin = -paddle_velocity * 0.3
-                ball.dx += spin
+            for ball in balls:
+                # Ball movement
+                ball.update()
                 
-                # Clamp horizontal speed to prevent crazy angles
-                ball.dx = max(-8, min(8, ball.dx))
-                
-                # Ensure ball goes up and maintain consistent speed
-                speed = math.sqrt(ball.dx ** 2 + ball.dy ** 2)
-                ball.dy = -abs(math.sqrt(max(16, speed ** 2 - ball.dx ** 2)))  # Minimum vertical speed
-                
-                ball.y = paddle_y - ball_size  # Prevent sticking
-
-            # Ball collision with blocks
-            ball_rect = ball.get_rect()
-            for block in blocks[:]:
-                if ball_rect.colliderect(block["rect"]):
-                    # Get block center
-                    cx = block["rect"].centerx
-                    cy = block["rect"].centery
+                # Create comet trail particles
+                particles.extend(create_comet_trail(ball.x + ball_size // 2, ball.y + ball_size // 2, ball.dx, ball.dy))
+
+                # Ball collision with walls
+                if ball.x <= 0 or ball.x >= WIDTH - ball_size:
+                    ball.dx = -ball.dx
+                if ball.y <= 0:
+                    ball.dy = -ball.dy
+
+                # Ball collision with paddle
+                if (ball.y + ball_size >= paddle_y and 
+                    ball.y + ball_size <= paddle_y + paddle_height and
+                    ball.x + ball_size >= paddle_x and 
+                    ball.x <= paddle_x + paddle_width):
                     
-                    # Create fiery explosion
-                    explosion_particles.extend(create_fiery_explosion(cx, cy))
+                    # 2) Angle based on where ball hits paddle
+                    ball_center = ball.x + ball_size // 2
+                    hit_pos = (ball_center - paddle_x) / paddle_width
                     
-                    # 4) 1/5 chance to spawn bonus ball
-                    if random.randint(1, 5) == 1:
-                        new_balls.append(Ball(cx, cy, 0, 4))
+                    # Convert to angle: -1 (far left) to 1 (far right)
+                    # Center (0.5) = 0, meaning straight up
+                    angle_factor = (hit_pos - 0.5) * 2
                     
-                    blocks.remove(block)
-                    ball.dy = -ball.dy
-                    break
+                    # Set new dx based on hit position, max speed of 6
+                    ball.dx = angle_factor * 6
+                    
+                    # 3) Paddle movement adds spin to ball
+                    spin = -paddle_velocity * 0.3
+                    ball.dx += spin
+                    
+                    # Clamp horizontal speed to prevent crazy angles
+                    ball.dx = max(-8, min(8, ball.dx))
+                    
+                    # Ensure ball goes up and maintain consistent speed
+                    speed = math.sqrt(ball.dx ** 2 + ball.dy ** 2)
+                    ball.dy = -abs(math.sqrt(max(16, speed ** 2 - ball.dx ** 2)))  # Minimum vertical speed
+                    
+                    ball.y = paddle_y - ball_size  # Prevent sticking
+
+                # Ball collision with blocks
+                ball_rect = ball.get_rect()
+                for block in blocks[:]:
+                    if ball_rect.colliderect(block["rect"]):
+                        # Get block center
+                        cx = block["rect"].centerx
+                        cy = block["rect"].centery
+                        
+                        # Create fiery explosion
+                        explosion_particles.extend(create_fiery_explosion(cx, cy))
+                        
+                        # 4) 1/5 chance to spawn bonus ball
+                        if random.randint(1, 5) == 1:
+                            new_balls.append(Ball(cx, cy, 0, 4))
+                        
+                        blocks.remove(block)
+                        ball.dy = -ball.dy
+                        break
+
+                # Ball falls off bottom - mark for removal
+                if ball.y > HEIGHT:
+                    balls_to_remove.append(ball)
+            
+            # Remove lost balls and add new ones
+            for ball in balls_to_remove:
+                balls.remove(ball)
+            balls.extend(new_balls)
+            
+            # GAME OVER only if ALL balls are lost
+            if len(balls) == 0:
+                game_over = True
+                game_paused = True
+                pause_time = pygame.time.get_ticks()
+            
+            # Check for win condition
+            if len(blocks) == 0:
+                game_won = True
+                entering_name = True
+                final_time = (pygame.time.get_ticks() - start_time) // 1000
+            
+            # Update particles
+            particles = [p for p in particles if p.update()]
+            explosion_particles = [p for p in explosion_particles if p.update()]
 
-            # Ball falls off bottom - mark for removal
-            if ball.y > HEIGHT:
-                balls_to_remove.append(ball)
+        # Draw everything
+        screen.fill(BLACK)
+        
+        # Draw particles (behind other objects)
+        for p in particles:
+            p.draw(screen)
+        for p in explosion_particles:
+            p.draw(screen)
         
-        # Remove lost balls and add new ones
-        for ball in balls_to_remove:
-            balls.remove(ball)
-        balls.extend(new_balls)
+        # 4. Draw blocks
+        for block in blocks:
+            pygame.draw.rect(screen, block["color"], block["rect"])
+            # Add subtle highlight
+            highlight_rect = pygame.Rect(block["rect"].x, block["rect"].y, block["rect"].width, 3)
+            highlight_color = tuple(min(255, c + 60) for c in block["color"])
+            pygame.draw.rect(screen, highlight_color, highlight_rect)
         
-        # GAME OVER only if ALL balls are lost
-        if len(balls) == 0:
-            game_over = True
-            game_paused = True
-            pause_time = pygame.time.get_ticks()
+        pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
+        
+        # Draw all balls with fiery glow effect
+        for ball in balls:
+            glow_size = ball_size + 8
+            glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+            # Outer orange glow
+            pygame.draw.circle(glow_surface, (255, 100, 0, 40), (glow_size, glow_size), glow_size)
+            # Inner yellow glow
+            pygame.draw.circle(glow_surface, (255, 200, 50, 60), (glow_size, glow_size), glow_size - 3)
+            # White core glow
+            pygame.draw.circle(glow_surface, (255, 255, 200, 80), (glow_size, glow_size), glow_size - 6)
+            screen.blit(glow_surface, (ball.x - glow_size + ball_size // 2, ball.y - glow_size + ball_size // 2))
+            # Main ball - white hot center
+            pygame.draw.ellipse(screen, (255, 255, 240), (ball.x, ball.y, ball_size, ball_size))
         
-        # Check for win condition
-        if len(blocks) == 0:
-            game_won = True
-            entering_name = True
-            final_time = (pygame.time.get_ticks() - start_time) // 1000
+        # Draw HUD
+        draw_hud()
         
-        # Update particles
-        particles = [p for p in particles if p.update()]
-        explosion_particles = [p for p in explosion_particles if p.update()]
-
-    # Draw everything
-    screen.fill(BLACK)
-    
-    # Draw particles (behind other objects)
-    for p in particles:
-        p.draw(screen)
-    for p in explosion_particles:
-        p.draw(screen)
-    
-    # 4. Draw blocks
-    for block in blocks:
-        pygame.draw.rect(screen, block["color"], block["rect"])
-        # Add subtle highlight
-        highlight_rect = pygame.Rect(block["rect"].x, block["rect"].y, block["rect"].width, 3)
-        highlight_color = tuple(min(255, c + 60) for c in block["color"])
-        pygame.draw.rect(screen, highlight_color, highlight_rect)
-    
-    pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
-    
-    # Draw all balls with fiery glow effect
-    for ball in balls:
-        glow_size = ball_size + 8
-        glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-        # Outer orange glow
-        pygame.draw.circle(glow_surface, (255, 100, 0, 40), (glow_size, glow_size), glow_size)
-        # Inner yellow glow
-        pygame.draw.circle(glow_surface, (255, 200, 50, 60), (glow_size, glow_size), glow_size - 3)
-        # White core glow
-        pygame.draw.circle(glow_surface, (255, 255, 200, 80), (glow_size, glow_size), glow_size - 6)
-        screen.blit(glow_surface, (ball.x - glow_size + ball_size // 2, ball.y - glow_size + ball_size // 2))
-        # Main ball - white hot center
-        pygame.draw.ellipse(screen, (255, 255, 240), (ball.x, ball.y, ball_size, ball_size))
-    
-    # Draw HUD
-    draw_hud()
-    
-    # Draw menu/overlays based on state
-    if entering_name:
-        draw_name_entry()
-    elif game_paused and not show_credits and not show_highscores:
-        draw_menu()
-    elif show_credits:
-        draw_credits()
-    elif show_highscores:
-        draw_highscores()
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+        # Draw menu/overlays based on state
+        if entering_name:
+            draw_name_entry()
+        elif game_paused and not show_credits and not show_highscores:
+            draw_menu()
+        elif show_credits:
+            draw_credits()
+        elif show_highscores:
+            draw_highscores()
+
+        pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            startup_marks.append(("first frame", time.perf_counter()))
+            if args.startup_profile:
+                report_startup(startup_marks)
+        clock.tick(60)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -9,32 +9,110 @@
 # - Multi-layered glow rendering for explosive vs normal balls
 #
 # All features from previous parts:
-# - Particle system (comet trail, fiery explosions)
-# - Multiple particle types (CometParticle, FireParticle, SparkParticle, EmberParticle)
+# - Comet trails drawn from a per-ball ring buffer of recent positions
+# - Rendering budget: shorter trails, and no glows, as the ball count grows
+# - Particle system for fiery explosions
+# - Multiple particle types (FireParticle, SparkParticle, EmberParticle)
 # - HUD (blocks remaining, ball count, elapsed time)
 # - Game menu (ESC toggle) with New Game, High Scores, Credits
 # - High score system with CSV storage and name entry
 # - Multi-ball system with bonus ball spawn (1/5 chance)
 # - Angle-based paddle bounce and paddle spin effect
 # - Game over when all balls lost, win when all blocks cleared
+# - Blocks kept in a BlockStore (blockstore.py) with O(1) removal
+# - High scores saved on a background writer thread (highscore_writer.py)
+# - Optional shared leaderboard sync (--leaderboard-url, leaderboard_sync.py)
+# - Optional live spectator stream (--spectate, spectator.py)
+# - Explosive blocks that chain-react, blasts spread as shockwaves over
+#   several frames with a per-frame kill/particle budget (shockwaves.py)
+# - Optional NumPy particle simulation on a worker thread (--threaded-particles,
+#   particle_sim.py)
+# - Optional fireworks attract mode behind the menu, simulated by worker
+#   processes over shared memory (--fireworks N, fireworks.py)
+# - Render scale: the scene is drawn at an internal resolution and scaled to
+#   the window (--render-scale, --window-scale, F9 cycles, viewport.py)
+# - Optional low-resolution additive particle layer (--particle-scale,
+#   particle_layer.py)
+# - Frame time histogram with spikes tagged by game event, summary at exit
+#   and a live readout on F3 (frame_monitor.py)
+# - Opt-in memory sampling to a JSON lines log on F4 (memory_monitor.py)
+# - Stress test launch options (--balls, --block-rows, --duration, ...): the
+#   game restarts itself unattended and exits with a performance summary
+# - Autopilot paddle that predicts where balls land (--autopilot, F6 toggles,
+#   paddle_control.py)
+# - Presentation options: --vsync, --fps cap (0 for none) and sleep, hybrid
+#   or busy-wait --pacing, shown in the F3 readout and exit summary
+# - Input is polled and timestamped several times per frame and replayed
+#   over the simulation steps; the paddle is drawn at the latest input (late
+#   latch). Optional mouse control (--mouse) and input-to-display latency
+#   measurement (--input-latency)
+# - Time scale from 0.25x to 16x ([ and ] keys, --time-scale): more or fewer
+#   fixed simulation steps per frame, particles are not multiplied
+# - Every saved score is indexed in memory (leaderboard.py); the High Scores
+#   screen pages through all of them (left/right) and switches between all
+#   time, player bests and the last 30 days (TAB)
+# - Old scores are moved out of highscores.csv into monthly gzip archives
+#   in the background, keeping the best and recent ones (--keep-top,
+#   --keep-days, --archive-dir, highscore_archive.py)
+# - Optional elastic ball-to-ball collisions with a sweep and prune
+#   broadphase, pair tests shown on F3 (--ball-collisions, ball_collisions.py)
+# - Block looks baked once into a texture atlas (block_atlas.py), so the
+#   block layer is rebuilt with one blits() call
+# - Optional moving blocks: sliding rows, orbiting blocks or a descending
+#   wave (--block-motion, block_motion.py), found by balls and blasts through
+#   a grid that only re-buckets blocks crossing a cell (block_grid.py)
+# - Game snapshots: the whole game packed into a small binary blob and back
+#   in microseconds. F5 saves to a file, F8 loads it, --resume starts from it
+#   (snapshot.py). Gameplay randomness has its own generator, so a restored
+#   game plays out exactly like the original
+# - Rewind: hold R to scrub back through the last 30 seconds, rebuilt from
+#   keyframe snapshots and per-step records by re-simulating, in a buffer
+#   with a memory cap (--rewind-seconds, --rewind-memory, rewind.py)
 
+import time
+STARTUP_T0 = time.perf_counter()  # Taken before pygame is imported
+
+import argparse
 import pygame
 import random
 import math
-import os
-import csv
-from datetime import datetime
+from datetime import datetime, timedelta
 
-# Initialize pygame
-pygame.init()
+from ball_collisions import BallCollider
+from block_atlas import BlockAtlas
+from block_motion import BlockMotion, PATTERNS as BLOCK_MOTIONS
+from blockstore import BlockStore, KIND_EXPLOSIVE, KIND_NORMAL
+from frame_monitor import FrameMonitor
+from highscore_archive import RetentionPolicy
+from highscore_writer import HighscoreWriter
+from leaderboard import Leaderboard
+from leaderboard_sync import LeaderboardSync
+from memory_monitor import MemoryMonitor
+from paddle_control import PACING_MODES, Autopilot, InputTimeline, KeyboardControl, MouseControl
+from rewind import Replay, RewindBuffer
+import fireworks
+import particle_sim
+from particle_layer import ParticleLayer
+from shockwaves import Shockwave, ShockwaveManager
+import snapshot
+from spectator import MAX_BLOCKS as SPECTATOR_MAX_BLOCKS, SpectatorServer
+from viewport import Viewport
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Breakout")
+screen = None  # Render surface, set up in main()
+view = None  # Viewport: playfield -> render surface -> window
+RENDER_SCALES = (1.0, 0.75, 0.5)  # Cycled with F9
 
 # High score file
 HIGHSCORE_FILE = "highscores.csv"
+SNAPSHOT_FILE = "snapshot.bin"  # F5 saves the game here, F8 loads it
+HIGHSCORE_ARCHIVE_DIR = "highscore_archive"
+highscore_writer = None  # Started in main()
+leaderboard = Leaderboard()  # Every known score, loaded by the writer thread and updated as soon as a score is saved
+HIGHSCORE_PAGE_SIZE = 10
+HIGHSCORE_VIEWS = ("All time", "Player bests", "Last 30 days")  # Cycled with TAB
+leaderboard_sync = None  # LeaderboardSync when --leaderboard-url is given
 
 # Colors
 WHITE = (255, 255, 255)
@@ -48,10 +126,35 @@ CYAN = (0, 255, 255)
 GRAY = (100, 100, 100)
 GOLD = (255, 215, 0)
 
-# Fonts
-font_large = pygame.font.Font(None, 72)
-font_medium = pygame.font.Font(None, 48)
-font_small = pygame.font.Font(None, 36)
+# Fonts (loaded on first use, not at import)
+class LazyFont:
+    """pygame Font that is only loaded the first time it renders"""
+    def __init__(self, size):
+        self.size = size
+        self.scale = 1.0
+        self.font = None
+    
+    def set_scale(self, scale):
+        """Reload at a new render scale (on the next render)"""
+        if scale != self.scale:
+            self.scale = scale
+            self.font = None
+    
+    def render(self, *args):
+        if self.font is None:
+            self.font = pygame.font.Font(None, max(8, int(self.size * self.scale)))
+        return self.font.render(*args)
+
+font_large = LazyFont(72)
+font_medium = LazyFont(48)
+font_small = LazyFont(36)
+font_tiny = LazyFont(24)
+
+# Frame pacing
+FPS = 60
+frame_monitor = FrameMonitor(FPS)
+show_frame_stats = False  # Live readout, toggled with F3
+memory_monitor = None  # MemoryMonitor, started and stopped with F4
 
 # 1. Block settings
 block_width, block_height = 75, 20
@@ -60,10 +163,55 @@ block_cols = 10
 block_padding = 5
 block_top_offset = 50
 total_blocks = block_rows * block_cols
+EXPLOSIVE_BLOCK_CHANCE = 0.1  # Chance a block is explosive
+BLOCK_COLORS = [RED, ORANGE, GREEN, BLUE]  # By row
+block_motion = None  # BlockMotion when blocks move (--block-motion)
+
+# Everything random that changes how a game plays out (block kinds, extra
+# and bonus balls) draws from game_rng. Particles use the random module, so
+# how many of them a frame spawns can't change the game, and a snapshot
+# carries on exactly where it was taken.
+game_rng = random.Random()
+
+def set_board_size(rows, cols):
+    """Change the number of block rows and columns, shrinking blocks to fit"""
+    global block_rows, block_cols, block_width, block_height, total_blocks, blocks_bottom
+    block_rows = rows
+    block_cols = cols
+    # Blocks never grow, and stay in the top half of the screen
+    block_width = max(1, min(75, WIDTH // cols - block_padding))
+    block_height = max(1, min(20, (HEIGHT // 2 - block_top_offset) // rows - block_padding))
+    total_blocks = rows * cols
+    blocks_bottom = block_top_offset + rows * (block_height + block_padding)
+
+# Time scale: simulation steps per rendered frame
+TIME_SCALES = (0.25, 0.5, 1, 2, 4, 8, 16)
+time_scale = 1
+time_scaled_game = False  # Fast-forwarded or slowed games don't make the high scores
+restored_game = False  # Nor do games loaded from a snapshot
+explosion_stride = 1  # Only every Nth explosion this frame gets particles
+explosion_count = 0
+
+# Stress test settings (changed from the command line)
+start_balls = 1  # Balls at the start of a game
+explosive_ratio = 0.5  # Chance that an extra or bonus ball is explosive
+particle_multiplier = 1.0  # Scales the particles per explosion
+
+# Rewind (hold R)
+REWIND_KEY = pygame.K_r
+REWIND_SPEED = 2  # Steps scrubbed back per frame, so rewinding runs at 2x
+rewind_buffer = None  # RewindBuffer, created in main() unless --rewind-seconds is 0
+rewind_cursor = None  # Step being shown while rewinding, None while playing
+rewind_frames = {}  # Snapshots of the segment being scrubbed by step (those the memory cap allows)
+rewind_segment = None  # ...and which segment that is
+replaying = False  # True while rewind re-simulates steps
 
 # Particle system
-particles = []  # Ball trail particles
 explosion_particles = []  # Block explosion particles
+particle_worker = None  # ParticleWorker when --threaded-particles is given
+fireworks_show = None  # FireworksShow when --fireworks is given
+particle_scale = 1.0  # Particle layer resolution relative to the render surface
+particle_layer = None  # ParticleLayer, baked with the other render assets
 
 # Fire colors for comet and explosion
 FIRE_COLORS = [
@@ -91,6 +239,10 @@ class Particle:
         self.gravity = gravity
         self.shrink = shrink
     
+    def pos(self, scale):
+        """Position in pixels of a surface drawn at scale"""
+        return int(self.x * scale), int(self.y * scale)
+    
     def update(self):
         self.lifetime -= 1
         self.x += self.dx
@@ -99,38 +251,14 @@ class Particle:
         self.dx *= 0.98  # Drag
         return self.lifetime > 0
     
-    def draw(self, surface):
+    def draw(self, surface, scale):
         alpha = self.lifetime / self.max_lifetime
         if self.shrink:
             current_size = max(1, int(self.size * alpha))
         else:
             current_size = self.size
         color = tuple(max(0, min(255, int(c * alpha))) for c in self.color)
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), current_size)
-
-class CometParticle(Particle):
-    """Special particle for comet tail with color transition"""
-    def __init__(self, x, y, dx, dy, size=4, lifetime=35):
-        super().__init__(x, y, FIRE_COLORS[0], size, lifetime, dx * 0.1, dy * 0.1, gravity=0)
-        self.base_size = size
-    
-    def draw(self, surface):
-        alpha = self.lifetime / self.max_lifetime
-        # Color transitions from white -> yellow -> orange -> red based on lifetime
-        color_index = int((1 - alpha) * (len(FIRE_COLORS) - 1))
-        color_index = min(color_index, len(FIRE_COLORS) - 1)
-        base_color = FIRE_COLORS[color_index]
-        
-        # Apply alpha to color
-        color = tuple(max(0, min(255, int(c * (0.3 + alpha * 0.7)))) for c in base_color)
-        current_size = max(1, int(self.base_size * alpha))
-        
-        # Draw glow
-        if current_size > 2:
-            glow_color = tuple(max(0, min(255, int(c * 0.3))) for c in base_color)
-            pygame.draw.circle(surface, glow_color, (int(self.x), int(self.y)), current_size + 2)
-        
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), current_size)
+        pygame.draw.circle(surface, color, self.pos(scale), max(1, int(current_size * scale)))
 
 class FireParticle(Particle):
     """Fiery explosion particle with flickering effect"""
@@ -138,7 +266,7 @@ class FireParticle(Particle):
         super().__init__(x, y, FIRE_COLORS[0], size, lifetime, dx, dy, gravity=0.15)
         self.flicker = random.uniform(0.8, 1.2)
     
-    def draw(self, surface):
+    def draw(self, surface, scale):
         alpha = self.lifetime / self.max_lifetime
         # Color transitions through fire colors
         color_index = int((1 - alpha) * (len(FIRE_COLORS) - 1))
@@ -154,9 +282,9 @@ class FireParticle(Particle):
         if current_size > 2 and alpha > 0.3:
             glow_size = current_size + 3
             glow_color = tuple(max(0, min(255, int(c * 0.4 * alpha))) for c in base_color)
-            pygame.draw.circle(surface, glow_color, (int(self.x), int(self.y)), glow_size)
+            pygame.draw.circle(surface, glow_color, self.pos(scale), max(1, int(glow_size * scale)))
         
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), current_size)
+        pygame.draw.circle(surface, color, self.pos(scale), max(1, int(current_size * scale)))
 
 class SparkParticle(Particle):
     """Small bright spark that flies fast"""
@@ -164,13 +292,13 @@ class SparkParticle(Particle):
         color = random.choice([(255, 255, 255), (255, 255, 200), (255, 200, 100)])
         super().__init__(x, y, color, size=2, lifetime=random.randint(15, 30), dx=dx, dy=dy, gravity=0.2)
     
-    def draw(self, surface):
+    def draw(self, surface, scale):
         alpha = self.lifetime / self.max_lifetime
         color = tuple(max(0, min(255, int(c * alpha))) for c in self.color)
         # Draw as a small line/streak for sparks
         end_x = self.x - self.dx * 2
         end_y = self.y - self.dy * 2
-        pygame.draw.line(surface, color, (int(self.x), int(self.y)), (int(end_x), int(end_y)), 2)
+        pygame.draw.line(surface, color, self.pos(scale), (int(end_x * scale), int(end_y * scale)), max(1, int(2 * scale)))
 
 class EmberParticle(Particle):
     """Slow-falling ember that glows"""
@@ -185,35 +313,22 @@ class EmberParticle(Particle):
         self.pulse += 0.2
         return super().update()
     
-    def draw(self, surface):
+    def draw(self, surface, scale):
         alpha = self.lifetime / self.max_lifetime
         pulse_factor = 0.7 + 0.3 * math.sin(self.pulse)
         color = tuple(max(0, min(255, int(c * alpha * pulse_factor))) for c in self.color)
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), self.size)
+        pygame.draw.circle(surface, color, self.pos(scale), max(1, int(self.size * scale)))
 
-def create_comet_trail(x, y, ball_dx, ball_dy):
-    """Create multiple particles for comet tail effect"""
-    new_particles = []
-    # Create 3-5 particles per frame for dense trail
-    for _ in range(random.randint(3, 5)):
-        # Particles spawn slightly behind the ball
-        offset_x = random.uniform(-4, 4) - ball_dx * 0.5
-        offset_y = random.uniform(-4, 4) - ball_dy * 0.5
-        size = random.randint(3, 7)
-        lifetime = random.randint(25, 45)
-        new_particles.append(CometParticle(
-            x + offset_x, y + offset_y,
-            ball_dx, ball_dy,
-            size=size, lifetime=lifetime
-        ))
-    return new_particles
+EXPLOSION_PARTICLES = 25 + 15 + 10  # Fire, sparks and embers per explosion
+# Particles a snapshot can hold, with the attribute each type adds
+PARTICLE_TYPES = ((Particle, None), (FireParticle, 'flicker'), (SparkParticle, None), (EmberParticle, 'pulse'))
 
 def create_fiery_explosion(x, y):
     """Create a spectacular fiery explosion"""
     new_particles = []
     
     # Main fire burst - 25 fire particles
-    for _ in range(25):
+    for _ in range(round(25 * particle_multiplier)):
         angle = random.uniform(0, 2 * math.pi)
         speed = random.uniform(2, 8)
         dx = math.cos(angle) * speed
@@ -223,7 +338,7 @@ def create_fiery_explosion(x, y):
         new_particles.append(FireParticle(x, y, dx, dy, size, lifetime))
     
     # Flying sparks - 15 fast bright sparks
-    for _ in range(15):
+    for _ in range(round(15 * particle_multiplier)):
         angle = random.uniform(0, 2 * math.pi)
         speed = random.uniform(5, 12)
         dx = math.cos(angle) * speed
@@ -231,82 +346,284 @@ def create_fiery_explosion(x, y):
         new_particles.append(SparkParticle(x, y, dx, dy))
     
     # Falling embers - 10 slow glowing embers
-    for _ in range(10):
+    for _ in range(round(10 * particle_multiplier)):
         offset_x = random.uniform(-20, 20)
         offset_y = random.uniform(-10, 10)
         new_particles.append(EmberParticle(x + offset_x, y + offset_y))
     
     return new_particles
 
-def create_blocks():
-    blocks = []
-    block_colors = [RED, ORANGE, GREEN, BLUE]
+def create_blocks(kinds=None):
+    """A full board, with the given block kinds or random ones. Moving
+    blocks are indexed in a grid of cells one block pitch in size."""
+    cell_size = (block_width + block_padding, block_height + block_padding) if block_motion else None
+    blocks = BlockStore(BLOCK_COLORS, cell_size)
     for row in range(block_rows):
         for col in range(block_cols):
             block_x = col * (block_width + block_padding) + block_padding
             block_y = row * (block_height + block_padding) + block_top_offset
-            block_rect = pygame.Rect(block_x, block_y, block_width, block_height)
-            blocks.append({"rect": block_rect, "color": block_colors[row % len(block_colors)]})
+            if kinds is None:
+                kind = KIND_EXPLOSIVE if game_rng.random() < EXPLOSIVE_BLOCK_CHANCE else KIND_NORMAL
+            else:
+                kind = kinds[row * block_cols + col]
+            blocks.add(block_x, block_y, block_width, block_height, row % len(BLOCK_COLORS), kind)
     return blocks
 
+def start_frame_explosions(steps):
+    """Keep particles per frame the same however many steps the frame runs"""
+    global explosion_stride, explosion_count
+    explosion_stride = max(1, steps)
+    explosion_count = 0
+
+def spawn_explosion(x, y):
+    global explosion_count
+    if replaying:
+        return  # Re-simulated explosions already happened once
+    frame_monitor.tag("explosion")
+    explosion_count += 1
+    if (explosion_count - 1) % explosion_stride:
+        return
+    if particle_worker:
+        particle_worker.spawn_explosion(x, y)
+    elif len(balls) <= CROWD_BALLS or len(explosion_particles) < CROWD_PARTICLE_LIMIT:
+        explosion_particles.extend(create_fiery_explosion(x, y))
+
+def draw_particles(surface, scale):
+    """Draw the explosion particles into a surface drawn at scale"""
+    if particle_worker:
+        particle_worker.draw(surface)
+    else:
+        for p in explosion_particles:
+            p.draw(surface, scale)
+
+def create_balls():
+    """The starting ball, plus any extra ones asked for on the command line"""
+    new_balls = [Ball(WIDTH // 2, HEIGHT // 2, 4, -4)]
+    for _ in range(start_balls - 1):
+        new_balls.append(Ball(game_rng.randint(ball_size, WIDTH - 2 * ball_size),
+                              game_rng.randint(HEIGHT // 2, HEIGHT - 100),
+                              game_rng.choice([-4, 4]), -4,
+                              explosive=game_rng.random() < explosive_ratio))
+    return new_balls
+
 def reset_game():
-    global blocks, balls, paddle_x, start_time, particles, explosion_particles
-    global game_over, game_won, final_time
+    global blocks, balls, paddle_x, start_time, explosion_particles
+    global game_over, game_won, final_time, block_layer, time_scaled_game, restored_game
     blocks = create_blocks()
-    balls = [Ball(WIDTH // 2, HEIGHT // 2, 4, -4)]
+    block_layer = None  # Baked again for the new board
+    if block_motion:
+        start_block_motion()
+    balls = create_balls()
     paddle_x = (WIDTH - paddle_width) // 2
     start_time = pygame.time.get_ticks()
-    particles = []
     explosion_particles = []
+    if particle_worker:
+        particle_worker.clear()
+    shockwaves.clear()
     game_over = False
     game_won = False
     final_time = 0
+    time_scaled_game = False
+    restored_game = False
+    if rewind_buffer:
+        rewind_buffer.clear()
 
-# High score functions
-def load_highscores():
-    """Load high scores from CSV file"""
-    scores = []
-    if os.path.exists(HIGHSCORE_FILE):
-        try:
-            with open(HIGHSCORE_FILE, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    scores.append({
-                        'name': row['name'],
-                        'time': int(row['time']),
-                        'date': row['date']
-                    })
-        except:
+def start_block_motion(step=0):
+    """Put the blocks where the block motion has them at step"""
+    # Descending boards stop well above the paddle
+    max_drop = max(0, paddle_y - 150 - blocks_bottom)
+    block_motion.set_board(block_cols, (block_width + block_padding) // 2, max_drop)
+    block_motion.start(blocks, step)
+
+def game_elapsed_ms():
+    """Game time so far, not counting pauses"""
+    if game_over or game_won or game_paused:
+        return pause_time - start_time
+    return pygame.time.get_ticks() - start_time
+
+def snapshot_game(particles=False):
+    """The current game as a binary blob for restore_game()"""
+    flags = ((snapshot.FLAG_GAME_OVER if game_over else 0) | (snapshot.FLAG_GAME_WON if game_won else 0) |
+             (snapshot.FLAG_TIME_SCALED if time_scaled_game else 0) |
+             (snapshot.FLAG_BALL_COLLISIONS if ball_collider else 0))
+    motion, motion_step = (BLOCK_MOTIONS.index(block_motion.pattern) + 1, block_motion.step) if block_motion else (0, 0)
+    header = snapshot.Header(flags, paddle_x, paddle_velocity, game_elapsed_ms(), final_time, block_rows, block_cols,
+                             motion, motion_step)
+    return snapshot.dump(header, blocks.kinds, blocks.alive, balls, game_rng, shockwaves.waves,
+                         explosion_particles if particles else None, PARTICLE_TYPES)
+
+def restore_game(blob):
+    """Carry on from a snapshot_game() blob. Raises snapshot.SnapshotError
+    if it can't be read."""
+    global blocks, balls, paddle_x, paddle_velocity, start_time, pause_time, explosion_particles
+    global game_over, game_won, game_paused, final_time, block_layer, time_scaled_game, restored_game
+    global ball_collider, block_motion
+    state = snapshot.load(blob, PARTICLE_TYPES)
+    header = state.header
+    if header.motion > len(BLOCK_MOTIONS):
+        raise snapshot.SnapshotError(f"unknown block motion {header.motion}")
+    # The game only plays out the same with the same rules
+    if header.motion:
+        pattern = BLOCK_MOTIONS[header.motion - 1]
+        if not block_motion or block_motion.pattern != pattern:
+            block_motion = BlockMotion(pattern)
+    else:
+        block_motion = None
+    if ((header.rows, header.cols) != (block_rows, block_cols) or blocks.capacity != len(state.kinds)
+            or (blocks.grid is None) != (block_motion is None)):
+        set_board_size(header.rows, header.cols)
+        blocks = create_blocks(state.kinds)
+    else:
+        # Same layout: copying the board is cheaper than building it block by block
+        blocks = blocks.copy()
+        blocks.kinds[:] = state.kinds
+    blocks.set_alive(state.alive)
+    if block_motion:
+        start_block_motion(header.motion_step)
+    block_layer = None  # Baked again for the restored board
+    balls = []
+    for x, y, dx, dy, pulse, explosive in state.balls:
+        ball = Ball(x, y, dx, dy, explosive)
+        ball.pulse_timer = pulse
+        balls.append(ball)
+    game_rng.setstate(state.rng_state)
+    shockwaves.clear()
+    for x, y, radius, max_radius, speed, frontier in state.waves:
+        wave = Shockwave(x, y, max_radius, speed, frontier)
+        wave.radius = radius
+        shockwaves.waves.append(wave)
+    explosion_particles = state.particles or []
+    if particle_worker:
+        particle_worker.clear()
+    paddle_x = header.paddle_x
+    paddle_velocity = header.paddle_velocity
+    game_over = bool(header.flags & snapshot.FLAG_GAME_OVER)
+    game_won = bool(header.flags & snapshot.FLAG_GAME_WON)
+    game_paused = game_over or game_won
+    time_scaled_game = bool(header.flags & snapshot.FLAG_TIME_SCALED)
+    restored_game = True
+    if header.flags & snapshot.FLAG_BALL_COLLISIONS:
+        ball_collider = ball_collider or BallCollider(ball_size)
+    else:
+        ball_collider = None
+    final_time = header.final_time
+    pause_time = pygame.time.get_ticks()
+    start_time = pause_time - header.elapsed_ms
+
+def save_snapshot(path):
+    """Write the current game, particles included, to a file"""
+    started = time.perf_counter()
+    blob = snapshot_game(particles=True)
+    packed_ms = (time.perf_counter() - started) * 1000
+    try:
+        with open(path, 'wb') as f:
+            f.write(blob)
+    except OSError as e:
+        print(f"Could not save snapshot: {e}")
+        return False
+    print(f"Saved {path}: {len(blob):,} bytes, packed in {packed_ms:.3f} ms")
+    return True
+
+def load_snapshot(path):
+    """Carry on from a file written by save_snapshot()"""
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read()
+        started = time.perf_counter()
+        restore_game(blob)
+    except (OSError, snapshot.SnapshotError) as e:
+        print(f"Could not load snapshot: {e}")
+        return False
+    print(f"Loaded {path}: {len(blob):,} bytes, restored in {(time.perf_counter() - started) * 1000:.3f} ms")
+    if rewind_buffer:
+        rewind_buffer.clear()  # Rewinding into the game before the load would be confusing
+    return True
+
+def record_step(start, end):
+    """step_simulation(), recorded in the rewind buffer"""
+    if rewind_buffer.needs_keyframe():
+        rewind_buffer.add_keyframe(snapshot_game())
+    kills_before = len(blocks.kill_log)
+    step_simulation(start, end)
+    rewind_buffer.add_step(paddle_x, len(balls), blocks.kill_log[kills_before:])
+
+def replay_steps(recorded):
+    """Re-simulate recorded steps from the game as it is, yielding each
+    record with the blocks the step destroyed"""
+    global paddle_control, replaying
+    control = paddle_control
+    paddle_control = Replay(paddle for paddle, _, _ in recorded)
+    replaying = True
+    try:
+        for step in recorded:
+            kills_before = len(blocks.kill_log)
+            step_simulation(0, 0)
+            yield step, blocks.kill_log[kills_before:]
+    finally:
+        paddle_control = control
+        replaying = False
+
+def replay_segment(segment):
+    """Re-simulate a rewind segment from its keyframe, checking it against
+    the records. Returns snapshots of the game by step: the keyframe, and
+    after every stride-th step as many as the rewind memory cap holds."""
+    restore_game(segment.keyframe)
+    rewind_buffer.drop_scrub_cache()
+    frames = {segment.start: segment.keyframe}  # Already held by the segment
+    stride = rewind_buffer.scrub_stride(segment)
+    for done, (step, kills) in enumerate(replay_steps(list(segment.steps_recorded())), 1):
+        rewind_buffer.check(step, len(balls), kills)
+        if done % stride == 0:
+            blob = snapshot_game()
+            if rewind_buffer.cache_snapshot(blob):
+                frames[segment.start + done] = blob
+    return frames
+
+def show_rewind(step):
+    """Put the game back the way it was at a recorded step. The game clock
+    keeps running - rewinding doesn't give time back."""
+    global rewind_cursor, rewind_frames, rewind_segment, start_time, pause_time
+    segment = rewind_buffer.segment_at(step)
+    clock = start_time, pause_time
+    if segment is not rewind_segment:
+        # Every step of the segment is re-simulated once, then scrubbing
+        # through it is just restoring snapshots
+        rewind_frames = replay_segment(segment)
+        rewind_segment = segment
+    # From the nearest snapshot before it, re-simulating the steps between
+    cached = max(start for start in rewind_frames if start <= step)
+    restore_game(rewind_frames[cached])
+    if cached < step:
+        recorded = list(segment.steps_recorded())[cached - segment.start:step - segment.start]
+        for _ in replay_steps(recorded):
             pass
-    # Sort by time (ascending - lower is better)
-    scores.sort(key=lambda x: x['time'])
-    return scores[:10]  # Return top 10
+    if game_over or game_won:
+        start_time, pause_time = clock[0], pygame.time.get_ticks()
+    else:
+        start_time = clock[0]
+    rewind_cursor = step
 
+def stop_rewind():
+    """Carry on playing from the step being shown"""
+    global rewind_cursor, rewind_frames, rewind_segment
+    rewind_buffer.truncate(rewind_cursor)
+    rewind_cursor = None
+    rewind_frames = {}
+    rewind_segment = None
+    rewind_buffer.drop_scrub_cache()
+
+# High score functions
 def save_highscore(name, time_seconds):
-    """Save a new high score to CSV file"""
-    scores = []
-    # Read existing scores
-    if os.path.exists(HIGHSCORE_FILE):
-        try:
-            with open(HIGHSCORE_FILE, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    scores.append(row)
-        except:
-            pass
+    """Save a new high score - the CSV is written on the writer thread"""
+    date = datetime.now().strftime('%Y-%m-%d %H:%M')
     
-    # Add new score
-    scores.append({
-        'name': name,
-        'time': str(time_seconds),
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M')
-    })
+    # Update the in-memory leaderboard right away
+    leaderboard.add(name, time_seconds, date)
     
-    # Write all scores back
-    with open(HIGHSCORE_FILE, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['name', 'time', 'date'])
-        writer.writeheader()
-        writer.writerows(scores)
+    frame_monitor.tag("high score save")
+    highscore_writer.submit({'name': name, 'time': str(time_seconds), 'date': date})
+    if leaderboard_sync:
+        leaderboard_sync.submit(name, time_seconds, date)
 
 # 2. Create blocks
 blocks = create_blocks()
@@ -317,11 +634,50 @@ paddle_x = (WIDTH - paddle_width) // 2
 paddle_y = HEIGHT - 40
 paddle_speed = 8
 paddle_velocity = 0  # Track paddle movement for spin
+paddle_input = None  # InputTimeline, created in main()
+player_control = None  # KeyboardControl or MouseControl, created in main()
+autopilot = None  # Autopilot, created in main()
+paddle_control = None  # Whoever is moving the paddle
+late_latch = True  # Draw the paddle where the latest input puts it
 
 # Ball settings
 ball_size = 15
 # 1) Blast radius for explosive balls
 BLAST_RADIUS = 100
+BLOCK_BLAST_RADIUS = 90  # Blast of an explosive block
+shockwaves = ShockwaveManager(particles_per_kill=EXPLOSION_PARTICLES)
+ball_collider = None  # BallCollider when balls bounce off each other (--ball-collisions)
+spectator_server = None  # SpectatorServer when --spectate is given
+
+# Comet trail: each ball keeps its last TRAIL_LENGTH centers in a ring buffer.
+# The look of every trail point only depends on its age, so it is worked
+# out once here (white hot near the ball, fading to ember red). The trail is
+# drawn in TRAIL_BANDS bands of equal age, each one thick polyline (plus a
+# wider glow line underneath), so a ball costs about twenty draw calls
+# however long its trail is.
+TRAIL_LENGTH = 30
+TRAIL_MAX_RADIUS = 7
+TRAIL_BANDS = 10
+TRAIL_STYLE = []  # (color, glow color or None, radius) by age
+for age in range(TRAIL_LENGTH):
+    alpha = 1 - age / TRAIL_LENGTH
+    base_color = FIRE_COLORS[min(int((1 - alpha) * (len(FIRE_COLORS) - 1)), len(FIRE_COLORS) - 1)]
+    color = tuple(int(c * (0.3 + alpha * 0.7)) for c in base_color)
+    radius = max(1, int(TRAIL_MAX_RADIUS * alpha))
+    glow_color = tuple(int(c * 0.3) for c in base_color) if radius > 2 else None
+    TRAIL_STYLE.append((color, glow_color, radius))
+# (first age, ages, color, glow color or None, radius, glow radius) at the render scale
+trail_bands = []
+
+# Rendering budget: a full trail and a glowing ball cost about 40 us, fine
+# for dozens of balls but more than a whole frame for a thousand. So the
+# trails share TRAIL_BAND_BUDGET bands per frame - with many balls each one
+# only keeps its newest bands, a shorter tail - and past CROWD_BALLS balls
+# the glows (of balls and trails) are left out, and explosions only get
+# particles while fewer than CROWD_PARTICLE_LIMIT are flying.
+TRAIL_BAND_BUDGET = 1500
+CROWD_BALLS = 300
+CROWD_PARTICLE_LIMIT = 300
 
 class Ball:
     # 2) Ball with explosive flag and pulse effect
@@ -332,11 +688,55 @@ class Ball:
         self.dy = dy
         self.explosive = explosive
         self.pulse_timer = 0
+        # Comet trail ring buffer of center points (allocated once, overwritten in place)
+        self.trail = [None] * TRAIL_LENGTH
+        self.trail_head = 0  # Next slot to write
+        self.trail_count = 0
     
     def update(self):
         self.x += self.dx
         self.y += self.dy
         self.pulse_timer += 0.15  # Increment pulse
+        self.record_trail()
+    
+    def record_trail(self):
+        head = self.trail_head
+        self.trail[head] = (self.x + ball_size / 2, self.y + ball_size / 2)
+        self.trail_head = (head + 1) % TRAIL_LENGTH
+        if self.trail_count < TRAIL_LENGTH:
+            self.trail_count += 1
+    
+    def draw_trail(self, surface, bands, glow=True):
+        """Draw the trail as tapered polylines, one per band of ages. bands
+        is trail_bands or its first few (newest) bands."""
+        first, ages = bands[-1][:2]
+        count = min(self.trail_count, first + ages + 1)
+        if count < 2:
+            return
+        # Newest point first, so a point's index is its age
+        trail = self.trail
+        newest = (self.trail_head - 1) % TRAIL_LENGTH
+        if newest == count - 1:
+            points = trail[newest::-1]
+        elif newest >= count:
+            points = trail[newest:newest - count:-1]
+        else:
+            points = trail[newest::-1] + trail[:newest - count:-1]  # Wraps around the end
+        scale = view.scale
+        if scale != 1:
+            points = [(x * scale, y * scale) for x, y in points]
+        # Every band shares its last point with the next one, so they join
+        # up. The newest end is under the ball, so it needs no cap.
+        if glow:
+            for first, ages, color, glow_color, radius, glow_radius in bands:
+                if first >= count - 1:
+                    break
+                if glow_color:
+                    pygame.draw.lines(surface, glow_color, False, points[first:first + ages + 1], glow_radius * 2)
+        for first, ages, color, glow_color, radius, glow_radius in bands:
+            if first >= count - 1:
+                break
+            pygame.draw.lines(surface, color, False, points[first:first + ages + 1], radius * 2)
     
     def get_rect(self):
         return pygame.Rect(self.x, self.y, ball_size, ball_size)
@@ -344,6 +744,10 @@ class Ball:
     def get_pulse_intensity(self):
         # Returns 0.5 to 1.0 for pulsating effect
         return 0.5 + 0.5 * abs(math.sin(self.pulse_timer))
+    
+    def get_pulse_step(self):
+        """Which of the EXPLOSIVE_GLOW_STEPS baked looks shows the pulse"""
+        return round((self.get_pulse_intensity() - 0.5) * 2 * (EXPLOSIVE_GLOW_STEPS - 1))
 
 # Initialize balls list
 balls = [Ball(WIDTH // 2, HEIGHT // 2, 4, -4)]
@@ -352,12 +756,187 @@ balls = [Ball(WIDTH // 2, HEIGHT // 2, 4, -4)]
 game_paused = False
 show_credits = False
 show_highscores = False
+highscore_view = 0  # Index into HIGHSCORE_VIEWS
+highscore_page = 0
 game_over = False
 game_won = False
 entering_name = False
 player_name = ""
 final_time = 0
 start_time = pygame.time.get_ticks()
+pause_time = 0  # When the game was paused (or ended)
+
+# Baked at the current render scale by bake_render_assets()
+overlays = {}  # Menu overlay surface by alpha
+ball_sprite = None  # Normal ball with its glow
+ball_core = None  # ...and without
+EXPLOSIVE_GLOW_STEPS = 16
+explosive_sprites = []  # Explosive ball with its glow by pulse step
+explosive_cores = []  # ...and without
+block_layer = None  # All live blocks, erased block by block as they die
+block_sprites = []  # (atlas, position, area) of every block id for blits()
+block_sprites_key = None  # What block_sprites were made for
+blocks_bottom = block_top_offset + block_rows * (block_height + block_padding)
+
+def make_glow(circles):
+    """Bake a ball glow sprite from (rgba color, logical radius) circles"""
+    glow_size = ball_size + 8
+    sprite = pygame.Surface((view.px(glow_size * 2), view.px(glow_size * 2)), pygame.SRCALPHA)
+    center = view.point(glow_size, glow_size)
+    for color, radius in circles:
+        pygame.draw.circle(sprite, color, center, view.px(radius))
+    return sprite
+
+def make_core():
+    """A blank color keyed ball sprite, without glow"""
+    sprite = pygame.Surface(view.rect(0, 0, ball_size, ball_size).size)
+    if pygame.display.get_surface():
+        sprite = sprite.convert()
+    sprite.fill(BLACK)
+    sprite.set_colorkey(BLACK)
+    return sprite
+
+def bake_render_assets():
+    """Rebuild everything that depends on the render resolution"""
+    global screen, trail_bands, ball_sprite, ball_core, block_layer, particle_layer
+    screen = view.surface
+    particle_layer = ParticleLayer(view.size, particle_scale)
+    for font in (font_large, font_medium, font_small, font_tiny):
+        font.set_scale(view.scale)
+    overlays.clear()
+    for alpha in (180, 200, 220):
+        overlay = pygame.Surface(view.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, alpha))
+        overlays[alpha] = overlay
+    # Each band is drawn with the look of its middle age
+    band_ages = -(-TRAIL_LENGTH // TRAIL_BANDS)
+    trail_bands = []
+    for first in range(0, TRAIL_LENGTH, band_ages):
+        color, glow_color, radius = TRAIL_STYLE[min(TRAIL_LENGTH - 1, first + band_ages // 2)]
+        trail_bands.append((first, band_ages, color, glow_color, view.px(radius), view.px(radius + 2)))
+    # Balls are baked with and without their glow, the core drawn where
+    # the ball sits in the glow sprite. Cores have no soft edges, so they
+    # are color keyed, which blits faster than per-pixel alpha.
+    glow_size = ball_size + 8
+    core_rect = view.rect(0, 0, ball_size, ball_size)
+    in_glow = view.point(glow_size - ball_size // 2, glow_size - ball_size // 2)
+    ball_sprite = make_glow([((255, 100, 0, 40), glow_size),
+                             ((255, 200, 50, 60), glow_size - 3),
+                             ((255, 255, 200, 80), glow_size - 6)])
+    ball_core = make_core()
+    for surface, rect in ((ball_sprite, core_rect.move(in_glow)), (ball_core, core_rect)):
+        # Main ball - white hot center
+        pygame.draw.ellipse(surface, (255, 255, 240), rect)
+    explosive_sprites.clear()
+    explosive_cores.clear()
+    for step in range(EXPLOSIVE_GLOW_STEPS):
+        pulse = 0.5 + 0.5 * step / (EXPLOSIVE_GLOW_STEPS - 1)
+        sprite = make_glow([
+            ((255, 0, 0, int(60 * pulse)), glow_size + int(4 * pulse)),
+            ((255, 100, 0, int(100 * pulse)), glow_size - 2),
+            ((255, 200, 50, int(150 * pulse)), glow_size - 5)])
+        core = make_core()
+        for surface, rect in ((sprite, core_rect.move(in_glow)), (core, core_rect)):
+            # Main ball - pulsating red core
+            pygame.draw.ellipse(surface, (int(200 + 55 * pulse), int(50 * pulse), 0), rect)
+            # White hot center spot
+            center_size = int(4 * pulse)
+            if center_size > 0:
+                pygame.draw.circle(surface, (255, 255, 200), rect.center, view.px(center_size))
+        explosive_sprites.append(sprite)
+        explosive_cores.append(core)
+    block_layer = None
+    if particle_worker:
+        particle_worker.scale = view.scale * particle_layer.scale
+
+def draw_trails(glow=True):
+    """Draw every ball's trail, sharing TRAIL_BAND_BUDGET bands between them"""
+    bands = trail_bands[:max(1, min(len(trail_bands), TRAIL_BAND_BUDGET // max(1, len(balls))))]
+    if len(bands) > 1 or glow:
+        for ball in balls:
+            ball.draw_trail(screen, bands, glow)
+        return
+    # Down to the newest band: a straight line per ball will do, drawn right
+    # here, as at these counts even the draw_trail() calls add up
+    first, ages, color, glow_color, radius, glow_radius = bands[0]
+    scale = view.scale
+    width = radius * 2
+    line = pygame.draw.line
+    for ball in balls:
+        count = ball.trail_count
+        if count < 2:
+            continue
+        trail = ball.trail
+        newest = ball.trail_head - 1  # Negative indices wrap round the ring
+        head_x, head_y = trail[newest]
+        tail_x, tail_y = trail[newest - min(count - 1, ages)]
+        line(screen, color, (head_x * scale, head_y * scale), (tail_x * scale, tail_y * scale), width)
+
+def draw_balls(glow=True):
+    """Blit every ball's baked sprite in one blits() call"""
+    if glow:
+        offset = ball_size + 8 - ball_size // 2  # Glow sprites are centered on the ball
+        normal, explosive = ball_sprite, explosive_sprites
+    else:
+        offset = 0
+        normal, explosive = ball_core, explosive_cores
+    point = view.point
+    screen.blits([(explosive[ball.get_pulse_step()] if ball.explosive else normal,
+                   point(ball.x - offset, ball.y - offset)) for ball in balls], doreturn=False)
+
+def draw_block_look(tile, look):
+    """Draw a (color id, kind) block look filling an atlas tile"""
+    color_id, kind = look
+    block_color = BLOCK_COLORS[color_id]
+    rect = tile.get_rect()
+    tile.fill(block_color)
+    # Add subtle highlight
+    highlight_color = tuple(min(255, c + 60) for c in block_color)
+    tile.fill(highlight_color, (0, 0, rect.width, view.px(3)))
+    if kind == KIND_EXPLOSIVE:
+        # Explosive blocks get a glowing fuse frame
+        inset = int(3 * view.scale)
+        pygame.draw.rect(tile, YELLOW, rect.inflate(-2 * inset, -2 * inset), view.px(2))
+        pygame.draw.circle(tile, WHITE, rect.center, view.px(3))
+
+block_atlas = BlockAtlas(draw_block_look)
+
+def update_block_sprites():
+    """Bake the atlas and work out every block's sprite for a new board or
+    render scale (a restored or rewound board reuses them)"""
+    global block_sprites, block_sprites_key
+    key = (view.generation, block_rows, block_cols, bytes(blocks.kinds))
+    if key == block_sprites_key:
+        return
+    rects = [view.rect(*blocks.rect(block_id)) for block_id in range(blocks.capacity)]
+    looks = list(zip(blocks.color_ids, blocks.kinds))
+    block_atlas.build(zip(looks, (rect.size for rect in rects)))
+    block_sprites = list(map(block_atlas.sprite, looks, rects))
+    block_sprites_key = key
+
+def draw_blocks(killed_blocks):
+    """Blit the block layer, baking it first if needed. Moving blocks are
+    blitted from the atlas where they are now, every frame."""
+    global block_layer
+    if block_motion:
+        update_block_sprites()
+        atlas = block_atlas.surface
+        x = blocks.x
+        y = blocks.y
+        point = view.point
+        screen.blits([(atlas, point(x[block_id], y[block_id]), block_sprites[block_id][2]) for block_id in blocks],
+                     doreturn=False)
+        return
+    if block_layer is None:
+        block_layer = pygame.Surface((view.size[0], view.px(blocks_bottom))).convert()
+        block_layer.fill(BLACK)
+        block_layer.set_colorkey(BLACK)
+        update_block_sprites()
+        block_layer.blits([block_sprites[block_id] for block_id in blocks], doreturn=False)
+    else:
+        for block_id in killed_blocks:
+            block_layer.fill(BLACK, view.rect(*blocks.rect(block_id)))
+    screen.blit(block_layer, (0, 0))
 
 # Menu button class
 class Button:
@@ -370,10 +949,11 @@ class Button:
     
     def draw(self, surface):
         color = self.hover_color if self.is_hovered else self.color
-        pygame.draw.rect(surface, color, self.rect, border_radius=10)
-        pygame.draw.rect(surface, WHITE, self.rect, 3, border_radius=10)
+        rect = view.rect(*self.rect)
+        pygame.draw.rect(surface, color, rect, border_radius=view.px(10))
+        pygame.draw.rect(surface, WHITE, rect, view.px(3), border_radius=view.px(10))
         text_surface = font_medium.render(self.text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
+        text_rect = text_surface.get_rect(center=rect.center)
         surface.blit(text_surface, text_rect)
     
     def check_hover(self, pos):
@@ -388,12 +968,16 @@ btn_new_game = Button(WIDTH // 2, HEIGHT // 2 - 80, 200, 50, "New Game")
 btn_highscores = Button(WIDTH // 2, HEIGHT // 2 - 10, 200, 50, "High Scores", ORANGE)
 btn_credits = Button(WIDTH // 2, HEIGHT // 2 + 60, 200, 50, "Credits")
 btn_back = Button(WIDTH // 2, HEIGHT // 2 + 150, 200, 50, "Back", GRAY)
+btn_prev_page = Button(WIDTH // 2 - 220, HEIGHT // 2 + 150, 160, 50, "Prev", BLUE)
+btn_next_page = Button(WIDTH // 2 + 220, HEIGHT // 2 + 150, 160, 50, "Next", BLUE)
 
 def draw_menu():
     # Semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
+    screen.blit(overlays[180], (0, 0))
+    
+    # Attract mode fireworks (stepped in the game loop)
+    if fireworks_show:
+        fireworks_show.draw(screen, view.scale)
     
     # Title - show different title based on game state
     if game_over:
@@ -402,7 +986,7 @@ def draw_menu():
         title = font_large.render("YOU WIN!", True, GREEN)
     else:
         title = font_large.render("PAUSED", True, YELLOW)
-    title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+    title_rect = title.get_rect(center=view.point(WIDTH // 2, HEIGHT // 4))
     screen.blit(title, title_rect)
     
     # Buttons
@@ -412,53 +996,71 @@ def draw_menu():
 
 def draw_credits():
     # Semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
+    screen.blit(overlays[200], (0, 0))
     
     # Credits title
     title = font_large.render("CREDITS", True, CYAN)
-    title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+    title_rect = title.get_rect(center=view.point(WIDTH // 2, HEIGHT // 4))
     screen.blit(title, title_rect)
     
     # Credit text
     credit1 = font_medium.render("Created by Chris", True, WHITE)
-    credit1_rect = credit1.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
+    credit1_rect = credit1.get_rect(center=view.point(WIDTH // 2, HEIGHT // 2 - 30))
     screen.blit(credit1, credit1_rect)
     
     credit2 = font_medium.render("using pygame and Python", True, WHITE)
-    credit2_rect = credit2.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 20))
+    credit2_rect = credit2.get_rect(center=view.point(WIDTH // 2, HEIGHT // 2 + 20))
     screen.blit(credit2, credit2_rect)
     
     # Back button
     btn_back.draw(screen)
 
+def highscore_page_scores():
+    """Scores on the current High Scores page, and how many the view has in total"""
+    offset = highscore_page * HIGHSCORE_PAGE_SIZE
+    name = HIGHSCORE_VIEWS[highscore_view]
+    if name == "Player bests":
+        return leaderboard.top_players(HIGHSCORE_PAGE_SIZE, offset), leaderboard.player_count()
+    if name == "Last 30 days":
+        since = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        return leaderboard.top(HIGHSCORE_PAGE_SIZE, offset, since=since), leaderboard.count(since=since)
+    return leaderboard.top(HIGHSCORE_PAGE_SIZE, offset), leaderboard.count()
+
+def turn_highscore_page(step):
+    """Move step pages forward or back, staying within the current view"""
+    global highscore_page
+    total = highscore_page_scores()[1]
+    last_page = max(0, (total - 1) // HIGHSCORE_PAGE_SIZE)
+    highscore_page = max(0, min(last_page, highscore_page + step))
+
 def draw_highscores():
     # Semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 220))
-    screen.blit(overlay, (0, 0))
+    screen.blit(overlays[220], (0, 0))
     
     # Title
     title = font_large.render("HIGH SCORES", True, GOLD)
-    title_rect = title.get_rect(center=(WIDTH // 2, 60))
+    title_rect = title.get_rect(center=view.point(WIDTH // 2, 60))
     screen.blit(title, title_rect)
     
-    # Load and display scores
-    scores = load_highscores()
+    # One page of the in-memory leaderboard (no disk access while drawing)
+    scores, total = highscore_page_scores()
+    pages = max(1, -(-total // HIGHSCORE_PAGE_SIZE))
+    subtitle = font_tiny.render(f"{HIGHSCORE_VIEWS[highscore_view]}  -  page {highscore_page + 1} of {pages}", True, GRAY)
+    screen.blit(subtitle, subtitle.get_rect(center=view.point(WIDTH // 2, 105)))
     
     if not scores:
-        no_scores = font_medium.render("No scores yet!", True, GRAY)
-        no_scores_rect = no_scores.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        message = "Loading scores..." if highscore_writer.loading else "No scores yet!"
+        no_scores = font_medium.render(message, True, GRAY)
+        no_scores_rect = no_scores.get_rect(center=view.point(WIDTH // 2, HEIGHT // 2))
         screen.blit(no_scores, no_scores_rect)
     else:
         # Header
         header = font_small.render("RANK    NAME              TIME         DATE", True, YELLOW)
-        screen.blit(header, (100, 110))
+        screen.blit(header, view.point(100, 122))
         
         # Scores
-        for i, score in enumerate(scores[:10]):
-            rank = i + 1
+        for i, score in enumerate(scores):
+            rank = highscore_page * HIGHSCORE_PAGE_SIZE + i + 1
             name = score['name'][:12].ljust(12)
             time_sec = int(score['time'])
             mins = time_sec // 60
@@ -478,32 +1080,37 @@ def draw_highscores():
             
             line = f" {rank:2d}.     {name}      {time_str}      {date}"
             score_text = font_small.render(line, True, color)
-            screen.blit(score_text, (100, 145 + i * 35))
+            screen.blit(score_text, view.point(100, 152 + i * 27))
     
-    # Back button
+    hint = font_tiny.render("LEFT/RIGHT: page    TAB: switch view", True, GRAY)
+    screen.blit(hint, hint.get_rect(center=view.point(WIDTH // 2, HEIGHT // 2 + 200)))
+    
+    # Back and paging buttons
     btn_back.draw(screen)
+    if highscore_page > 0:
+        btn_prev_page.draw(screen)
+    if highscore_page < pages - 1:
+        btn_next_page.draw(screen)
 
 def draw_name_entry():
     # Semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 220))
-    screen.blit(overlay, (0, 0))
+    screen.blit(overlays[220], (0, 0))
     
     # Title
     title = font_large.render("YOU WIN!", True, GREEN)
-    title_rect = title.get_rect(center=(WIDTH // 2, 100))
+    title_rect = title.get_rect(center=view.point(WIDTH // 2, 100))
     screen.blit(title, title_rect)
     
     # Time
     mins = final_time // 60
     secs = final_time % 60
     time_text = font_medium.render(f"Your time: {mins:02d}:{secs:02d}", True, YELLOW)
-    time_rect = time_text.get_rect(center=(WIDTH // 2, 180))
+    time_rect = time_text.get_rect(center=view.point(WIDTH // 2, 180))
     screen.blit(time_text, time_rect)
     
     # Prompt
     prompt = font_medium.render("Enter your name:", True, WHITE)
-    prompt_rect = prompt.get_rect(center=(WIDTH // 2, 260))
+    prompt_rect = prompt.get_rect(center=view.point(WIDTH // 2, 260))
     screen.blit(prompt, prompt_rect)
     
     # Name input box
@@ -511,308 +1118,716 @@ def draw_name_entry():
     box_height = 50
     box_x = WIDTH // 2 - box_width // 2
     box_y = 300
-    pygame.draw.rect(screen, WHITE, (box_x, box_y, box_width, box_height), 3, border_radius=5)
+    pygame.draw.rect(screen, WHITE, view.rect(box_x, box_y, box_width, box_height), view.px(3), border_radius=view.px(5))
     
     # Player name text
     name_surface = font_medium.render(player_name + "_", True, CYAN)
-    name_rect = name_surface.get_rect(center=(WIDTH // 2, box_y + box_height // 2))
+    name_rect = name_surface.get_rect(center=view.point(WIDTH // 2, box_y + box_height // 2))
     screen.blit(name_surface, name_rect)
     
     # Instructions
     instr = font_small.render("Press ENTER to save", True, GRAY)
-    instr_rect = instr.get_rect(center=(WIDTH // 2, 400))
+    instr_rect = instr.get_rect(center=view.point(WIDTH // 2, 400))
     screen.blit(instr, instr_rect)
 
 def draw_hud():
     # Blocks left and ball count
     blocks_left = len(blocks)
     blocks_text = font_small.render(f"Blocks: {blocks_left}/{total_blocks}", True, WHITE)
-    screen.blit(blocks_text, (10, HEIGHT - 30))
+    screen.blit(blocks_text, view.point(10, HEIGHT - 30))
     
     # Ball count
     ball_count = len(balls)
     ball_text = font_small.render(f"Balls: {ball_count}", True, CYAN if ball_count > 1 else WHITE)
-    screen.blit(ball_text, (10, HEIGHT - 60))
+    screen.blit(ball_text, view.point(10, HEIGHT - 60))
     
     # Time elapsed
-    if game_over or game_won:
-        elapsed_ms = pause_time - start_time
-    elif not game_paused:
-        elapsed_ms = pygame.time.get_ticks() - start_time
-    else:
-        elapsed_ms = pause_time - start_time
-    elapsed_sec = elapsed_ms // 1000
+    elapsed_sec = game_elapsed_ms() // 1000
     minutes = elapsed_sec // 60
     seconds = elapsed_sec % 60
     time_text = font_small.render(f"Time: {minutes:02d}:{seconds:02d}", True, WHITE)
-    screen.blit(time_text, (WIDTH - 150, HEIGHT - 30))
+    screen.blit(time_text, view.point(WIDTH - 150, HEIGHT - 30))
     
     # Press ESC hint
     esc_text = font_small.render("ESC - Menu", True, GRAY)
-    screen.blit(esc_text, (WIDTH // 2 - 50, HEIGHT - 30))
+    screen.blit(esc_text, view.point(WIDTH // 2 - 50, HEIGHT - 30))
+    if time_scale != 1:
+        scale_text = font_small.render(f"{time_scale:g}x", True, YELLOW)
+        screen.blit(scale_text, view.point(WIDTH - 150, HEIGHT - 90))
+    if paddle_control is autopilot:
+        auto_text = font_small.render("AUTOPILOT", True, CYAN)
+        screen.blit(auto_text, view.point(WIDTH - 150, HEIGHT - 60))
+    
+    # Frame pacing readout (F3)
+    if show_frame_stats:
+        stats_text = font_tiny.render(frame_monitor.readout(), True, YELLOW)
+        screen.blit(stats_text, view.point(10, 10))
+        pacing_text = font_tiny.render(frame_monitor.pacing_readout(), True, YELLOW)
+        screen.blit(pacing_text, view.point(10, 30))
+        lines = []
+        if paddle_input.measure_latency:
+            lines.append(paddle_input.readout())
+        if rewind_buffer:
+            lines.append(rewind_buffer.readout())
+        if ball_collider:
+            lines.append(ball_collider.readout())
+        if block_motion:
+            lines.append(block_motion.readout())
+        for i, line in enumerate(lines):
+            line_text = font_tiny.render(line, True, YELLOW)
+            screen.blit(line_text, view.point(10, 50 + i * 20))
+    if rewind_cursor is not None:
+        rewind_text = font_medium.render(f"<< {(rewind_cursor - rewind_buffer.end) / FPS:5.1f} s", True, CYAN)
+        screen.blit(rewind_text, view.point(WIDTH // 2 - 80, HEIGHT // 2 + 40))
+    if memory_monitor.active:
+        memory_text = font_tiny.render(memory_monitor.readout(), True, YELLOW)
+        screen.blit(memory_text, view.point(WIDTH - 300, 10))
 
-# Game loop
-clock = pygame.time.Clock()
-running = True
-pause_time = 0
+def step_simulation(start, end):
+    """Advance the game by one fixed step (1/60 s at normal speed), which
+    stands for the real time from start to end as far as input goes"""
+    global paddle_x, paddle_velocity
+    # Blocks move first, so balls meet them where they are drawn
+    if block_motion:
+        block_motion.advance(blocks)
+    
+    # Paddle movement (keyboard, mouse or the autopilot)
+    new_x = max(0, min(WIDTH - paddle_width, paddle_control.move(paddle_x, balls, start, end)))
+    if paddle_input:
+        # Whoever is playing, input up to end is spent - the history goes
+        paddle_input.applied(end)
+    paddle_velocity = max(-paddle_speed, min(paddle_speed, new_x - paddle_x))  # For spin
+    paddle_x = new_x
 
-while running:
-    mouse_pos = pygame.mouse.get_pos()
+    # Update all balls
+    balls_to_remove = []
+    new_balls = []
     
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        
-        if event.type == pygame.KEYDOWN:
-            # Name entry mode
-            if entering_name:
-                if event.key == pygame.K_RETURN and player_name:
-                    # Save score and go to menu
-                    save_highscore(player_name, final_time)
-                    entering_name = False
-                    game_paused = True
-                    player_name = ""
-                elif event.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif event.unicode.isalnum() or event.unicode == ' ':
-                    if len(player_name) < 12:
-                        player_name += event.unicode
-            else:
-                if event.key == pygame.K_ESCAPE:
-                    if show_credits or show_highscores:
-                        show_credits = False
-                        show_highscores = False
-                    elif game_over or game_won:
-                        # Can't unpause if game is over
-                        pass
-                    else:
-                        game_paused = not game_paused
-                        if game_paused:
-                            pause_time = pygame.time.get_ticks()
-                        else:
-                            # Adjust start_time to account for pause duration
-                            start_time += pygame.time.get_ticks() - pause_time
-        
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if game_paused and not show_credits and not show_highscores and not entering_name:
-                if btn_new_game.is_clicked(mouse_pos):
-                    reset_game()
-                    game_paused = False
-                elif btn_highscores.is_clicked(mouse_pos):
-                    show_highscores = True
-                elif btn_credits.is_clicked(mouse_pos):
-                    show_credits = True
-            elif show_credits or show_highscores:
-                if btn_back.is_clicked(mouse_pos):
-                    show_credits = False
-                    show_highscores = False
-    
-    # Update button hover states
-    if game_paused and not show_credits and not show_highscores and not entering_name:
-        btn_new_game.check_hover(mouse_pos)
-        btn_highscores.check_hover(mouse_pos)
-        btn_credits.check_hover(mouse_pos)
-    elif show_credits or show_highscores:
-        btn_back.check_hover(mouse_pos)
-    
-    if not game_paused and not game_over and not game_won and not entering_name:
-        # Paddle movement
-        keys = pygame.key.get_pressed()
-        paddle_velocity = 0  # Reset each frame
-        if keys[pygame.K_LEFT] and paddle_x > 0:
-            paddle_x -= paddle_speed
-            paddle_velocity = -paddle_speed
-        if keys[pygame.K_RIGHT] and paddle_x < WIDTH - paddle_width:
-            paddle_x += paddle_speed
-            paddle_velocity = paddle_speed
-
-        # Update all balls
-        balls_to_remove = []
-        new_balls = []
+    for ball in balls:
+        # Ball movement
+        ball.update()
         
-        for ball in balls:
-            # Ball movement
-            ball.update()
-            
-            # Create comet trail particles
-            particles.extend(create_comet_trail(ball.x + ball_size // 2, ball.y + ball_size // 2, ball.dx, ball.dy))
 
-            # Ball collision with walls
-            if ball.x <= 0 or ball.x >= WIDTH - ball_size:
-                ball.dx = -ball.dx
-            if ball.y <= 0:
-                ball.dy = -ball.dy
+        # Ball collision with walls
+        if ball.x <= 0 or ball.x >= WIDTH - ball_size:
+            ball.dx = -ball.dx
+        if ball.y <= 0:
+            ball.dy = -ball.dy
 
-            # Ball collision with paddle
-            if (ball.y + ball_size >= paddle_y and 
-                ball.y + ball_size <= paddle_y + paddle_height and
-                ball.x + ball_size >= paddle_x and 
-                ball.x <= paddle_x + paddle_width):
-                
-                # Calculate where ball hit on paddle (0 to 1, left to right)
-                ball_center = ball.x + ball_size // 2
-                hit_pos = (ball_center - paddle_x) / paddle_width
-                
-                # Convert to angle: -1 (far left) to 1 (far right)
-                # Center (0.5) = 0, meaning straight up
-                angle_factor = (hit_pos - 0.5) * 2
-                
-                # Set new dx based on hit position, max speed of 6
-                ball.dx = angle_factor * 6
-                
-                # Apply spin based on paddle movement (opposite direction)
-                # Paddle moving left (-) adds rightward spin (+) and vice versa
-                spin = -paddle_velocity * 0.3
-                ball.dx += spin
+        # Ball collision with paddle
+        if (ball.y + ball_size >= paddle_y and 
+            ball.y + ball_size <= paddle_y + paddle_height and
+            ball.x + ball_size >= paddle_x and 
+            ball.x <= paddle_x + paddle_width):
+            
+            # Calculate where ball hit on paddle (0 to 1, left to right)
+            ball_center = ball.x + ball_size // 2
+            hit_pos = (ball_center - paddle_x) / paddle_width
+            
+            # Convert to angle: -1 (far left) to 1 (far right)
+            # Center (0.5) = 0, meaning straight up
+            angle_factor = (hit_pos - 0.5) * 2
+            
+            # Set new dx based on hit position, max speed of 6
+            ball.dx = angle_factor * 6
+            
+            # Apply spin based on paddle movement (opposite direction)
+            # Paddle moving left (-) adds rightward spin (+) and vice versa
+            spin = -paddle_velocity * 0.3
+            ball.dx += spin
+            
+            # Clamp horizontal speed to prevent crazy angles
+            ball.dx = max(-8, min(8, ball.dx))
+            
+            # Ensure ball goes up and maintain consistent speed
+            speed = math.sqrt(ball.dx ** 2 + ball.dy ** 2)
+            ball.dy = -abs(math.sqrt(max(16, speed ** 2 - ball.dx ** 2)))  # Minimum vertical speed
+            
+            ball.y = paddle_y - ball_size  # Prevent sticking
+
+        # Ball collision with blocks
+        ball_rect = ball.get_rect()
+        block_id = blocks.collide(ball_rect)
+        if block_id >= 0:
+            # Get block center
+            cx, cy = blocks.center(block_id)
+            
+            if ball.explosive:
+                # 3) Shockwave destroys all blocks in blast radius over the next frames
+                shockwaves.detonate(cx, cy, BLAST_RADIUS, blocks)
                 
-                # Clamp horizontal speed to prevent crazy angles
-                ball.dx = max(-8, min(8, ball.dx))
+                # 4) Revert to normal ball after explosion
+                ball.explosive = False
+                ball.dy = -ball.dy
+            else:
+                # Normal ball behavior
+                spawn_explosion(cx, cy)
                 
-                # Ensure ball goes up and maintain consistent speed
-                speed = math.sqrt(ball.dx ** 2 + ball.dy ** 2)
-                ball.dy = -abs(math.sqrt(max(16, speed ** 2 - ball.dx ** 2)))  # Minimum vertical speed
+                # 1/5 chance to spawn a new ball that falls down
+                if game_rng.randint(1, 5) == 1:
+                    # 5) 1/2 chance new ball is explosive (explosive_ratio)
+                    is_explosive = game_rng.random() < explosive_ratio
+                    new_balls.append(Ball(cx, cy, 0, 4, explosive=is_explosive))
+                    frame_monitor.tag("ball spawn")
                 
-                ball.y = paddle_y - ball_size  # Prevent sticking
-
-            # Ball collision with blocks
-            ball_rect = ball.get_rect()
-            for block in blocks[:]:
-                if ball_rect.colliderect(block["rect"]):
-                    # Get block center
-                    cx = block["rect"].centerx
-                    cy = block["rect"].centery
-                    
-                    if ball.explosive:
-                        # 3) Destroy all blocks in blast radius
-                        blocks_to_destroy = []
-                        for b in blocks:
-                            bx = b["rect"].centerx
-                            by = b["rect"].centery
-                            distance = math.sqrt((cx - bx) ** 2 + (cy - by) ** 2)
-                            if distance <= BLAST_RADIUS:
-                                blocks_to_destroy.append(b)
-                        
-                        # Create massive explosion for each destroyed block
-                        for b in blocks_to_destroy:
-                            explosion_particles.extend(create_fiery_explosion(b["rect"].centerx, b["rect"].centery))
-                            blocks.remove(b)
-                        
-                        # 4) Revert to normal ball after explosion
-                        ball.explosive = False
-                        ball.dy = -ball.dy
-                    else:
-                        # Normal ball behavior
-                        explosion_particles.extend(create_fiery_explosion(cx, cy))
-                        
-                        # 1/5 chance to spawn a new ball that falls down
-                        if random.randint(1, 5) == 1:
-                            # 5) 1/2 chance new ball is explosive
-                            is_explosive = random.randint(1, 2) == 1
-                            new_balls.append(Ball(cx, cy, 0, 4, explosive=is_explosive))
-                        
-                        blocks.remove(block)
-                        ball.dy = -ball.dy
-                    break
+                blocks.kill(block_id)
+                if blocks.kinds[block_id] == KIND_EXPLOSIVE:
+                    shockwaves.detonate(cx, cy, BLOCK_BLAST_RADIUS, blocks)
+                ball.dy = -ball.dy
+
+        # Ball falls off bottom - mark for removal
+        if ball.y > HEIGHT:
+            balls_to_remove.append(ball)
+    
+    # Balls bouncing off each other
+    if ball_collider:
+        ball_collider.step(balls)
+    
+    # Spread blasts (and any chain reactions) within this step's budget
+    shockwaves.update(blocks, spawn_explosion, BLOCK_BLAST_RADIUS)
+    
+    # Remove lost balls and add new ones
+    for ball in balls_to_remove:
+        balls.remove(ball)
+    balls.extend(new_balls)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Breakout - part 5")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print time-to-first-frame measurements")
+    parser.add_argument("--leaderboard-url", metavar="URL",
+                        help="share high scores with a leaderboard server")
+    parser.add_argument("--spectate", metavar="ADDRESS",
+                        help='stream the game to spectators on "host:port" or "unix:/path"')
+    parser.add_argument("--keep-top", type=int, default=1000, metavar="N",
+                        help="fastest scores always kept in highscores.csv (default: 1000)")
+    parser.add_argument("--keep-days", type=int, default=365, metavar="DAYS",
+                        help="scores newer than this are kept in highscores.csv (default: 365)")
+    parser.add_argument("--archive-dir", default=HIGHSCORE_ARCHIVE_DIR, metavar="PATH",
+                        help="where older scores are archived (default: %(default)s)")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="keep every score in highscores.csv")
+    parser.add_argument("--snapshot", default=SNAPSHOT_FILE, metavar="PATH",
+                        help="where F5 saves the game and F8 loads it from (default: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="start from the game saved in the snapshot file")
+    parser.add_argument("--ball-collisions", action="store_true",
+                        help="balls bounce off each other")
+    parser.add_argument("--block-motion", choices=BLOCK_MOTIONS,
+                        help="blocks move: rows slide, blocks orbit or the board descends in a wave")
+    parser.add_argument("--rewind-seconds", type=float, default=30, metavar="SECONDS",
+                        help="how far back R can rewind, 0 turns rewinding off (default: 30)")
+    parser.add_argument("--rewind-memory", type=float, default=8, metavar="MB",
+                        help="memory cap of the rewind buffer (default: 8)")
+    parser.add_argument("--mouse", action="store_true",
+                        help="the paddle follows the mouse instead of the arrow keys")
+    parser.add_argument("--no-late-latch", action="store_true",
+                        help="draw the paddle where the simulation has it, not where the latest input puts it")
+    parser.add_argument("--input-latency", action="store_true",
+                        help="measure input-to-display latency (F3 shows it, summary at exit)")
+    parser.add_argument("--threaded-particles", action="store_true",
+                        help="simulate particles with NumPy on a worker thread")
+    parser.add_argument("--fireworks", type=int, metavar="WORKERS",
+                        help="show fireworks behind the menu, simulated by WORKERS processes (0 = main process)")
+    parser.add_argument("--time-scale", type=float, default=1, choices=TIME_SCALES, metavar="SCALE",
+                        help="simulation speed, one of 0.25, 0.5, 1, 2, 4, 8, 16 ([ and ] in game)")
+    parser.add_argument("--memory-log", default="memory_log.jsonl", metavar="PATH",
+                        help="where F4 memory samples are written (default: memory_log.jsonl)")
+    parser.add_argument("--memory-interval", type=float, default=5.0, metavar="SECONDS",
+                        help="time between memory samples (default: 5)")
+    parser.add_argument("--window-scale", type=float, default=1.0, metavar="SCALE",
+                        help="window size relative to 800x600 (2 for high-DPI displays)")
+    parser.add_argument("--particle-scale", type=float, default=1.0, metavar="SCALE",
+                        help="draw particles into a blurred additive layer at this resolution (0.5 = half)")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="internal render resolution relative to the window (0.5 = half)")
+    presentation = parser.add_argument_group("presentation")
+    presentation.add_argument("--vsync", action="store_true",
+                              help="wait for the display's vertical blank in flip()")
+    presentation.add_argument("--fps", type=int, default=FPS, metavar="N",
+                              help=f"frame rate cap, 0 for none (default: {FPS}). The game speed doesn't change.")
+    presentation.add_argument("--pacing", choices=PACING_MODES, default="sleep",
+                              help="how to wait for the next frame: sleep, sleep then spin (hybrid) "
+                                   "or spin (busy) (default: sleep)")
+    stress = parser.add_argument_group("stress testing")
+    stress.add_argument("--balls", type=int, default=1, metavar="N",
+                        help="balls at the start of every game")
+    stress.add_argument("--explosive-ratio", type=float, default=0.5, metavar="R",
+                        help="chance that an extra or bonus ball is explosive (default: 0.5)")
+    stress.add_argument("--block-rows", type=int, default=block_rows, metavar="N")
+    stress.add_argument("--block-cols", type=int, default=block_cols, metavar="N")
+    stress.add_argument("--particle-multiplier", type=float, default=1.0, metavar="M",
+                        help="scale the particles per explosion")
+    stress.add_argument("--uncapped", action="store_true",
+                        help="benchmark: no frame cap or vsync, and one frame's worth of steps per frame however fast frames come")
+    stress.add_argument("--autopilot", action="store_true",
+                        help="let the computer move the paddle (F6 toggles in game)")
+    stress.add_argument("--duration", type=float, metavar="SECONDS",
+                        help="play unattended (restarting after every game) and exit with a summary")
+    args = parser.parse_args()
+    if args.threaded_particles and not particle_sim.available():
+        parser.error("--threaded-particles needs NumPy (pip install numpy)")
+    if args.fireworks is not None and not fireworks.available():
+        parser.error("--fireworks needs NumPy (pip install numpy)")
+    if args.keep_top < 10 or args.keep_days < 0:
+        parser.error("--keep-top must be at least 10 and --keep-days can't be negative")
+    if args.fireworks is not None and args.fireworks < 0:
+        parser.error("--fireworks needs 0 or more worker processes")
+    if not 0 < args.render_scale <= 1:
+        parser.error("--render-scale must be above 0 and at most 1")
+    if not 0 < args.particle_scale <= 1:
+        parser.error("--particle-scale must be above 0 and at most 1")
+    if args.window_scale <= 0:
+        parser.error("--window-scale must be above 0")
+    if args.balls < 1 or args.block_rows < 1 or args.block_cols < 1:
+        parser.error("--balls, --block-rows and --block-cols must be at least 1")
+    if args.spectate and args.block_rows * args.block_cols > SPECTATOR_MAX_BLOCKS:
+        parser.error(f"--spectate works with up to {SPECTATOR_MAX_BLOCKS} blocks (--block-rows times --block-cols)")
+    if not 0 <= args.explosive_ratio <= 1:
+        parser.error("--explosive-ratio must be between 0 and 1")
+    if args.particle_multiplier < 0:
+        parser.error("--particle-multiplier can't be negative")
+    if args.rewind_seconds < 0 or args.rewind_memory <= 0:
+        parser.error("--rewind-seconds can't be negative and --rewind-memory must be above 0")
+    if args.fps < 0:
+        parser.error("--fps can't be negative")
+    if args.uncapped and args.vsync:
+        parser.error("--uncapped runs without vsync")
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be above 0")
+    return args
 
-            # Ball falls off bottom - mark for removal
-            if ball.y > HEIGHT:
-                balls_to_remove.append(ball)
+def report_startup(marks):
+    """Print how long each startup phase took, starting from STARTUP_T0"""
+    print("Startup profile:")
+    previous = STARTUP_T0
+    for name, timestamp in marks:
+        print(f"  {name:<14}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"  {'total':<14}{(previous - STARTUP_T0) * 1000:8.1f} ms")
+
+def main():
+    global screen, view, paddle_x, paddle_velocity, explosion_particles, start_time, pause_time
+    global game_paused, game_over, game_won, show_credits, show_highscores, highscore_view, highscore_page
+    global entering_name, player_name, final_time
+    global highscore_writer, leaderboard, leaderboard_sync, spectator_server, particle_worker
+    global fireworks_show, particle_scale, show_frame_stats, memory_monitor
+    global start_balls, explosive_ratio, particle_multiplier, autopilot, paddle_control
+    global time_scale, time_scaled_game, paddle_input, player_control, late_latch, rewind_buffer
+    global ball_collider, block_motion
+    args = parse_args()
+    startup_marks = [("imports", time.perf_counter())]
+    
+    # Only start the subsystems we use - pygame.init() would also start audio
+    pygame.display.init()
+    pygame.font.init()
+    startup_marks.append(("pygame init", time.perf_counter()))
+    particle_scale = args.particle_scale
+    view = Viewport((WIDTH, HEIGHT), args.window_scale, args.render_scale, args.vsync)
+    pygame.display.set_caption("Breakout")
+    startup_marks.append(("window", time.perf_counter()))
+    
+    # Stress test settings
+    set_board_size(args.block_rows, args.block_cols)
+    start_balls = args.balls
+    explosive_ratio = args.explosive_ratio
+    particle_multiplier = args.particle_multiplier
+    shockwaves.particles_per_kill = round(EXPLOSION_PARTICLES * particle_multiplier)
+    shockwaves.particle_budget = round(shockwaves.particle_budget * particle_multiplier)
+    # Presentation: how often frames are shown and how the wait is done
+    frame_cap = 0 if args.uncapped else args.fps
+    pacing = args.pacing
+    presentation = [f"vsync {'on' if view.vsync else 'off'}"]
+    if args.uncapped:
+        presentation.append("uncapped benchmark")
+    elif frame_cap:
+        presentation.append(f"{frame_cap} fps cap, {pacing} pacing")
+    else:
+        presentation.append("no cap")
+    frame_monitor.set_presentation(", ".join(presentation), frame_cap)
+    time_scale = args.time_scale
+    measure = ("mouse" if args.mouse else "keys") if args.input_latency else None
+    paddle_input = InputTimeline(view.to_logical, measure)
+    if args.mouse:
+        player_control = MouseControl(paddle_input, paddle_width)
+    else:
+        player_control = KeyboardControl(paddle_input, paddle_speed)
+    late_latch = not args.no_late_latch
+    autopilot = Autopilot(WIDTH, paddle_y, paddle_width, paddle_speed, ball_size)
+    paddle_control = autopilot if args.autopilot else player_control
+    if args.ball_collisions:
+        ball_collider = BallCollider(ball_size)
+    if args.block_motion:
+        block_motion = BlockMotion(args.block_motion)
+    if args.rewind_seconds:
+        rewind_buffer = RewindBuffer(args.rewind_seconds, round(args.rewind_memory * 2**20), FPS)
+    
+    # The CSV is indexed on the writer thread, so the menu is up straight away
+    if args.no_archive:
+        highscore_writer = HighscoreWriter(HIGHSCORE_FILE, load_index=True)
+    else:
+        retention = RetentionPolicy(args.keep_top, args.keep_days)
+        highscore_writer = HighscoreWriter(HIGHSCORE_FILE, retention, args.archive_dir, load_index=True)
+    if args.leaderboard_url:
+        leaderboard_sync = LeaderboardSync(args.leaderboard_url)
+    if args.threaded_particles:
+        particle_worker = particle_sim.ParticleWorker(FIRE_COLORS)
+        particle_worker.multiplier = particle_multiplier
+    if args.fireworks is not None:
+        fireworks_show = fireworks.FireworksShow(WIDTH, HEIGHT, workers=args.fireworks)
+    bake_render_assets()
+    memory_monitor = MemoryMonitor(args.memory_log, (
+        Particle, FireParticle, SparkParticle, EmberParticle, Ball, pygame.Rect, pygame.Surface),
+        interval=args.memory_interval)
+    if args.spectate:
+        spectator_server = SpectatorServer(args.spectate, (
+            WIDTH, HEIGHT, block_cols, block_rows, block_width, block_height,
+            block_padding, block_top_offset, paddle_y, paddle_width, ball_size))
+    
+    # Game loop
+    pygame.time.Clock().tick()  # Starts the SDL timer behind pygame.time.get_ticks()
+    reset_game()
+    if args.resume:
+        load_snapshot(args.snapshot)
+    running = True
+    first_frame = True
+    # Stress test counters
+    session_start = time.perf_counter()
+    stress_end = session_start + args.duration if args.duration else None
+    games_lost = 0
+    boards_cleared = 0
+    blocks_destroyed = 0
+    peak_balls = 0
+    peak_particles = 0
+    step_debt = 0.0  # Fraction of a step carried over to the next frame
+    input_clock = time.perf_counter()  # Input before this is already in the simulation
+    rewind_held = False
+    shared_scores = []  # Latest remote top-N, kept for leaderboard rebuilds
+
+    next_frame = time.perf_counter()  # When the next frame is due with a frame cap
+    last_frame = next_frame
+    wait_ms = 0.0  # Spent waiting for the frame cap before this frame
+    while running:
+        steps_this_frame = 0
+        # Real time this frame stands for: how long the last frame really
+        # took, so the game keeps its speed when a cap or vsync rate isn't
+        # reached. Capped at 0.1 s, so a stall doesn't turn into a burst of
+        # steps. Benchmarks always count 1/60 s.
+        now = time.perf_counter()
+        if args.uncapped:
+            frame_seconds = 1 / FPS
+        else:
+            frame_seconds = min(0.1, now - last_frame)
+        last_frame = now
+        if stress_end and time.perf_counter() >= stress_end:
+            running = False
+        
+        mouse_pos = view.to_logical(pygame.mouse.get_pos())
         
-        # Remove lost balls and add new ones
-        for ball in balls_to_remove:
-            balls.remove(ball)
-        balls.extend(new_balls)
+        # Handle events
+        for event in paddle_input.events():
+            if event.type == pygame.QUIT:
+                running = False
+            
+            if event.type == pygame.KEYDOWN:
+                # Name entry mode
+                if entering_name:
+                    if event.key == pygame.K_RETURN and player_name:
+                        # Save score and go to menu
+                        save_highscore(player_name, final_time)
+                        entering_name = False
+                        game_paused = True
+                        player_name = ""
+                    elif event.key == pygame.K_BACKSPACE:
+                        player_name = player_name[:-1]
+                    elif event.unicode.isalnum() or event.unicode == ' ':
+                        if len(player_name) < 12:
+                            player_name += event.unicode
+                else:
+                    if event.key == pygame.K_F3:
+                        show_frame_stats = not show_frame_stats
+                    if event.key == pygame.K_F4:
+                        if memory_monitor.toggle():
+                            print(f"Memory monitor: sampling to {memory_monitor.path}")
+                        else:
+                            print(f"Memory monitor: stopped after {memory_monitor.samples} samples")
+                    if event.key == REWIND_KEY:
+                        rewind_held = True
+                    if event.key == pygame.K_F5:
+                        frame_monitor.tag("snapshot")
+                        save_snapshot(args.snapshot)
+                    if event.key == pygame.K_F8:
+                        frame_monitor.tag("snapshot")
+                        if load_snapshot(args.snapshot):
+                            show_credits = False
+                            show_highscores = False
+                    if event.key == pygame.K_F6:
+                        paddle_control = player_control if paddle_control is autopilot else autopilot
+                    if event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                        # Slower / faster
+                        index = TIME_SCALES.index(time_scale) if time_scale in TIME_SCALES else TIME_SCALES.index(1)
+                        index += 1 if event.key == pygame.K_RIGHTBRACKET else -1
+                        time_scale = TIME_SCALES[max(0, min(len(TIME_SCALES) - 1, index))]
+                    if event.key == pygame.K_F9:
+                        # Cycle the internal render resolution
+                        scales = RENDER_SCALES if view.render_scale in RENDER_SCALES else (view.render_scale,) + RENDER_SCALES
+                        next_scale = scales[(scales.index(view.render_scale) + 1) % len(scales)]
+                        if view.set_render_scale(next_scale):
+                            bake_render_assets()
+                    if show_highscores:
+                        if event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+                            turn_highscore_page(-1)
+                        elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+                            turn_highscore_page(1)
+                        elif event.key == pygame.K_TAB:
+                            highscore_view = (highscore_view + 1) % len(HIGHSCORE_VIEWS)
+                            highscore_page = 0
+                    if event.key == pygame.K_ESCAPE:
+                        if show_credits or show_highscores:
+                            show_credits = False
+                            show_highscores = False
+                        elif game_over or game_won:
+                            # Can't unpause if game is over
+                            pass
+                        else:
+                            game_paused = not game_paused
+                            if game_paused:
+                                frame_monitor.tag("menu open")
+                                pause_time = pygame.time.get_ticks()
+                            else:
+                                # Adjust start_time to account for pause duration
+                                start_time += pygame.time.get_ticks() - pause_time
+            
+            if event.type == pygame.KEYUP and event.key == REWIND_KEY:
+                rewind_held = False
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if game_paused and not show_credits and not show_highscores and not entering_name:
+                    if btn_new_game.is_clicked(mouse_pos):
+                        reset_game()
+                        game_paused = False
+                    elif btn_highscores.is_clicked(mouse_pos):
+                        frame_monitor.tag("menu open")
+                        show_highscores = True
+                        highscore_page = 0
+                    elif btn_credits.is_clicked(mouse_pos):
+                        frame_monitor.tag("menu open")
+                        show_credits = True
+                elif show_credits or show_highscores:
+                    if btn_back.is_clicked(mouse_pos):
+                        show_credits = False
+                        show_highscores = False
+                    elif show_highscores and btn_prev_page.is_clicked(mouse_pos):
+                        turn_highscore_page(-1)
+                    elif show_highscores and btn_next_page.is_clicked(mouse_pos):
+                        turn_highscore_page(1)
         
-        # GAME OVER only if ALL balls are lost
-        if len(balls) == 0:
-            game_over = True
-            game_paused = True
-            pause_time = pygame.time.get_ticks()
+        # Swap in the leaderboard the writer loaded, or rebuilt after archiving old scores
+        rebuilt = highscore_writer.poll_index()
+        if rebuilt is not None:
+            leaderboard = rebuilt
+            for score in shared_scores:
+                leaderboard.add_shared(score)
+            turn_highscore_page(0)  # The page may be past the end now
         
-        # Check for win condition
-        if len(blocks) == 0:
-            game_won = True
-            entering_name = True
-            final_time = (pygame.time.get_ticks() - start_time) // 1000
+        # Fold in the shared leaderboard when the sync thread has fetched it
+        if leaderboard_sync:
+            remote_scores = leaderboard_sync.poll()
+            if remote_scores:
+                shared_scores = remote_scores
+                for score in remote_scores:
+                    leaderboard.add_shared(score)
         
-        # Update particles
-        particles = [p for p in particles if p.update()]
-        explosion_particles = [p for p in explosion_particles if p.update()]
-
-    # Draw everything
-    screen.fill(BLACK)
-    
-    # Draw particles (behind other objects)
-    for p in particles:
-        p.draw(screen)
-    for p in explosion_particles:
-        p.draw(screen)
-    
-    # 4. Draw blocks
-    for block in blocks:
-        pygame.draw.rect(screen, block["color"], block["rect"])
-        # Add subtle highlight
-        highlight_rect = pygame.Rect(block["rect"].x, block["rect"].y, block["rect"].width, 3)
-        highlight_color = tuple(min(255, c + 60) for c in block["color"])
-        pygame.draw.rect(screen, highlight_color, highlight_rect)
-    
-    pygame.draw.rect(screen, BLUE, (paddle_x, paddle_y, paddle_width, paddle_height))
-    
-    # Draw all balls with fiery glow effect
-    for ball in balls:
-        glow_size = ball_size + 8
-        glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+        # Update button hover states
+        if game_paused and not show_credits and not show_highscores and not entering_name:
+            btn_new_game.check_hover(mouse_pos)
+            btn_highscores.check_hover(mouse_pos)
+            btn_credits.check_hover(mouse_pos)
+        elif show_credits or show_highscores:
+            btn_back.check_hover(mouse_pos)
+            btn_prev_page.check_hover(mouse_pos)
+            btn_next_page.check_hover(mouse_pos)
+        
+        if memory_monitor.update():
+            frame_monitor.tag("memory sample")
+        
+        # Fireworks only run while the main menu is up
+        if fireworks_show and game_paused and not show_credits and not show_highscores and not entering_name:
+            fireworks_show.step()
         
-        if ball.explosive:
-            # EXPLOSIVE BALL - pulsating red/orange glow
-            pulse = ball.get_pulse_intensity()
-            outer_alpha = int(60 * pulse)
-            inner_alpha = int(100 * pulse)
-            core_alpha = int(150 * pulse)
+        # Rewind while R is held - also from the game over screen
+        can_rewind = (rewind_buffer and not entering_name and not show_credits and not show_highscores
+                      and (not game_paused or game_over))
+        if rewind_held and can_rewind and rewind_buffer.end > rewind_buffer.start:
+            cursor = rewind_buffer.end if rewind_cursor is None else rewind_cursor
+            show_rewind(max(rewind_buffer.start, cursor - REWIND_SPEED))
+            frame_monitor.tag("rewind")
+        elif rewind_cursor is not None:
+            stop_rewind()
+        
+        if not game_paused and not game_over and not game_won and not entering_name and rewind_cursor is None:
+            # Advance by time_scale fixed-size steps per 1/60 s. Every step is
+            # the same 1/60 s step, so fast-forward can't tunnel through
+            # blocks or the paddle - it just runs more of them.
+            step_debt += time_scale * FPS * frame_seconds
+            steps = int(step_debt)
+            step_debt -= steps
+            start_frame_explosions(steps)
+            # The steps share out the input since the last simulated frame
+            if steps:
+                input_time = paddle_input.last_poll
+                step_span = (input_time - input_clock) / steps
+                simulate = record_step if rewind_buffer else step_simulation
+                for step in range(steps):
+                    simulate(input_clock + step * step_span, input_clock + (step + 1) * step_span)
+                    steps_this_frame += 1
+                    if not balls or not len(blocks):
+                        break
+                input_clock = input_time
+            if steps and time_scale != 1:
+                time_scaled_game = True
             
-            # Outer red glow (pulsating size)
-            pulse_extra = int(4 * pulse)
-            pygame.draw.circle(glow_surface, (255, 0, 0, outer_alpha), (glow_size, glow_size), glow_size + pulse_extra)
-            # Inner orange glow
-            pygame.draw.circle(glow_surface, (255, 100, 0, inner_alpha), (glow_size, glow_size), glow_size - 2)
-            # Core bright red/yellow
-            pygame.draw.circle(glow_surface, (255, 200, 50, core_alpha), (glow_size, glow_size), glow_size - 5)
-            screen.blit(glow_surface, (ball.x - glow_size + ball_size // 2, ball.y - glow_size + ball_size // 2))
+            # GAME OVER only if ALL balls are lost
+            if len(balls) == 0 and stress_end:
+                games_lost += 1
+                reset_game()
+            elif len(balls) == 0:
+                game_over = True
+                game_paused = True
+                frame_monitor.tag("menu open")
+                pause_time = pygame.time.get_ticks()
             
-            # Main ball - pulsating red core
-            red_intensity = int(200 + 55 * pulse)
-            pygame.draw.ellipse(screen, (red_intensity, int(50 * pulse), 0), (ball.x, ball.y, ball_size, ball_size))
-            # White hot center spot
-            center_size = int(4 * pulse)
-            if center_size > 0:
-                pygame.draw.circle(screen, (255, 255, 200), (int(ball.x + ball_size // 2), int(ball.y + ball_size // 2)), center_size)
+            # Check for win condition
+            if len(blocks) == 0 and stress_end:
+                boards_cleared += 1
+                reset_game()
+            elif len(blocks) == 0:
+                game_won = True
+                final_time = (pygame.time.get_ticks() - start_time) // 1000
+                if time_scaled_game or restored_game:
+                    # Wall-clock time doesn't mean much after fast-forwarding
+                    # (or picking up a saved game)
+                    game_paused = True
+                    pause_time = pygame.time.get_ticks()
+                else:
+                    entering_name = True
+            
+            # Update particles - once per frame that moved the game on, so
+            # faster frame rates don't speed them up
+            if steps and particle_worker:
+                particle_worker.step()
+            elif steps:
+                explosion_particles = [p for p in explosion_particles if p.update()]
+
+        # Send this frame's changes to any spectators
+        killed_blocks = blocks.take_kill_log()
+        blasts = shockwaves.take_blast_log()
+        blocks_destroyed += len(killed_blocks)
+        peak_balls = max(peak_balls, len(balls))
+        peak_particles = max(peak_particles, particle_worker.count if particle_worker else len(explosion_particles))
+        if spectator_server:
+            spectator_server.publish(paddle_x, balls, blocks, killed_blocks, blasts)
+        
+        # Draw everything
+        screen.fill(BLACK)
+        
+        # Draw comet trails and particles (behind other objects), within the
+        # rendering budget
+        glow = len(balls) <= CROWD_BALLS
+        draw_trails(glow)
+        if not particle_layer.enabled:
+            draw_particles(screen, view.scale)
+        
+        # 4. Draw blocks (baked into a layer, see draw_blocks)
+        draw_blocks(killed_blocks)
+        
+        # Shockwave rings
+        for wave in shockwaves.waves:
+            wave.draw(screen, view.scale)
+        
+        # Late latch: poll input once more and draw the paddle where it puts it
+        draw_x = paddle_x
+        if not game_paused and not game_over and not game_won and not entering_name and rewind_cursor is None:
+            if late_latch:
+                now = paddle_input.poll()
+                draw_x = paddle_control.latch(paddle_x, input_clock, now, 1 / (FPS * time_scale))
+                draw_x = max(0, min(WIDTH - paddle_width, draw_x))
         else:
-            # Normal ball - orange/yellow fiery glow
-            # Outer orange glow
-            pygame.draw.circle(glow_surface, (255, 100, 0, 40), (glow_size, glow_size), glow_size)
-            # Inner yellow glow
-            pygame.draw.circle(glow_surface, (255, 200, 50, 60), (glow_size, glow_size), glow_size - 3)
-            # White core glow
-            pygame.draw.circle(glow_surface, (255, 255, 200, 80), (glow_size, glow_size), glow_size - 6)
-            screen.blit(glow_surface, (ball.x - glow_size + ball_size // 2, ball.y - glow_size + ball_size // 2))
-            # Main ball - white hot center
-            pygame.draw.ellipse(screen, (255, 255, 240), (ball.x, ball.y, ball_size, ball_size))
-    
-    # Draw HUD
-    draw_hud()
-    
-    # Draw menu/overlays based on state
-    if entering_name:
-        draw_name_entry()
-    elif game_paused and not show_credits and not show_highscores:
-        draw_menu()
-    elif show_credits:
-        draw_credits()
-    elif show_highscores:
-        draw_highscores()
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+            # Nothing to catch up on after a pause
+            input_clock = paddle_input.last_poll
+            paddle_input.applied(input_clock)
+        pygame.draw.rect(screen, BLUE, view.rect(draw_x, paddle_y, paddle_width, paddle_height))
+        
+        # Draw all balls with fiery glow effect (sprites are pre-baked)
+        draw_balls(glow)
+        
+        # Draw HUD
+        draw_hud()
+        
+        # Soft particles on their own low-resolution layer, added on top
+        if particle_layer.enabled and (explosion_particles or particle_worker and particle_worker.count):
+            draw_particles(particle_layer.begin(), view.scale * particle_layer.scale)
+            particle_layer.composite(screen)
+        
+        # Draw menu/overlays based on state
+        if entering_name:
+            draw_name_entry()
+        elif game_paused and not show_credits and not show_highscores:
+            draw_menu()
+        elif show_credits:
+            draw_credits()
+        elif show_highscores:
+            draw_highscores()
+
+        view.present()
+        present_started = time.perf_counter()
+        pygame.display.flip()  # Blocks until the vertical blank with vsync
+        present_ms = (time.perf_counter() - present_started) * 1000
+        paddle_input.presented()
+        frame_monitor.frame(steps_this_frame, wait_ms, present_ms)
+        if first_frame:
+            first_frame = False
+            startup_marks.append(("first frame", time.perf_counter()))
+            if args.startup_profile:
+                report_startup(startup_marks)
+        if frame_cap:
+            # Like clock.tick(frame_cap), but input keeps being polled meanwhile.
+            # Deadlines are spaced evenly, so a late wake-up doesn't push back
+            # every frame after it, but a slow frame isn't made up for either.
+            wait_started = time.perf_counter()
+            next_frame = max(next_frame + 1 / frame_cap, wait_started)
+            paddle_input.wait_until(next_frame, pacing)
+            wait_ms = (time.perf_counter() - wait_started) * 1000
+
+    # Write any scores still waiting in the queue before exiting
+    highscore_writer.close()
+    if leaderboard_sync:
+        leaderboard_sync.close()
+    if spectator_server:
+        spectator_server.close()
+    if particle_worker:
+        particle_worker.close()
+        stats = particle_worker.stats()
+        print(f"Particle worker: {stats['steps']} steps, {stats['worker_ms']:.2f} ms/step, "
+              f"main thread waited {stats['wait_ms']:.2f} ms/step, "
+              f"{stats['overlap']:.0%} overlapped ({stats['cores']} cores)")
+    if fireworks_show:
+        fireworks_show.close()
+    if stress_end:
+        elapsed = time.perf_counter() - session_start
+        print(f"Stress test: {elapsed:.1f} s, {frame_monitor.frames / elapsed:.1f} fps average, "
+              f"{boards_cleared} boards cleared, {games_lost} games lost")
+        print(f"  {blocks_destroyed} blocks destroyed, peak {peak_balls} balls and {peak_particles} particles")
+    print("\n".join(frame_monitor.summary()))
+    if paddle_input.measure_latency:
+        print("\n".join(paddle_input.summary()))
+    if rewind_buffer:
+        print("\n".join(rewind_buffer.summary()))
+    if ball_collider:
+        print("\n".join(ball_collider.summary()))
+    if block_motion:
+        print("\n".join(block_motion.summary()))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
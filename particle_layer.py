@@ -0,0 +1,34 @@
+# Particle Layer
+# ==============
+# Fire, glow and embers are soft, so they don't need full resolution. A
+# ParticleLayer lets part5 draw them into a smaller surface (scale 0.5 has a
+# quarter of the pixels), blurs that up to the render size with
+# smoothscale and adds it over the sharp scene with BLEND_ADD.
+#
+# At scale 1 the layer is disabled and particles are drawn straight into the
+# scene as before.
+
+import pygame
+
+
+class ParticleLayer:
+    def __init__(self, size, scale=1.0):
+        self.size = size
+        self.scale = scale
+        self.enabled = scale < 1
+        if self.enabled:
+            self.surface = pygame.Surface((max(1, round(size[0] * scale)), max(1, round(size[1] * scale))))
+            self.upscaled = pygame.Surface(size)  # Reused every frame
+            if pygame.display.get_surface():
+                self.surface = self.surface.convert()
+                self.upscaled = self.upscaled.convert()
+
+    def begin(self):
+        """Clear the layer and return it for drawing"""
+        self.surface.fill((0, 0, 0))
+        return self.surface
+
+    def composite(self, target):
+        """Scale the layer up and add it onto target"""
+        pygame.transform.smoothscale(self.surface, self.size, self.upscaled)
+        target.blit(self.upscaled, (0, 0), special_flags=pygame.BLEND_ADD)
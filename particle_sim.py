@@ -0,0 +1,308 @@
+# Threaded Particle Simulation
+# ============================
+# Optional replacement for part5's list of Particle objects
+# (python part5.py --threaded-particles, needs NumPy).
+#
+# - Particles live in NumPy arrays (struct of arrays) instead of objects
+# - Two buffers: the main thread draws the FRONT buffer while a worker
+#   thread steps the simulation from front into the BACK buffer. Each frame
+#   step() waits for the worker, swaps the buffers and starts the next step,
+#   so what you see is always one tick old.
+# - The update kernel is vectorized NumPy, which releases the GIL inside its
+#   loops, and the worker also prepares the draw lists so the main thread
+#   only issues pygame.draw calls
+# - New explosions are pushed onto a deque (append/popleft are atomic, no
+#   lock needed) and the worker turns them into particles
+# - stats() reports how much of the worker's time was hidden behind the
+#   main thread, to check the overlap on multi-core hosts
+#
+# The look matches FireParticle, SparkParticle and EmberParticle in part5.
+
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIRE = 0
+SPARK = 1
+EMBER = 2
+
+FIRE_COLOR_COUNT = 9
+SPARK_COLORS = [(255, 255, 255), (255, 255, 200), (255, 200, 100)]
+EMBER_COLORS = [(255, 100, 0), (255, 150, 50), (200, 50, 0)]
+
+FIELDS = [
+    ('x', 'f4'), ('y', 'f4'), ('dx', 'f4'), ('dy', 'f4'), ('gravity', 'f4'),
+    ('life', 'f4'), ('max_life', 'f4'), ('size', 'f4'), ('pulse', 'f4'),
+    ('kind', 'u1'), ('color', 'u1'),
+]
+
+
+def available():
+    return np is not None
+
+
+class ParticleBuffer:
+    def __init__(self, capacity=1024):
+        self.n = 0
+        self.capacity = capacity
+        self.fields = {name: np.zeros(capacity, dtype) for name, dtype in FIELDS}
+        self.draw_lists = ([], [], [])  # glows, circles, spark lines
+
+    def reserve(self, capacity):
+        """Grow to hold at least capacity particles (keeps the first n)"""
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, self.capacity * 2)
+        for name, dtype in FIELDS:
+            grown = np.zeros(capacity, dtype)
+            grown[:self.n] = self.fields[name][:self.n]
+            self.fields[name] = grown
+        self.capacity = capacity
+
+    def view(self, name):
+        return self.fields[name][:self.n]
+
+
+class ParticleWorker:
+    def __init__(self, fire_colors):
+        if np is None:
+            raise RuntimeError("threaded particles need NumPy (pip install numpy)")
+        self.palette = np.array(list(fire_colors) + SPARK_COLORS + EMBER_COLORS, dtype='f4')
+        self.rng = np.random.default_rng()
+        self.front = ParticleBuffer()
+        self.back = ParticleBuffer()
+        self.spawns = deque()  # (x, y) explosion centers
+        self.scale = 1.0  # Render pixels per simulation pixel, for the draw lists
+        self.multiplier = 1.0  # Scales the particles per explosion
+        self._go = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self._stopping = False
+        self._error = None
+        # Measurements
+        self._step_time = 0.0
+        self.steps = 0
+        self.worker_time = 0.0
+        self.wait_time = 0.0
+        self._thread = threading.Thread(target=self._run, name="particle-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def count(self):
+        """Particles in the buffer currently on screen"""
+        return self.front.n
+
+    def spawn_explosion(self, x, y):
+        self.spawns.append((x, y))
+
+    def step(self):
+        """Collect the finished step, swap buffers and start the next one"""
+        self._wait()
+        self.front, self.back = self.back, self.front
+        self._done.clear()
+        self._go.set()
+
+    def clear(self):
+        self._wait()
+        self.spawns.clear()
+        self.front.n = 0
+        self.back.n = 0
+        self.front.draw_lists = self.back.draw_lists = ([], [], [])
+
+    def draw(self, surface):
+        glows, circles, lines = self.front.draw_lists
+        circle = pygame.draw.circle
+        for color, center, radius in glows:
+            circle(surface, color, center, radius)
+        for color, center, radius in circles:
+            circle(surface, color, center, radius)
+        line = pygame.draw.line
+        width = max(1, int(2 * self.scale))
+        for color, start, end in lines:
+            line(surface, color, start, end, width)
+
+    def stats(self):
+        """How much particle work ran in parallel with the main thread"""
+        steps = max(1, self.steps)
+        hidden = max(0.0, self.worker_time - self.wait_time)
+        return {
+            'steps': self.steps,
+            'worker_ms': self.worker_time * 1000 / steps,
+            'wait_ms': self.wait_time * 1000 / steps,
+            'overlap': hidden / self.worker_time if self.worker_time else 0.0,
+            'cores': os.cpu_count(),
+        }
+
+    def close(self):
+        self._wait()
+        self._stopping = True
+        self._go.set()
+        self._thread.join()
+
+    def _wait(self):
+        started = time.perf_counter()
+        self._done.wait()
+        if self._step_time:
+            self.wait_time += time.perf_counter() - started
+            self.worker_time += self._step_time
+            self.steps += 1
+            self._step_time = 0.0
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            self._go.wait()
+            self._go.clear()
+            if self._stopping:
+                return
+            started = time.perf_counter()
+            try:
+                self._simulate(self.front, self.back)
+            except Exception as e:
+                self._error = e
+            self._step_time = time.perf_counter() - started
+            self._done.set()
+
+    def _simulate(self, src, dst):
+        """Advance src by one tick into dst, add new explosions, build draw lists"""
+        life = src.view('life') - 1
+        alive = life > 0
+        count = int(np.count_nonzero(alive))
+
+        spawn_points = []
+        while self.spawns:
+            spawn_points.append(self.spawns.popleft())
+        dst.n = 0
+        dst.reserve(count + len(spawn_points) * sum(self._explosion_counts()))
+        dst.n = count
+
+        # Same motion as Particle.update(): move, gravity, drag
+        x = src.view('x')
+        y = src.view('y')
+        dx = src.view('dx')
+        dy = src.view('dy')
+        f = dst.fields
+        np.compress(alive, life, out=f['life'][:count])
+        np.compress(alive, x + dx, out=f['x'][:count])
+        np.compress(alive, y + dy, out=f['y'][:count])
+        np.compress(alive, dy + src.view('gravity'), out=f['dy'][:count])
+        np.compress(alive, dx * 0.98, out=f['dx'][:count])
+        np.compress(alive, src.view('pulse') + 0.2, out=f['pulse'][:count])
+        for name in ('gravity', 'max_life', 'size', 'kind', 'color'):
+            np.compress(alive, src.view(name), out=f[name][:count])
+
+        if spawn_points:
+            self._spawn(dst, np.array(spawn_points, dtype='f4'))
+        dst.draw_lists = self._build_draw_lists(dst)
+
+    def _explosion_counts(self):
+        """Fire particles, sparks and embers per explosion"""
+        m = self.multiplier
+        return round(25 * m), round(15 * m), round(10 * m)
+
+    def _spawn(self, buf, points):
+        """Vectorized create_fiery_explosion() for every point at once"""
+        rng = self.rng
+        k = len(points)
+        # 25 fire particles, 15 sparks, 10 embers per explosion (times the multiplier)
+        fires, sparks, embers = self._explosion_counts()
+        fire_x = np.repeat(points[:, 0], fires)
+        fire_y = np.repeat(points[:, 1], fires)
+        angle = rng.uniform(0, 2 * math.pi, fires * k)
+        speed = rng.uniform(2, 8, fires * k)
+        self._append(buf, FIRE, fire_x, fire_y, np.cos(angle) * speed, np.sin(angle) * speed - 1,
+                     gravity=0.15, size=rng.integers(4, 11, fires * k),
+                     life=rng.integers(30, 56, fires * k), color=0)
+
+        spark_x = np.repeat(points[:, 0], sparks)
+        spark_y = np.repeat(points[:, 1], sparks)
+        angle = rng.uniform(0, 2 * math.pi, sparks * k)
+        speed = rng.uniform(5, 12, sparks * k)
+        self._append(buf, SPARK, spark_x, spark_y, np.cos(angle) * speed, np.sin(angle) * speed,
+                     gravity=0.2, size=2, life=rng.integers(15, 31, sparks * k),
+                     color=FIRE_COLOR_COUNT + rng.integers(0, 3, sparks * k))
+
+        ember_x = np.repeat(points[:, 0], embers) + rng.uniform(-20, 20, embers * k)
+        ember_y = np.repeat(points[:, 1], embers) + rng.uniform(-10, 10, embers * k)
+        self._append(buf, EMBER, ember_x, ember_y, rng.uniform(-0.5, 0.5, embers * k),
+                     rng.uniform(-2, -0.5, embers * k),
+                     gravity=0.05, size=rng.integers(2, 5, embers * k), life=rng.integers(40, 71, embers * k),
+                     color=FIRE_COLOR_COUNT + 3 + rng.integers(0, 3, embers * k),
+                     pulse=rng.uniform(0, 2 * math.pi, embers * k))
+
+    def _append(self, buf, kind, x, y, dx, dy, gravity, size, life, color, pulse=0.0):
+        start = buf.n
+        end = start + len(x)
+        f = buf.fields
+        f['x'][start:end] = x
+        f['y'][start:end] = y
+        f['dx'][start:end] = dx
+        f['dy'][start:end] = dy
+        f['gravity'][start:end] = gravity
+        f['size'][start:end] = size
+        f['life'][start:end] = life
+        f['max_life'][start:end] = life
+        f['kind'][start:end] = kind
+        f['color'][start:end] = color
+        f['pulse'][start:end] = pulse
+        buf.n = end
+
+    def _build_draw_lists(self, buf):
+        """Work out colors and sizes for every particle, ready to draw"""
+        kind = buf.view('kind')
+        scale = self.scale
+        alpha = buf.view('life') / buf.view('max_life')
+        x = (buf.view('x') * scale).astype('i4')
+        y = (buf.view('y') * scale).astype('i4')
+        size = buf.view('size') * scale
+        palette = self.palette
+
+        # Fire: color runs through FIRE_COLORS with age, flickers, shrinks
+        fire = kind == FIRE
+        fire_alpha = alpha[fire]
+        index = np.minimum(((1 - fire_alpha) * (FIRE_COLOR_COUNT - 1)).astype('i4'), FIRE_COLOR_COUNT - 1)
+        base = palette[index]
+        flicker = self.rng.uniform(0.85, 1.15, len(fire_alpha)).astype('f4')
+        fire_color = np.clip(base * (fire_alpha * flicker)[:, None], 0, 255).astype('i4')
+        fire_radius = np.maximum(1, (size[fire] * (0.3 + fire_alpha * 0.7)).astype('i4'))
+        fire_x = x[fire]
+        fire_y = y[fire]
+        has_glow = (fire_radius > 2 * scale) & (fire_alpha > 0.3)
+        glow_color = np.clip(base[has_glow] * (0.4 * fire_alpha[has_glow])[:, None], 0, 255).astype('i4')
+
+        # Embers: pulsing brightness, fixed size
+        ember = kind == EMBER
+        pulse = 0.7 + 0.3 * np.sin(buf.view('pulse')[ember])
+        ember_color = np.clip(palette[buf.view('color')[ember]] * (alpha[ember] * pulse)[:, None], 0, 255).astype('i4')
+
+        # Sparks: short streaks behind the direction of travel
+        spark = kind == SPARK
+        spark_color = np.clip(palette[buf.view('color')[spark]] * alpha[spark][:, None], 0, 255).astype('i4')
+        spark_end_x = ((buf.view('x')[spark] - buf.view('dx')[spark] * 2) * scale).astype('i4')
+        spark_end_y = ((buf.view('y')[spark] - buf.view('dy')[spark] * 2) * scale).astype('i4')
+
+        glow_radius = fire_radius[has_glow] + max(1, int(3 * scale))
+        glows = list(zip(_colors(glow_color), zip(fire_x[has_glow].tolist(), fire_y[has_glow].tolist()),
+                         glow_radius.tolist()))
+        circles = list(zip(_colors(fire_color), zip(fire_x.tolist(), fire_y.tolist()), fire_radius.tolist()))
+        circles += zip(_colors(ember_color), zip(x[ember].tolist(), y[ember].tolist()),
+                       np.maximum(1, size[ember].astype('i4')).tolist())
+        lines = list(zip(_colors(spark_color), zip(x[spark].tolist(), y[spark].tolist()),
+                         zip(spark_end_x.tolist(), spark_end_y.tolist())))
+        return glows, circles, lines
+
+
+def _colors(rgb):
+    """(n, 3) int array -> iterator of (r, g, b) tuples"""
+    return zip(rgb[:, 0].tolist(), rgb[:, 1].tolist(), rgb[:, 2].tolist())
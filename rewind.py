@@ -0,0 +1,205 @@
+# Rewind
+# ======
+# Lets part5 scrub back through the last half minute of play (hold R).
+#
+# The buffer is a deque of segments. Each one starts with a keyframe - a
+# full snapshot of the game (snapshot.py) - followed by one small record per
+# simulation step:
+# - where the paddle ended up, the only input the simulation takes
+# - how many balls there were after the step
+# - the ids of the blocks destroyed in the step
+#
+# Any step can be rebuilt by restoring the keyframe before it and
+# re-simulating with the recorded paddle positions, because the simulation
+# is deterministic. The destroyed blocks and ball counts are compared with
+# what the re-simulation does, so anything that breaks determinism shows up
+# as a desync count instead of quietly rewinding into a different game.
+#
+# Memory is capped: whole segments are dropped from the old end once the
+# buffer holds more than max_seconds of play or more than its share of
+# max_bytes. Sizes are what the keyframes and step records really take in
+# memory (sys.getsizeof), and the readout shows them per second of play.
+#
+# The byte cap is hard. The segments only get 1 - 1/SCRUB_SHARE of it; the
+# rest is for the snapshots part5 caches while scrubbing through a segment,
+# which are counted too and only kept while they fit - every stride-th step
+# if not all of them do, the steps in between being re-simulated. A segment
+# is cut short (a new keyframe taken) once it takes half the segments'
+# room, and one still too big on its own is dropped, even the newest: the
+# steps it held can't be rewound to, recording goes on with a fresh one.
+
+import bisect
+import struct
+import sys
+from array import array
+from collections import deque
+
+STEP = struct.Struct('<dII')  # paddle x, balls after the step, blocks destroyed
+SCRUB_SHARE = 4  # A quarter of max_bytes is kept for the scrub cache
+
+
+class Segment:
+    def __init__(self, start, keyframe):
+        self.start = start  # Step number the keyframe was taken at
+        self.keyframe = keyframe
+        self.records = bytearray()
+        self.offsets = array('I')  # Where each step's record starts
+
+    @property
+    def steps(self):
+        return len(self.offsets)
+
+    @property
+    def end(self):
+        return self.start + len(self.offsets)
+
+    def size(self):
+        return sys.getsizeof(self.keyframe) + sys.getsizeof(self.records) + sys.getsizeof(self.offsets)
+
+    def add(self, paddle_x, ball_count, kills):
+        self.offsets.append(len(self.records))
+        self.records += STEP.pack(paddle_x, ball_count, len(kills))
+        self.records += array('I', kills).tobytes()
+
+    def steps_recorded(self):
+        """(paddle x, ball count, destroyed block ids) for every step"""
+        records = self.records
+        for offset in self.offsets:
+            paddle_x, ball_count, kill_count = STEP.unpack_from(records, offset)
+            kills = array('I')
+            kills.frombytes(records[offset + STEP.size:offset + STEP.size + kill_count * 4])
+            yield paddle_x, ball_count, kills.tolist()
+
+    def truncate(self, steps):
+        """Forget every step after the first steps"""
+        if steps < len(self.offsets):
+            del self.records[self.offsets[steps]:]
+            del self.offsets[steps:]
+
+
+class Replay:
+    """Stands in for the paddle controller, replaying recorded positions"""
+    def __init__(self, positions):
+        self.positions = iter(positions)
+
+    def move(self, paddle_x, balls, start, end):
+        return next(self.positions)
+
+
+class RewindBuffer:
+    def __init__(self, max_seconds=30, max_bytes=8 * 2**20, steps_per_second=60, keyframe_steps=60):
+        self.max_steps = round(max_seconds * steps_per_second)
+        self.max_bytes = max_bytes
+        self.segment_bytes = max_bytes - max_bytes // SCRUB_SHARE  # The segments' room
+        self.steps_per_second = steps_per_second
+        self.keyframe_steps = keyframe_steps
+        self.segments = deque()
+        self.end = 0  # Step number after the newest recorded step
+        self.bytes = 0  # Held by the segments
+        self.scrub_bytes = 0  # ...and by the scrub cache
+        self.peak_bytes = 0
+        self.desyncs = 0
+
+    def clear(self):
+        """Forget everything (a new game starts)"""
+        self.segments.clear()
+        self.bytes = 0
+
+    @property
+    def start(self):
+        """Oldest step that can be rewound to"""
+        return self.segments[0].start if self.segments else self.end
+
+    def seconds(self):
+        return (self.end - self.start) / self.steps_per_second
+
+    def needs_keyframe(self):
+        if not self.segments:
+            return True
+        segment = self.segments[-1]
+        return segment.steps >= self.keyframe_steps or (segment.steps and segment.size() * 2 > self.segment_bytes)
+
+    def add_keyframe(self, blob):
+        """Start a new segment with a snapshot of the game before the next step"""
+        segment = Segment(self.end, blob)
+        self.segments.append(segment)
+        self.bytes += segment.size()
+        self._trim()
+
+    def add_step(self, paddle_x, ball_count, kills):
+        """Record one simulation step (after add_keyframe() when needs_keyframe())"""
+        if not self.segments:
+            self.end += 1  # Its keyframe alone was over the cap
+            return
+        segment = self.segments[-1]
+        self.bytes -= segment.size()
+        segment.add(paddle_x, ball_count, kills)
+        self.bytes += segment.size()
+        self.end += 1
+        self._trim()
+
+    def _trim(self):
+        segments = self.segments
+        while len(segments) > 1 and self.end - segments[1].start >= self.max_steps:
+            self.bytes -= segments.popleft().size()
+        while segments and self.bytes > self.segment_bytes:
+            self.bytes -= segments.popleft().size()
+        self.peak_bytes = max(self.peak_bytes, self.bytes + self.scrub_bytes)
+
+    def scrub_stride(self, segment):
+        """Every how many steps the scrub cache can hold a snapshot of the
+        segment, going by its keyframe's size (more than its steps: none)"""
+        fit = (self.max_bytes - self.bytes - self.scrub_bytes) // sys.getsizeof(segment.keyframe)
+        return max(1, -(-segment.steps // fit)) if fit > 0 else segment.steps + 1
+
+    def cache_snapshot(self, blob):
+        """Count a scrub cache snapshot against max_bytes. Returns False,
+        and counts nothing, if it doesn't fit."""
+        size = sys.getsizeof(blob)
+        if self.bytes + self.scrub_bytes + size > self.max_bytes:
+            return False
+        self.scrub_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.bytes + self.scrub_bytes)
+        return True
+
+    def drop_scrub_cache(self):
+        self.scrub_bytes = 0
+
+    def segment_at(self, step):
+        """The segment that can rebuild the game as it was at step"""
+        index = bisect.bisect_right(self.segments, step, key=lambda segment: segment.start) - 1
+        return self.segments[max(0, index)]
+
+    def truncate(self, step):
+        """Play goes on from step: forget everything recorded after it"""
+        segments = self.segments
+        while segments and segments[-1].start > step:
+            self.bytes -= segments.pop().size()
+        if segments:
+            segment = segments[-1]
+            self.bytes -= segment.size()
+            segment.truncate(step - segment.start)
+            self.bytes += segment.size()
+        self.end = step
+
+    def check(self, recorded, ball_count, kills):
+        """Compare a re-simulated step with its record"""
+        if recorded[1:] != (ball_count, kills):
+            self.desyncs += 1
+
+    def bytes_per_second(self):
+        seconds = self.seconds()
+        return self.bytes / seconds if seconds else 0.0
+
+    def readout(self):
+        return (f"rewind: {self.seconds():4.1f} s in {self.bytes / 1024:5.0f} KB, "
+                f"{self.bytes_per_second() / 1024:4.1f} KB/s, "
+                + (f"scrub cache {self.scrub_bytes / 1024:.0f} KB, " if self.scrub_bytes else "")
+                + f"cap {self.max_bytes / 2**20:.3g} MB"
+                + (f", {self.desyncs} desyncs" if self.desyncs else ""))
+
+    def summary(self):
+        """Lines describing the whole session"""
+        return [f"Rewind buffer: {self.seconds():.1f} s held in {self.bytes / 1024:.0f} KB "
+                f"({self.bytes_per_second() / 1024:.1f} KB/s of play), peak {self.peak_bytes / 1024:.0f} KB "
+                f"of {self.max_bytes / 2**20:.3g} MB, {self.desyncs} desyncs"]
@@ -0,0 +1,105 @@
+# Shockwaves
+# ==========
+# Blasts in part5 (explosive balls and explosive blocks) don't destroy
+# everything in one frame any more. Each blast is a Shockwave that grows by
+# a few pixels per frame:
+#
+# - When it starts, the block index is asked once for every block inside
+#   the final radius, and those victims are sorted by distance into a
+#   frontier queue
+# - Each frame the ring grows and the victims it has reached are popped
+#   from the frontier and killed
+# - An explosive block that gets killed starts its own shockwave, so blasts
+#   can chain across the board
+#
+# All shockwaves share a per-frame budget of kills and particle spawns. A
+# big cascade simply takes a few more frames to finish instead of spiking
+# one frame.
+
+import math
+from collections import deque
+
+import pygame
+
+from blockstore import KIND_EXPLOSIVE
+
+
+class Shockwave:
+    def __init__(self, x, y, max_radius, speed, victims):
+        self.x = x
+        self.y = y
+        self.radius = 0
+        self.max_radius = max_radius
+        self.speed = speed
+        # (distance, block id) closest first
+        self.frontier = deque(victims)
+
+    @property
+    def finished(self):
+        return self.radius >= self.max_radius and not self.frontier
+
+    def draw(self, surface, scale=1.0):
+        fade = 1 - self.radius / self.max_radius
+        color = (255, int(80 + 150 * fade), int(40 * fade))
+        width = max(1, int(6 * fade * scale))
+        pygame.draw.circle(surface, color, (int(self.x * scale), int(self.y * scale)), int(self.radius * scale), width)
+
+
+class ShockwaveManager:
+    def __init__(self, speed=12, kill_budget=6, particle_budget=300, particles_per_kill=50):
+        self.speed = speed
+        self.kill_budget = kill_budget
+        self.particle_budget = particle_budget
+        self.particles_per_kill = particles_per_kill
+        self.waves = []
+        self.blast_log = []  # Blast centers, for the spectator stream
+
+    def __len__(self):
+        return len(self.waves)
+
+    def clear(self):
+        self.waves.clear()
+        self.blast_log.clear()
+
+    def detonate(self, x, y, radius, blocks):
+        """Start a shockwave at (x, y) that will clear blocks within radius"""
+        victims = []
+        for block_id in blocks.in_radius(x, y, radius):
+            bx, by = blocks.center(block_id)
+            victims.append((math.hypot(bx - x, by - y), block_id))
+        victims.sort()
+        self.waves.append(Shockwave(x, y, radius, self.speed, victims))
+        self.blast_log.append((x, y))
+
+    def take_blast_log(self):
+        blasts, self.blast_log = self.blast_log, []
+        return blasts
+
+    def update(self, blocks, spawn_explosion, chain_radius):
+        """Grow every wave and kill the blocks it reached, within budget.
+
+        spawn_explosion(x, y) is called for every killed block. Explosive
+        blocks start a new wave of chain_radius. Returns the killed ids.
+        """
+        kills_left = self.kill_budget
+        particles_left = self.particle_budget
+        killed = []
+        # New waves started by chain reactions join in on the next frame
+        for wave in self.waves[:]:
+            wave.radius = min(wave.max_radius, wave.radius + wave.speed)
+            frontier = wave.frontier
+            while frontier and frontier[0][0] <= wave.radius:
+                if kills_left == 0 or particles_left < self.particles_per_kill:
+                    break
+                _, block_id = frontier.popleft()
+                if not blocks.kill(block_id):
+                    continue  # Already taken by another wave
+                kills_left -= 1
+                particles_left -= self.particles_per_kill
+                killed.append(block_id)
+                x, y = blocks.center(block_id)
+                spawn_explosion(x, y)
+                if blocks.kinds[block_id] == KIND_EXPLOSIVE:
+                    self.detonate(x, y, chain_radius, blocks)
+        self.waves = [wave for wave in self.waves if not wave.finished]
+        return killed
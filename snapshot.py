@@ -0,0 +1,221 @@
+# Game Snapshots
+# ==============
+# Packs the state of a part5 game into one bytes object and back, for save
+# and resume (F5 / F8), recovering from a crash and attaching the exact game
+# to a bug report.
+#
+# A snapshot holds everything the simulation needs to carry on exactly as it
+# would have:
+# - a fixed-size header: flags (game over, won, fast-forwarded, balls
+#   collide), paddle position and velocity, elapsed game time, board size,
+#   block motion and its step, and counts
+# - one kind byte per block and the block alive bitmap (bit i of byte i // 8
+#   is block i, like the spectator keyframe)
+# - every ball as five doubles (x, y, dx, dy, pulse) plus an explosive byte
+# - the gameplay random generator's Mersenne Twister state
+# - every running shockwave with the (distance, block id) pairs still in
+#   its frontier
+# - optionally the explosion particles, which don't affect the game
+#
+# Block geometry isn't stored: it follows from the board size, and where
+# moving blocks are from the motion and its step. Comet trails
+# aren't either, they grow back within half a second.
+#
+# Packing and unpacking are array and struct calls over whole sections, so
+# a normal game takes a few microseconds each way. Multi-byte values are
+# little-endian whatever the machine.
+#
+# load() checks everything the game would trip over later - board size,
+# random state, block ids, numbers that aren't finite - so a corrupt or
+# handmade snapshot is a SnapshotError, not a crash.
+
+import math
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+MAGIC = b'BRK5'
+VERSION = 2
+
+FLAG_GAME_OVER = 1
+FLAG_GAME_WON = 2
+FLAG_TIME_SCALED = 4
+FLAG_PARTICLES = 8
+FLAG_BALL_COLLISIONS = 16
+
+# magic, version, flags, paddle x, paddle velocity, elapsed ms, final time,
+# block rows, block columns, block motion (0 for none), motion step, then
+# block, ball, wave and particle counts
+HEADER = struct.Struct('<4sHHddqIHHBIIIII')
+WAVE = struct.Struct('<dddddI')  # x, y, radius, max radius, speed, frontier length
+BALL_FIELDS = 5
+PARTICLE_FIELDS = 9  # x, y, dx, dy, gravity, size, lifetime, max lifetime, extra
+RNG_WORDS = 625  # Mersenne Twister state words, position included
+
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+Header = namedtuple('Header', 'flags paddle_x paddle_velocity elapsed_ms final_time rows cols motion motion_step')
+Snapshot = namedtuple('Snapshot', 'header kinds alive balls rng_state waves particles')
+
+
+class SnapshotError(ValueError):
+    """The data isn't a snapshot this version can read"""
+
+
+def pack_bits(flags):
+    """Bitmap of a bytearray of 0/1 flags, flag 0 in the lowest bit"""
+    if not flags:
+        return b''
+    # Reversed, the flags read as one binary number: parse it in one go
+    return int(flags[::-1].translate(_TO_DIGITS), 2).to_bytes((len(flags) + 7) // 8, 'little')
+
+
+def unpack_bits(data, count):
+    """bytearray of count 0/1 flags from a bitmap"""
+    if not count:
+        return bytearray()
+    digits = format(int.from_bytes(data, 'little'), f'0{count}b').encode()
+    return bytearray(digits[::-1].translate(_FROM_DIGITS))
+
+
+def _to_bytes(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _check_finite(values, what):
+    if not all(map(math.isfinite, values)):
+        raise SnapshotError(f"{what} with a number that isn't finite")
+
+
+def dump(header, kinds, alive, balls, rng, waves, particles=None, particle_types=()):
+    """Pack a game into bytes.
+
+    kinds and alive are per block id, balls and waves the game's Ball and
+    Shockwave objects and rng its gameplay random.Random. particle_types
+    lists (class, name of its extra attribute or None) - particles of any
+    other class are left out.
+    """
+    flags = header.flags & ~FLAG_PARTICLES
+    particle_values = array('d')
+    particle_looks = bytearray()
+    if particles is not None:
+        flags |= FLAG_PARTICLES
+        type_ids = {cls: (type_id, extra) for type_id, (cls, extra) in enumerate(particle_types)}
+        for p in particles:
+            found = type_ids.get(type(p))
+            if found is None:
+                continue
+            type_id, extra = found
+            particle_values.extend((p.x, p.y, p.dx, p.dy, p.gravity, p.size, p.lifetime, p.max_lifetime,
+                                    getattr(p, extra) if extra else 0.0))
+            particle_looks.append(type_id)
+            particle_looks.extend(p.color)
+    ball_values = array('d', [value for ball in balls
+                              for value in (ball.x, ball.y, ball.dx, ball.dy, ball.pulse_timer)])
+    _, rng_words, gauss_next = rng.getstate()
+    parts = [
+        HEADER.pack(MAGIC, VERSION, flags, header.paddle_x, header.paddle_velocity, header.elapsed_ms,
+                    header.final_time, header.rows, header.cols, header.motion, header.motion_step,
+                    len(kinds), len(balls), len(waves),
+                    len(particle_looks) // 4),
+        bytes(kinds),
+        pack_bits(alive),
+        _to_bytes(ball_values),
+        bytes(ball.explosive for ball in balls),
+        _to_bytes(array('I', rng_words)),
+        struct.pack('<d', float('nan') if gauss_next is None else gauss_next),
+    ]
+    for wave in waves:
+        parts.append(WAVE.pack(wave.x, wave.y, wave.radius, wave.max_radius, wave.speed, len(wave.frontier)))
+        parts.append(_to_bytes(array('d', [distance for distance, _ in wave.frontier])))
+        parts.append(_to_bytes(array('I', [block_id for _, block_id in wave.frontier])))
+    if particles is not None:
+        parts.append(_to_bytes(particle_values))
+        parts.append(bytes(particle_looks))
+    return b''.join(parts)
+
+
+def load(blob, particle_types=()):
+    """Unpack a snapshot from dump(). Balls come back as (x, y, dx, dy, pulse,
+    explosive) tuples, waves as (x, y, radius, max radius, speed, frontier)
+    and particles (None if they weren't saved) as objects of
+    particle_types, made without running their __init__."""
+    view = memoryview(blob)
+    try:
+        (magic, version, flags, paddle_x, paddle_velocity, elapsed_ms, final_time, rows, cols,
+         motion, motion_step, block_count, ball_count, wave_count, particle_count) = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise SnapshotError("not a game snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"snapshot version {version}, expected {VERSION}")
+        if not rows or not cols or rows * cols != block_count:
+            raise SnapshotError(f"a {rows} x {cols} board can't have {block_count} blocks")
+        if not (math.isfinite(paddle_x) and math.isfinite(paddle_velocity)):
+            raise SnapshotError("paddle isn't anywhere")
+        header = Header(flags, paddle_x, paddle_velocity, elapsed_ms, final_time, rows, cols, motion, motion_step)
+        offset = HEADER.size
+
+        def take(size):
+            nonlocal offset
+            if offset + size > len(view):
+                raise SnapshotError("snapshot is truncated")
+            offset += size
+            return view[offset - size:offset]
+
+        kinds = bytearray(take(block_count))
+        alive = unpack_bits(take((block_count + 7) // 8), block_count)
+        values = _from_bytes('d', take(ball_count * BALL_FIELDS * 8))
+        _check_finite(values, "ball")
+        explosive = take(ball_count)
+        balls = [(*values[i * BALL_FIELDS:(i + 1) * BALL_FIELDS], bool(explosive[i])) for i in range(ball_count)]
+        words = _from_bytes('I', take(RNG_WORDS * 4))
+        gauss_next, = struct.unpack('<d', take(8))
+        rng_state = (3, tuple(words), None if gauss_next != gauss_next else gauss_next)
+        try:
+            random.Random().setstate(rng_state)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise SnapshotError(f"broken random state: {e}") from None
+        waves = []
+        for _ in range(wave_count):
+            x, y, radius, max_radius, speed, length = WAVE.unpack(take(WAVE.size))
+            distances = _from_bytes('d', take(length * 8))
+            block_ids = _from_bytes('I', take(length * 4))
+            _check_finite((x, y, radius, max_radius, speed, *distances), "shockwave")
+            if block_ids and max(block_ids) >= block_count:
+                raise SnapshotError(f"shockwave reaches block {max(block_ids)} of {block_count}")
+            frontier = list(zip(distances, block_ids))
+            waves.append((x, y, radius, max_radius, speed, frontier))
+        particles = None
+        if flags & FLAG_PARTICLES:
+            values = _from_bytes('d', take(particle_count * PARTICLE_FIELDS * 8))
+            _check_finite(values, "particle")
+            looks = take(particle_count * 4)
+            particles = []
+            for i in range(particle_count):
+                cls, extra = particle_types[looks[i * 4]]
+                p = cls.__new__(cls)
+                (p.x, p.y, p.dx, p.dy, p.gravity, p.size, p.lifetime, p.max_lifetime,
+                 extra_value) = values[i * PARTICLE_FIELDS:(i + 1) * PARTICLE_FIELDS]
+                p.size, p.lifetime, p.max_lifetime = int(p.size), int(p.lifetime), int(p.max_lifetime)
+                p.color = tuple(looks[i * 4 + 1:i * 4 + 4])
+                p.shrink = True
+                if extra:
+                    setattr(p, extra, extra_value)
+                particles.append(p)
+    except (struct.error, IndexError) as e:
+        raise SnapshotError(f"broken snapshot: {e}") from None
+    return Snapshot(header, kinds, alive, balls, rng_state, waves, particles)
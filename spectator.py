@@ -0,0 +1,491 @@
+# Spectator Streaming
+# ===================
+# Lets other machines watch a part5 game live. The game publishes its state
+# once per frame; viewers connect over TCP ("host:port") or a Unix socket
+# ("unix:/path/to.sock") and get a compact binary stream:
+#
+# - KEYFRAME: board layout, block alive bitmap, paddle and every ball
+# - DELTA:    only what changed since the last message - killed block ids,
+#             blast centers, paddle movement, balls that appeared/vanished
+#             and ball moves quantized to whole pixels (one signed byte per
+#             axis, absolute positions only when a move is too large)
+#
+# Bandwidth stays under BUDGET_BYTES_PER_SEC per viewer:
+# - Deltas go out at most SEND_HZ times a second, and less often when they
+#   get large, so the shared stream fits the budget
+# - Every viewer has its own token bucket and send buffer. A viewer that
+#   can't keep up has its queued deltas dropped and is resynced with a
+#   keyframe once its bucket allows.
+#
+# Rewinding or loading a snapshot hands publish() a new block store. Its
+# live blocks are compared with the ones viewers know: blocks that are gone
+# go out as kills, and only blocks coming back need a keyframe.
+#
+# Block ids and counts are 16-bit, so a board can have at most MAX_BLOCKS
+# blocks (checked when the server starts). Ball ids are 15-bit, so only the
+# first MAX_BALLS balls are streamed, leaving ids free for new balls while
+# old ones are still on the viewers' screens.
+#
+# Watch a game with:  python spectator.py 127.0.0.1:8766
+
+import argparse
+import os
+import socket
+import struct
+import sys
+import time
+import weakref
+from collections import deque
+from itertools import islice
+
+BUDGET_BYTES_PER_SEC = 2048
+SEND_HZ = 10
+MAX_CLIENT_BUFFER = 4096
+
+MSG_KEYFRAME = 1
+MSG_DELTA = 2
+
+HEADER = struct.Struct('<IBH')          # body length, message type, sequence
+LAYOUT = struct.Struct('<11H')          # see SpectatorServer.__init__
+KEYFRAME_HEAD = struct.Struct('<hHBH')  # paddle x, block count, palette size, ball count
+DELTA_HEAD = struct.Struct('<hHHHH')    # paddle dx, kills, blasts, removed balls, ball records
+BALL_ABS = struct.Struct('<Hhhb')       # id | ABSOLUTE, x, y, flags
+BALL_REL = struct.Struct('<Hbb')        # id, dx, dy
+U16 = struct.Struct('<H')
+POINT = struct.Struct('<hh')
+COLOR = struct.Struct('<BBB')
+
+ABSOLUTE = 0x8000
+FLAG_EXPLOSIVE = 1
+
+MAX_BLOCKS = 0xFFFF
+MAX_BALLS = ABSOLUTE // 2
+MAX_BLASTS = 0xFFFF  # Per delta - older ones are dropped
+
+
+def open_listener(address):
+    """Listen on "host:port" or "unix:/path" without blocking"""
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(path)
+    else:
+        host, _, port = address.rpartition(':')
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host or '127.0.0.1', int(port)))
+    sock.listen()
+    sock.setblocking(False)
+    return sock
+
+
+def connect(address):
+    if address.startswith('unix:'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address[len('unix:'):])
+    else:
+        host, _, port = address.rpartition(':')
+        sock = socket.create_connection((host or '127.0.0.1', int(port)))
+    return sock
+
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.messages = deque()
+        self.offset = 0  # Bytes of messages[0] already sent
+        self.queued = 0
+        self.needs_keyframe = True
+        self.tokens = BUDGET_BYTES_PER_SEC
+        self.last_refill = time.monotonic()
+        self.connected_at = self.last_refill
+        self.bytes_sent = 0
+
+    def refill(self, now):
+        self.tokens = min(BUDGET_BYTES_PER_SEC,
+                          self.tokens + (now - self.last_refill) * BUDGET_BYTES_PER_SEC)
+        self.last_refill = now
+
+    def queue(self, message):
+        self.messages.append(message)
+        self.queued += len(message)
+        self.tokens -= len(message)
+
+    def drop_backlog(self):
+        """Throw away queued messages (except one already half sent)"""
+        keep = self.messages[0] if self.offset else None
+        self.messages.clear()
+        self.queued = 0
+        if keep is not None:
+            self.messages.append(keep)
+            self.queued = len(keep) - self.offset
+        self.needs_keyframe = True
+
+    def flush(self):
+        """Send as much as the socket takes right now"""
+        while self.messages:
+            head = self.messages[0]
+            sent = self.sock.send(memoryview(head)[self.offset:])
+            self.offset += sent
+            self.queued -= sent
+            self.bytes_sent += sent
+            if self.offset < len(head):
+                return
+            self.messages.popleft()
+            self.offset = 0
+
+
+class SpectatorServer:
+    def __init__(self, address, layout):
+        # layout: (width, height, block_cols, block_rows, block_width,
+        #          block_height, block_padding, block_top_offset,
+        #          paddle_y, paddle_width, ball_size)
+        cols, rows = layout[2:4]
+        if cols * rows > MAX_BLOCKS:
+            raise ValueError(f"spectators can watch boards of up to {MAX_BLOCKS} blocks, not {cols * rows}")
+        self.address = address
+        self.layout = LAYOUT.pack(*layout)
+        self.listener = open_listener(address)
+        self.clients = []
+        self.seq = 0
+        self._ball_ids = weakref.WeakKeyDictionary()
+        self._id_balls = {}  # id -> ball, for the ids in _sent_balls
+        self._next_ball_id = 0
+        self._sent_balls = {}  # id -> (x, y, flags) as the viewers know them
+        self._sent_paddle = 0
+        self._blocks = None
+        self._alive = set()  # Live block ids as the viewers know them
+        self._kills = []
+        self._blasts = []
+        self._next_send = 0.0
+
+    def publish(self, paddle_x, balls, blocks, kills=(), blasts=()):
+        """Call once per frame with the current game state and events"""
+        self._accept()
+        if not self.clients:
+            self._blocks = None  # Whoever connects starts from a keyframe
+            return
+        if blocks is self._blocks:
+            self._kills.extend(kills)
+            self._alive.difference_update(kills)
+            self._blasts.extend(blasts)
+        elif self._follow(blocks):
+            self._blasts.extend(blasts)
+
+        now = time.monotonic()
+        if now >= self._next_send:
+            delta = self._encode_delta(paddle_x, balls)
+            keyframe = None
+            for client in self.clients:
+                client.refill(now)
+                if client.needs_keyframe:
+                    if keyframe is None:
+                        keyframe = self._encode_keyframe(blocks)
+                    # A keyframe bigger than the whole budget waits for a full bucket
+                    if client.tokens >= min(len(keyframe), BUDGET_BYTES_PER_SEC):
+                        client.queue(keyframe)
+                        client.needs_keyframe = False
+                elif delta is not None:
+                    if client.tokens >= len(delta):
+                        client.queue(delta)
+                    else:
+                        client.drop_backlog()
+            # Large deltas stretch the interval so the stream stays in budget
+            size = len(delta) if delta is not None else 0
+            self._next_send = now + max(1.0 / SEND_HZ, size / BUDGET_BYTES_PER_SEC)
+        self._flush()
+
+    def _follow(self, blocks):
+        """Switch to another block store, sending the blocks it doesn't have
+        as kills. False if viewers need a keyframe (a new game, or blocks
+        came back)."""
+        old = self._blocks
+        alive = set(blocks)
+        self._blocks = blocks
+        if (old is not None and blocks.capacity == old.capacity and blocks.palette == old.palette
+                and alive <= self._alive):
+            self._kills.extend(sorted(self._alive - alive))
+            self._alive = alive
+            return True
+        self._alive = alive
+        self._kills.clear()
+        self._blasts.clear()
+        for client in self.clients:
+            client.needs_keyframe = True
+        return False
+
+    def stats(self):
+        """Average payload bytes per second sent to each viewer"""
+        now = time.monotonic()
+        return [client.bytes_sent / max(1e-6, now - client.connected_at) for client in self.clients]
+
+    def close(self):
+        for client in self.clients:
+            client.sock.close()
+        self.clients.clear()
+        self.listener.close()
+        if self.address.startswith('unix:'):
+            path = self.address[len('unix:'):]
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            sock.setblocking(False)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.clients.append(_Client(sock))
+
+    def _flush(self):
+        for client in self.clients[:]:
+            try:
+                client.flush()
+            except BlockingIOError:
+                pass
+            except OSError:
+                client.sock.close()
+                self.clients.remove(client)
+                continue
+            if client.queued > MAX_CLIENT_BUFFER:
+                client.drop_backlog()
+
+    def _message(self, kind, body):
+        self.seq = (self.seq + 1) & 0xFFFF
+        return HEADER.pack(len(body), kind, self.seq) + body
+
+    def _ball_id(self, ball):
+        ball_id = self._ball_ids.get(ball)
+        if ball_id is None:
+            ball_id = self._next_ball_id
+            while ball_id in self._sent_balls:  # Wrapped round to a ball still on screen
+                ball_id = (ball_id + 1) % ABSOLUTE
+            self._next_ball_id = (ball_id + 1) % ABSOLUTE
+            self._ball_ids[ball] = ball_id
+        self._id_balls[ball_id] = ball
+        return ball_id
+
+    def _encode_delta(self, paddle_x, balls):
+        """Encode changes since the last delta, or None if nothing changed"""
+        paddle = int(paddle_x)
+        paddle_dx = paddle - self._sent_paddle
+        self._sent_paddle = paddle
+
+        records = []
+        seen = set()
+        for ball in islice(balls, MAX_BALLS):
+            ball_id = self._ball_id(ball)
+            seen.add(ball_id)
+            x = int(round(ball.x))
+            y = int(round(ball.y))
+            flags = FLAG_EXPLOSIVE if ball.explosive else 0
+            sent = self._sent_balls.get(ball_id)
+            if sent == (x, y, flags):
+                continue
+            self._sent_balls[ball_id] = (x, y, flags)
+            if sent is not None and sent[2] == flags and abs(x - sent[0]) < 128 and abs(y - sent[1]) < 128:
+                records.append(BALL_REL.pack(ball_id, x - sent[0], y - sent[1]))
+            else:
+                records.append(BALL_ABS.pack(ball_id | ABSOLUTE, x, y, flags))
+        removed = [ball_id for ball_id in self._sent_balls if ball_id not in seen]
+        for ball_id in removed:
+            del self._sent_balls[ball_id]
+            # A ball that comes back (or past MAX_BALLS) gets a new id
+            self._ball_ids.pop(self._id_balls.pop(ball_id), None)
+
+        kills, self._kills = self._kills, []
+        blasts, self._blasts = self._blasts[-MAX_BLASTS:], []
+        if not (paddle_dx or records or removed or kills or blasts):
+            return None
+        body = [DELTA_HEAD.pack(paddle_dx, len(kills), len(blasts), len(removed), len(records))]
+        body.extend(U16.pack(block_id) for block_id in kills)
+        body.extend(POINT.pack(int(x), int(y)) for x, y in blasts)
+        body.extend(U16.pack(ball_id) for ball_id in removed)
+        body.extend(records)
+        return self._message(MSG_DELTA, b''.join(body))
+
+    def _encode_keyframe(self, blocks):
+        """Encode the full state the delta stream has brought viewers to"""
+        bitmap = bytearray((blocks.capacity + 7) // 8)
+        for block_id in blocks:
+            bitmap[block_id >> 3] |= 1 << (block_id & 7)
+        body = [self.layout,
+                KEYFRAME_HEAD.pack(self._sent_paddle, blocks.capacity,
+                                   len(blocks.palette), len(self._sent_balls))]
+        body.extend(COLOR.pack(*color[:3]) for color in blocks.palette)
+        body.append(bytes(bitmap))
+        body.extend(BALL_ABS.pack(ball_id | ABSOLUTE, x, y, flags)
+                    for ball_id, (x, y, flags) in self._sent_balls.items())
+        return self._message(MSG_KEYFRAME, b''.join(body))
+
+
+class SpectatorState:
+    """Viewer side: rebuilds the game state from the stream"""
+    def __init__(self):
+        self.layout = None
+        self.palette = []
+        self.block_count = 0
+        self.alive = bytearray()
+        self.paddle_x = 0
+        self.balls = {}  # id -> [x, y, flags]
+        self.blasts = []  # Blast centers since the last take_events()
+        self.kills = []  # Killed block ids since the last take_events()
+        self.synced = False
+        self._data = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and apply every complete message"""
+        self._data.extend(data)
+        while len(self._data) >= HEADER.size:
+            length, kind, _seq = HEADER.unpack_from(self._data)
+            end = HEADER.size + length
+            if len(self._data) < end:
+                return
+            body = bytes(self._data[HEADER.size:end])
+            del self._data[:end]
+            if kind == MSG_KEYFRAME:
+                self._apply_keyframe(body)
+            elif kind == MSG_DELTA and self.synced:
+                self._apply_delta(body)
+
+    def take_events(self):
+        kills, blasts = self.kills, self.blasts
+        self.kills, self.blasts = [], []
+        return kills, blasts
+
+    def block_rect(self, block_id):
+        _w, _h, cols, _rows, bw, bh, padding, top = self.layout[:8]
+        row, col = divmod(block_id, cols)
+        return (col * (bw + padding) + padding, row * (bh + padding) + top, bw, bh)
+
+    def _apply_keyframe(self, body):
+        self.layout = LAYOUT.unpack_from(body)
+        offset = LAYOUT.size
+        self.paddle_x, self.block_count, palette_size, ball_count = KEYFRAME_HEAD.unpack_from(body, offset)
+        offset += KEYFRAME_HEAD.size
+        self.palette = []
+        for _ in range(palette_size):
+            self.palette.append(COLOR.unpack_from(body, offset))
+            offset += COLOR.size
+        bitmap_size = (self.block_count + 7) // 8
+        bitmap = body[offset:offset + bitmap_size]
+        offset += bitmap_size
+        self.alive = bytearray((bitmap[i >> 3] >> (i & 7)) & 1 for i in range(self.block_count))
+        self.balls = {}
+        for _ in range(ball_count):
+            ball_id, x, y, flags = BALL_ABS.unpack_from(body, offset)
+            offset += BALL_ABS.size
+            self.balls[ball_id & ~ABSOLUTE] = [x, y, flags]
+        self.synced = True
+
+    def _apply_delta(self, body):
+        paddle_dx, kills, blasts, removed, records = DELTA_HEAD.unpack_from(body)
+        offset = DELTA_HEAD.size
+        self.paddle_x += paddle_dx
+        for _ in range(kills):
+            (block_id,) = U16.unpack_from(body, offset)
+            offset += U16.size
+            if block_id < self.block_count:
+                self.alive[block_id] = 0
+                self.kills.append(block_id)
+        for _ in range(blasts):
+            self.blasts.append(POINT.unpack_from(body, offset))
+            offset += POINT.size
+        for _ in range(removed):
+            (ball_id,) = U16.unpack_from(body, offset)
+            offset += U16.size
+            self.balls.pop(ball_id, None)
+        for _ in range(records):
+            (ball_id,) = U16.unpack_from(body, offset)
+            if ball_id & ABSOLUTE:
+                _, x, y, flags = BALL_ABS.unpack_from(body, offset)
+                offset += BALL_ABS.size
+                self.balls[ball_id & ~ABSOLUTE] = [x, y, flags]
+            else:
+                _, dx, dy = BALL_REL.unpack_from(body, offset)
+                offset += BALL_REL.size
+                ball = self.balls.get(ball_id)
+                if ball is not None:
+                    ball[0] += dx
+                    ball[1] += dy
+
+
+def main():
+    """Minimal viewer window for a spectator stream"""
+    import pygame
+
+    parser = argparse.ArgumentParser(description="Watch a live part5 game")
+    parser.add_argument("address", help='"host:port" or "unix:/path/to.sock"')
+    args = parser.parse_args()
+
+    sock = connect(args.address)
+    sock.setblocking(False)
+    state = SpectatorState()
+
+    pygame.display.init()
+    screen = None
+    clock = pygame.time.Clock()
+    flashes = []  # [x, y, frames_left]
+    received = 0
+    started = time.monotonic()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    running = False
+                    break
+                received += len(data)
+                state.feed(data)
+        except BlockingIOError:
+            pass
+
+        if not state.synced:
+            clock.tick(30)
+            continue
+        width, height, _cols, _rows, _bw, _bh, _pad, _top, paddle_y, paddle_width, ball_size = state.layout
+        if screen is None or screen.get_size() != (width, height):
+            screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("Breakout - spectator")
+
+        kills, blasts = state.take_events()
+        for block_id in kills:
+            x, y, w, h = state.block_rect(block_id)
+            flashes.append([x + w // 2, y + h // 2, 20])
+        for x, y in blasts:
+            flashes.append([x, y, 40])
+
+        screen.fill((0, 0, 0))
+        for x, y, frames_left in flashes:
+            pygame.draw.circle(screen, (255, 150 * frames_left // 40, 0), (x, y), frames_left)
+        flashes = [[x, y, f - 1] for x, y, f in flashes if f > 1]
+        for block_id, alive in enumerate(state.alive):
+            if alive:
+                color = state.palette[(block_id // state.layout[2]) % len(state.palette)]
+                pygame.draw.rect(screen, color, state.block_rect(block_id))
+        pygame.draw.rect(screen, (0, 100, 255), (state.paddle_x, paddle_y, paddle_width, 15))
+        for x, y, flags in state.balls.values():
+            color = (255, 60, 0) if flags & FLAG_EXPLOSIVE else (255, 255, 240)
+            pygame.draw.ellipse(screen, color, (x, y, ball_size, ball_size))
+        pygame.display.flip()
+        clock.tick(60)
+
+    elapsed = max(1e-6, time.monotonic() - started)
+    print(f"Received {received} bytes in {elapsed:.1f}s ({received / elapsed:.0f} B/s)", file=sys.stderr)
+    sock.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+from highscore_archive import RetentionPolicy
+from highscore_writer import HighscoreWriter, read_rows
+
+
+class ShortRowTest(unittest.TestCase):
+    def test_split_keeps_unreadable_dates_hot(self):
+        rows = [{'name': 'bob', 'time': '12', 'date': None},
+                {'name': 'amy', 'time': '30', 'date': 'yesterday'},
+                {'name': 'amy', 'time': '40', 'date': '2020-01-01 10:00'}]
+        hot, cold = RetentionPolicy(keep_top=0, keep_days=0, keep_player_bests=False).split(rows)
+        self.assertEqual(hot, rows[:2])
+        self.assertEqual(cold, {'2020-01': [(2, rows[2])]})
+
+    def test_writer_survives_short_row(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hs.csv')
+            with open(path, 'w', newline='') as f:
+                f.write('name,time,date\nbob,12\n')
+            writer = HighscoreWriter(path, RetentionPolicy(10, 0), os.path.join(directory, 'arch'), idle_delay=0.1)
+            time.sleep(0.3)  # Let a compaction run over the short row
+            writer.submit({'name': 'amy', 'time': '30', 'date': '2026-10-19 10:00'})
+            writer.close()
+            self.assertEqual([row['name'] for row in read_rows(path)], ['bob', 'amy'])
+            with open(path, newline='') as f:
+                self.assertEqual(list(csv.reader(f))[1], ['bob', '12', ''])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from leaderboard import Leaderboard
+
+
+class DuplicateScoreTest(unittest.TestCase):
+    def test_local_scores_are_all_kept(self):
+        board = Leaderboard()
+        board.add('bob', 42, '2026-10-19 10:00')
+        board.add('bob', 42, '2026-10-19 10:00')
+        self.assertEqual(board.count(), 2)
+        self.assertEqual(len(board.top(10)), 2)
+
+    def test_shared_scores_skip_ones_already_in(self):
+        board = Leaderboard()
+        board.add('bob', 42, '2026-10-19 10:00')
+        score = {'id': 'a1', 'name': 'bob', 'time': 42, 'date': '2026-10-19 10:00'}
+        self.assertFalse(board.add_shared(score))  # Our own score, echoed back
+        self.assertTrue(board.add_shared(dict(score, name='amy')))
+        self.assertFalse(board.add_shared(dict(score, name='amy')))  # Fetched again
+        self.assertEqual(board.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import random
+import struct
+import unittest
+from types import SimpleNamespace
+
+import snapshot
+from snapshot import HEADER, Header, SnapshotError
+
+
+def make_blob(rows=2, cols=3, ball_x=10.0, frontier=((5.0, 4),), rng=None):
+    header = Header(0, 100.0, 0.0, 5000, 0, rows, cols, 0, 0)
+    ball = SimpleNamespace(x=ball_x, y=20.0, dx=1.0, dy=-1.0, pulse_timer=0.0, explosive=False)
+    wave = SimpleNamespace(x=1.0, y=2.0, radius=3.0, max_radius=50.0, speed=2.0, frontier=list(frontier))
+    count = rows * cols
+    return snapshot.dump(header, bytearray(count), bytearray([1]) * count, [ball], rng or random.Random(1), [wave])
+
+
+class CorruptSnapshotTest(unittest.TestCase):
+    def test_good_snapshot_loads(self):
+        state = snapshot.load(make_blob())
+        self.assertEqual(len(state.kinds), 6)
+        self.assertEqual(state.waves[0][5], [(5.0, 4)])
+
+    def test_empty_board(self):
+        with self.assertRaises(SnapshotError):
+            snapshot.load(make_blob(rows=0, cols=0))
+        fields = list(HEADER.unpack_from(make_blob()))
+        fields[7] = 0  # No rows, but still six blocks
+        blob = make_blob()
+        with self.assertRaises(SnapshotError):
+            snapshot.load(HEADER.pack(*fields) + blob[HEADER.size:])
+
+    def test_bad_random_state(self):
+        blob = bytearray(make_blob())
+        position = HEADER.size + 6 + 1 + 5 * 8 + 1 + 624 * 4  # The Mersenne Twister's position word
+        struct.pack_into('<I', blob, position, 10_000)
+        with self.assertRaises(SnapshotError):
+            snapshot.load(bytes(blob))
+
+    def test_frontier_past_the_blocks(self):
+        with self.assertRaises(SnapshotError):
+            snapshot.load(make_blob(frontier=((5.0, 6),)))
+
+    def test_ball_that_isnt_anywhere(self):
+        with self.assertRaises(SnapshotError):
+            snapshot.load(make_blob(ball_x=float('nan')))
+
+
+if __name__ == '__main__':
+    unittest.main()
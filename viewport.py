@@ -0,0 +1,85 @@
+# Viewport
+# ========
+# Separates part5's three sizes:
+#
+# - the logical playfield (800x600) the game simulates in
+# - the internal render surface everything is drawn into
+# - the window the player sees
+#
+# The window is window_scale x the playfield, and the render surface is
+# render_scale x the window. At render_scale 1 the scene is drawn straight
+# into the window. Below 1 a smaller offscreen surface is drawn and scaled up
+# into the window once per frame, so the fill cost follows the internal
+# pixel count (0.5 draws a quarter of the pixels).
+#
+# With vsync the window is opened with SCALED (pygame only syncs windows that
+# are drawn through an SDL renderer). If the driver can't do that, the window
+# opens without vsync and `vsync` is False.
+#
+# Drawing code converts logical coordinates with px(), point() and rect().
+# Anything baked at a given resolution (fonts, glow sprites, block layers)
+# should be rebuilt when `generation` changes.
+
+import pygame
+
+
+class Viewport:
+    def __init__(self, logical_size, window_scale=1.0, render_scale=1.0, vsync=False):
+        self.logical_size = logical_size
+        self.window_size = (round(logical_size[0] * window_scale), round(logical_size[1] * window_scale))
+        self.vsync = vsync
+        if vsync:
+            try:
+                self.window = pygame.display.set_mode(self.window_size, pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"Vsync not available ({e}), continuing without it")
+                self.vsync = False
+        if not self.vsync:
+            self.window = pygame.display.set_mode(self.window_size)
+        self.surface = None
+        self.render_scale = None
+        self.generation = 0
+        self.set_render_scale(render_scale)
+
+    def set_render_scale(self, render_scale):
+        """Pick a new internal resolution. Returns False if nothing changed."""
+        if render_scale == self.render_scale:
+            return False
+        self.render_scale = render_scale
+        size = (max(1, round(self.window_size[0] * render_scale)),
+                max(1, round(self.window_size[1] * render_scale)))
+        if size == self.window_size:
+            self.surface = self.window
+        else:
+            self.surface = pygame.Surface(size).convert()
+        # Render pixels per logical pixel
+        self.scale = size[0] / self.logical_size[0]
+        self.generation += 1
+        return True
+
+    @property
+    def size(self):
+        return self.surface.get_size()
+
+    def px(self, length):
+        """Logical length -> render pixels (never below 1)"""
+        return max(1, int(length * self.scale))
+
+    def point(self, x, y):
+        return int(x * self.scale), int(y * self.scale)
+
+    def rect(self, x, y, w, h):
+        scale = self.scale
+        left = int(x * scale)
+        top = int(y * scale)
+        return pygame.Rect(left, top, int((x + w) * scale) - left, int((y + h) * scale) - top)
+
+    def to_logical(self, pos):
+        """Window position (e.g. the mouse) -> playfield coordinates"""
+        return (pos[0] * self.logical_size[0] // self.window_size[0],
+                pos[1] * self.logical_size[1] // self.window_size[1])
+
+    def present(self):
+        """Scale the render surface into the window (reusing the window's pixels)"""
+        if self.surface is not self.window:
+            pygame.transform.scale(self.surface, self.window_size, self.window)